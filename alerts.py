@@ -0,0 +1,213 @@
+import datetime
+import heapq
+
+from dates import add_months, to_datetime
+from product_card import ProductCard
+
+
+class AlertEngine:
+    """
+    Оповещения об окончании гарантии и о необходимости дозаказа.
+
+    Для каждой карточки на учёте поддерживаются две кучи: по дате
+    окончания гарантии (дата поступления + гарантия в месяцах) и по
+    отставанию остатка от порога дозаказа (остаток - порог). Кучи
+    обновляются при изменении полей карточки, поэтому наступившие
+    оповещения извлекаются за O(log N) каждое без обхода карточек.
+
+    Устаревшие записи куч не удаляются сразу: запись действительна,
+    только если совпадает с текущим состоянием карточки, иначе она
+    пропускается при извлечении. Каждое оповещение выдаётся один раз:
+    об окончании гарантии - до изменения даты окончания, о дозаказе -
+    пока остаток снова не поднимется выше порога.
+    """
+
+    FIELDS = ("quantity", "guarantee", "receipt_date", "status")
+
+    def __init__(self, warn_days: int = 30, threshold: int = None) -> None:
+        """
+        Создание пустого набора оповещений.
+
+        Args:
+            warn_days: За сколько дней до окончания гарантии оповещать
+            threshold: Порог дозаказа для всех карточек (None - только
+                       для карточек с заданным set_threshold порогом)
+        """
+
+        self.warn_days = warn_days
+        self.threshold = threshold
+        self._thresholds = {}
+        self._expiry = {}
+        self._expiry_heap = []
+        self._shortage = {}
+        self._shortage_heap = []
+        self._alerted = set()
+
+    @staticmethod
+    def expiry(card: ProductCard):
+        """Дата окончания гарантии карточки или None, если её нет."""
+
+        receipt = card.get_receipt_date()
+        guarantee = card.get_guarantee()
+
+        if not receipt or not guarantee:
+            return None
+
+        return add_months(receipt, guarantee)
+
+    def track(self, card: ProductCard) -> None:
+        """Учёт карточки (списанные карточки не учитываются)."""
+
+        if card.get_status() == ProductCard.STATUS_WRITTEN_OFF:
+            self.untrack(card.get_card_id())
+            return
+
+        card_id = card.get_card_id()
+        self._check_stock(card_id, card.get_quantity())
+        self._arm_expiry(card_id, self.expiry(card))
+
+    def untrack(self, card_id: str) -> None:
+        """Снятие карточки со всех оповещений."""
+
+        self._expiry.pop(card_id, None)
+        self._shortage.pop(card_id, None)
+        self._alerted.discard(card_id)
+
+    def card_changed(self, card: ProductCard, field: str, old, new) -> None:
+        """
+        Обновление куч после изменения поля карточки (см. FIELDS).
+        """
+
+        if field == "status":
+            self.track(card)
+        elif card.get_status() == ProductCard.STATUS_WRITTEN_OFF:
+            return
+        elif field == "quantity":
+            self._check_stock(card.get_card_id(), new)
+        elif field in ("guarantee", "receipt_date"):
+            self._arm_expiry(card.get_card_id(), self.expiry(card))
+
+    def set_threshold(self, card: ProductCard, threshold) -> None:
+        """
+        Порог дозаказа карточки.
+
+        Args:
+            card: Карточка
+            threshold: Порог (оповещение при остатке не больше порога)
+                       или None - порог по умолчанию
+        """
+
+        card_id = card.get_card_id()
+
+        if threshold is None:
+            self._thresholds.pop(card_id, None)
+        else:
+            self._thresholds[card_id] = threshold
+
+        self._alerted.discard(card_id)
+        self._shortage.pop(card_id, None)
+
+        if card.get_status() != ProductCard.STATUS_WRITTEN_OFF:
+            self._check_stock(card_id, card.get_quantity())
+
+    def _check_stock(self, card_id: str, quantity: int) -> None:
+        """Постановка карточки в кучу дозаказа при остатке ниже порога."""
+
+        threshold = self._thresholds.get(card_id, self.threshold)
+
+        if threshold is None:
+            return
+
+        distance = quantity - threshold
+
+        if distance > 0:
+            self._alerted.discard(card_id)
+            self._shortage.pop(card_id, None)
+            return
+
+        if card_id in self._alerted or self._shortage.get(card_id) == distance:
+            return
+
+        self._shortage[card_id] = distance
+        self._push(self._shortage_heap, self._shortage, (distance, card_id))
+
+    def _arm_expiry(self, card_id: str, expiry) -> None:
+        """Постановка (или снятие) оповещения об окончании гарантии."""
+
+        if expiry is None:
+            self._expiry.pop(card_id, None)
+        elif self._expiry.get(card_id) != expiry:
+            self._expiry[card_id] = expiry
+            self._push(self._expiry_heap, self._expiry, (expiry, card_id))
+
+    @staticmethod
+    def _push(heap: list, current: dict, entry: tuple) -> None:
+        """
+        Добавление записи в кучу. Если устаревших записей стало больше
+        действительных, куча перестраивается только из действительных.
+        """
+
+        heapq.heappush(heap, entry)
+
+        if len(heap) > 2 * len(current) + 64:
+            heap[:] = [(key, card_id) for card_id, key in current.items()]
+            heapq.heapify(heap)
+
+    def pop_due(self, today=None) -> list:
+        """
+        Извлечение наступивших оповещений.
+
+        Args:
+            today: Текущая дата - date, datetime (время отбрасывается)
+                   или строка ДД.ММ.ГГГГ. По умолчанию - сегодня
+
+        Returns:
+            list: Оповещения о дозаказе {"kind": "reorder", "card_id",
+                  "quantity", "threshold"} (сначала с наибольшей
+                  нехваткой) и об окончании гарантии {"kind": "expiry",
+                  "card_id", "expires", "days_left"} (сначала самые
+                  ранние; days_left < 0 - гарантия уже закончилась)
+        """
+
+        if today:
+            today = to_datetime(today).date()
+        else:
+            today = datetime.date.today()
+
+        alerts = []
+        heap = self._shortage_heap
+
+        while heap:
+            distance, card_id = heapq.heappop(heap)
+
+            if self._shortage.get(card_id) != distance:
+                continue
+
+            del self._shortage[card_id]
+            self._alerted.add(card_id)
+            threshold = self._thresholds.get(card_id, self.threshold)
+            alerts.append({
+                "kind": "reorder",
+                "card_id": card_id,
+                "quantity": threshold + distance,
+                "threshold": threshold
+            })
+
+        horizon = today + datetime.timedelta(days=self.warn_days)
+        heap = self._expiry_heap
+
+        while heap and heap[0][0] <= horizon:
+            expiry, card_id = heapq.heappop(heap)
+
+            if self._expiry.get(card_id) != expiry:
+                continue
+
+            del self._expiry[card_id]
+            alerts.append({
+                "kind": "expiry",
+                "card_id": card_id,
+                "expires": expiry,
+                "days_left": (expiry - today).days
+            })
+
+        return alerts
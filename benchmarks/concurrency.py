@@ -0,0 +1,100 @@
+"""
+Нагрузочный тест потокобезопасного Menu: пропускная способность
+при разном количестве потоков.
+
+Каждый поток создаёт свои карточки, изменяет случайные карточки и
+пытается создать карточки с уже занятыми ID. В конце проверяется,
+что ни одна карточка не создана дважды и индексы согласованы.
+
+Запуск: python benchmarks/concurrency.py [операций на поток]
+
+В CPython с GIL потоки не выполняют Python-код параллельно, поэтому
+рост пропускной способности здесь ограничен; тест в первую очередь
+проверяет корректность и накладные расходы блокировок.
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from events import NullSink  # noqa: E402
+from menu import Menu  # noqa: E402
+from synthetic import card_rows  # noqa: E402
+
+
+def worker(menu: Menu, number: int, operations: int, shared_ids: list,
+           duplicates: list) -> None:
+    rnd = random.Random(number)
+    own = card_rows(operations, seed=number)
+
+    for step, (card_id, data) in enumerate(own):
+        menu.create_card(f"T{number}-{card_id}", data)
+
+        try:
+            menu.create_card(rnd.choice(shared_ids), data)
+        except ValueError:
+            pass
+        else:
+            duplicates.append(number)
+
+        menu.update_card(
+            rnd.choice(shared_ids),
+            {"quantity": rnd.randrange(1000), "location": f"Зона {step % 7}"}
+        )
+        menu.get_card(rnd.choice(shared_ids))
+
+
+def run(threads: int, operations: int) -> float:
+    menu = Menu(sink=NullSink(), thread_safe=True)
+    menu.create_cards(card_rows(1000))
+    shared_ids = list(menu.cards)
+    duplicates = []
+    workers = [
+        threading.Thread(
+            target=worker,
+            args=(menu, number, operations, shared_ids, duplicates)
+        )
+        for number in range(threads)
+    ]
+
+    started = time.perf_counter()
+
+    for thread in workers:
+        thread.start()
+
+    for thread in workers:
+        thread.join()
+
+    elapsed = time.perf_counter() - started
+
+    assert not duplicates, "Карточка создана дважды"
+    assert len(menu.cards) == 1000 + threads * operations
+    indexed = sum(len(menu.find(location=f"Зона {zone}")) for zone in range(7))
+    expected = sum(
+        card.get_location().startswith("Зона ")
+        for card in menu.cards.values()
+    )
+    assert indexed == expected, "Индекс местоположения рассогласован"
+
+    return threads * operations * 4 / elapsed
+
+
+def main() -> None:
+    operations = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    base = None
+
+    for threads in (1, 2, 4, 8):
+        throughput = run(threads, operations)
+        base = base or throughput
+        print(
+            f"Потоков: {threads}  {throughput:10.0f} операций/с  "
+            f"(x{throughput / base:.2f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Скорость разбора дат поступления: strptime против dates.parse_date.
+
+Запуск: python benchmarks/date_parsing.py [количество строк]
+"""
+
+import datetime
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dates import parse_date  # noqa: E402
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    rnd = random.Random(0)
+    pool = [
+        f"{rnd.randint(1, 28):02d}.{rnd.randint(1, 12):02d}."
+        f"{rnd.randint(2015, 2025)}"
+        for _ in range(300)
+    ]
+    values = [rnd.choice(pool) for _ in range(count)]
+
+    started = time.perf_counter()
+    for value in values:
+        datetime.datetime.strptime(value, "%d.%m.%Y")
+    slow = time.perf_counter() - started
+
+    parse_date.cache_clear()
+    started = time.perf_counter()
+    for value in values:
+        parse_date(value)
+    fast = time.perf_counter() - started
+
+    parse_date.cache_clear()
+    started = time.perf_counter()
+    for value in pool * (count // len(pool)):
+        parse_date.__wrapped__(value)
+    uncached = time.perf_counter() - started
+
+    print(f"Строк: {count}, различных дат: {len(pool)}")
+    print(f"strptime:                 {slow:.2f} с")
+    print(f"parse_date (с кэшем):     {fast:.2f} с (x{slow / fast:.1f})")
+    print(f"parse_date (без кэша):    {uncached:.2f} с")
+
+
+if __name__ == "__main__":
+    main()
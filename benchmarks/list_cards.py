@@ -0,0 +1,65 @@
+"""
+Время Menu.list_cards и повторных get_data до и после кэширования.
+
+"До" - построение строк списка через полный отформатированный словарь
+карточки на каждом вызове, как это делал list_cards раньше.
+
+Запуск: python benchmarks/list_cards.py [количество карточек]
+"""
+
+import contextlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from menu import Menu  # noqa: E402
+from synthetic import card_rows  # noqa: E402
+
+
+def list_formatted(menu: Menu) -> None:
+    """Прежняя реализация list_cards через отформатированный словарь."""
+
+    print("\n" + "=" * 60)
+
+    for card in menu.cards.values():
+        data = card._render()
+        print(
+            f"{data['ID']}: {data['Наименование']} | "
+            f"{data['Состояние']} | {data['Количество']} шт."
+        )
+
+    print(f"\nВсего карточек: {len(menu.cards)}")
+
+
+def timed(function, *args) -> float:
+    started = time.perf_counter()
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        function(*args)
+
+    return time.perf_counter() - started
+
+
+def get_data_all(menu: Menu) -> None:
+    for card in menu.cards.values():
+        card.get_data()
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    menu = Menu()
+    menu.create_cards(card_rows(count))
+
+    print(f"Карточек: {count}")
+    print(f"list_cards до:    {timed(list_formatted, menu):.2f} с")
+    print(f"list_cards после: {timed(menu.list_cards):.2f} с")
+
+    first = timed(get_data_all, menu)
+    second = timed(get_data_all, menu)
+    print(f"get_data первый вызов: {first:.2f} с, повторный: {second:.2f} с")
+
+
+if __name__ == "__main__":
+    main()
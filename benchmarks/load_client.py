@@ -0,0 +1,130 @@
+"""
+Генератор нагрузки для server.py: задержки p50/p99 и пропускная
+способность при большом количестве одновременных соединений.
+
+Каждое соединение отправляет запросы пакетами по --window штук,
+не дожидаясь ответов (конвейер), и измеряет время до ответа на
+каждый запрос. Чётные запросы создают карточки, нечётные читают
+одну из карточек, уже созданных этим соединением (сервер выполняет
+запросы соединения по порядку). Любой ответ с ошибкой считается
+неудачным запросом. Без --port/--unix сервис запускается в том же
+процессе.
+
+Запуск: python benchmarks/load_client.py --connections 1000 --requests 50
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from events import NullSink  # noqa: E402
+from menu import Menu  # noqa: E402
+from server import CardServer  # noqa: E402
+from synthetic import card_rows  # noqa: E402
+
+
+async def client(number: int, args, latencies: list, errors: list) -> None:
+    if args.unix:
+        reader, writer = await asyncio.open_unix_connection(args.unix)
+    else:
+        reader, writer = await asyncio.open_connection(args.host, args.port)
+
+    rows = card_rows(args.requests, seed=number)
+    rnd = random.Random(number)
+    created = []
+    sent = 0
+
+    while sent < args.requests:
+        window = []
+
+        for _ in range(min(args.window, args.requests - sent)):
+            if sent % 2:
+                request = {
+                    "method": "get_card",
+                    "params": {"card_id": rnd.choice(created)}
+                }
+            else:
+                card_id, data = next(rows)
+                card_id = f"L{number}-{card_id}"
+                created.append(card_id)
+                request = {
+                    "method": "create_card",
+                    "params": {"card_id": card_id, "data": data}
+                }
+
+            request["id"] = sent
+            window.append(time.perf_counter())
+            line = json.dumps(request, ensure_ascii=False).encode()
+            writer.write(line + b"\n")
+            sent += 1
+
+        await writer.drain()
+
+        for started in window:
+            line = await reader.readline()
+            latencies.append(time.perf_counter() - started)
+            response = json.loads(line)
+
+            if "error" in response:
+                errors.append(response["error"])
+
+    writer.close()
+    await writer.wait_closed()
+
+
+def percentile(values: list, share: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+async def run(args) -> None:
+    server = None
+
+    if not args.unix and not args.port:
+        menu = Menu(sink=NullSink())
+        menu.create_cards(card_rows(1000))
+        server = await CardServer(menu).start("127.0.0.1", 0)
+        args.host, args.port = server.sockets[0].getsockname()[:2]
+
+    latencies = []
+    errors = []
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        client(number, args, latencies, errors)
+        for number in range(args.connections)
+    ))
+    elapsed = time.perf_counter() - started
+
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+
+    latencies.sort()
+    print(f"Соединений: {args.connections}, запросов: {len(latencies)}")
+    print(f"Пропускная способность: {len(latencies) / elapsed:.0f} запр./с")
+    print(f"p50: {percentile(latencies, 0.5) * 1000:.2f} мс")
+    print(f"p99: {percentile(latencies, 0.99) * 1000:.2f} мс")
+    print(f"Ошибок: {len(errors)}")
+
+    for error in sorted(set(errors))[:5]:
+        print(f"  {error}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--unix")
+    parser.add_argument("--connections", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--window", type=int, default=10)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Сравнение памяти Menu с обычным dict и с колоночным CardStore.
+
+Замер идёт в двух вариантах. В первом строки данных готовы заранее,
+и карточки ссылаются на уже созданные значения: учитываются только
+структуры реестра. Во втором каждая строка разбирается из JSON во
+время загрузки, как при импорте или восстановлении из журнала, и в
+замер попадают значения, которые реестр удерживает: отдельные
+строки поставщика, производителя и места хранения в каждой карточке
+dict и интернированные строки и массивы чисел в CardStore.
+
+Запуск: python benchmarks/memory.py [количество карточек]
+"""
+
+import contextlib
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from card_store import CardStore  # noqa: E402
+from menu import Menu  # noqa: E402
+from synthetic import card_rows  # noqa: E402
+
+
+def measure(count: int, cards=None, from_json: bool = False) -> int:
+    """
+    Заполнение Menu синтетическими карточками и замер занятой памяти.
+
+    Args:
+        count: Количество карточек
+        cards: Хранилище карточек для Menu
+        from_json: Разбирать каждую строку из JSON во время загрузки
+
+    Returns:
+        int: Объём памяти в байтах, занятый заполненным Menu
+    """
+
+    if from_json:
+        rows = [
+            json.dumps(row, ensure_ascii=False) for row in card_rows(count)
+        ]
+    else:
+        rows = list(card_rows(count))
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        menu = Menu(cards)
+
+        for row in rows:
+            card_id, data = json.loads(row) if from_json else row
+            menu.create_card(card_id, data)
+
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    return used
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    print(f"Карточек: {count}")
+
+    for title, from_json in (
+            ("Готовые строки", False), ("Загрузка из JSON", True)
+    ):
+        print(title)
+
+        for name, cards in (("dict", None), ("CardStore", CardStore())):
+            used = measure(count, cards, from_json)
+            print(
+                f"  {name:10} {used / 2 ** 20:8.1f} МБ "
+                f"({used / count:.0f} байт/карточка)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Замер времени восстановления Menu из снимка и хвоста журнала CardLog.
+
+Цель по умолчанию - 10 с на 1 млн карточек. На одноядерной тестовой
+машине восстановление 100 тыс. карточек (+10 тыс. записей журнала)
+занимает 0,65 с, а 1 млн (+100 тыс.) - 9,4-9,5 с, с небольшим запасом
+до цели. Около четверти времени уходит на разбор JSON, столько же -
+на создание карточек, остальное - на пакетное построение индексов и
+остатков (Menu._attach).
+
+Запуск: python benchmarks/recovery.py [количество карточек] [цель, с]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from card_log import CardLog  # noqa: E402
+from menu import Menu  # noqa: E402
+from synthetic import card_rows  # noqa: E402
+
+
+def write(directory: str, count: int, tail: int) -> float:
+    """
+    Запись count карточек со снимком и tail записей журнала.
+
+    Menu, записавший карточки, освобождается до восстановления, как
+    при перезапуске: иначе сборщик мусора при восстановлении обходит
+    и его карточки.
+
+    Returns:
+        float: Время записи в секундах
+    """
+
+    log = CardLog(directory, snapshot_every=count * 2)
+    menu = Menu(log=log)
+    started = time.perf_counter()
+    menu.create_cards(card_rows(count), atomic=False)
+    log.snapshot(menu.cards.values())
+    updates = ((f"C{i:08d}", {"quantity": i % 500}) for i in range(tail))
+    menu.update_cards(updates, atomic=False)
+    menu.close()
+
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    target = float(sys.argv[2]) if len(sys.argv) > 2 else 10.0
+    tail = count // 10
+
+    with tempfile.TemporaryDirectory() as directory:
+        written = write(directory, count, tail)
+        print(f"Запись {count} карточек + {tail} записей журнала: "
+              f"{written:.2f} с")
+
+        started = time.perf_counter()
+        restored = Menu(log=CardLog(directory))
+        elapsed = time.perf_counter() - started
+        restored.close()
+
+        assert len(restored.cards) == count
+
+    status = "OK" if elapsed <= target else "ПРЕВЫШЕНО"
+    print(f"Восстановление: {elapsed:.2f} с (цель {target:.0f} с) - {status}")
+    print(f"Скорость: {(count + tail) / elapsed:,.0f} записей/с")
+
+
+if __name__ == "__main__":
+    main()
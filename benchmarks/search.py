@@ -0,0 +1,103 @@
+"""
+Время поиска карточек по наименованию и артикулу: TextIndex против
+перебора get_data всех карточек.
+
+Запуск: python benchmarks/search.py [количество карточек]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from events import NullSink  # noqa: E402
+from menu import Menu  # noqa: E402
+from synthetic import card_rows  # noqa: E402
+from text_index import TextIndex  # noqa: E402
+
+
+NOUNS = (
+    "болт", "гайка", "шайба", "винт", "саморез", "дюбель", "кабель",
+    "провод", "розетка", "выключатель", "лампа", "патрон", "хомут",
+    "анкер", "шуруп", "заклёпка", "петля", "уголок", "кронштейн"
+)
+ADJECTIVES = (
+    "оцинкованный", "латунный", "медный", "стальной", "пластиковый",
+    "белый", "чёрный", "усиленный", "нержавеющий", "монтажный"
+)
+QUERIES = (
+    ("болт", False),
+    ("кабель медн", False),
+    ("a-4821", False),
+    ("анкер усил м12", False),
+    ("выключатль", True),
+    ("нержавеющий самарез", True),
+    ("кронштеин м8", True)
+)
+
+
+def named_rows(count: int):
+    """Синтетические карточки с наименованиями из нескольких слов."""
+
+    rnd = random.Random(1)
+
+    for card_id, data in card_rows(count):
+        data["name"] = (
+            f"{rnd.choice(NOUNS)} {rnd.choice(ADJECTIVES)} "
+            f"М{rnd.randint(3, 24)}x{rnd.randint(10, 300)}"
+        )
+        yield card_id, data
+
+
+def scan(menu: Menu, query: str, limit: int) -> list:
+    """Прежний способ: подстрока в отформатированных данных карточек."""
+
+    query = query.casefold()
+    found = []
+
+    for card in menu.cards.values():
+        data = card.get_data()
+
+        if (
+            query in data["Наименование"].casefold()
+            or query in data["Артикул"].casefold()
+        ):
+            found.append(card)
+
+            if len(found) == limit:
+                break
+
+    return found
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    menu = Menu(sink=NullSink(), search=TextIndex())
+
+    started = time.perf_counter()
+    menu.create_cards(named_rows(count))
+    print(f"Карточек: {count}, создание с индексами: "
+          f"{time.perf_counter() - started:.1f} с")
+
+    for query, fuzzy in QUERIES:
+        started = time.perf_counter()
+        found = menu.search(query, limit=10, fuzzy=fuzzy)
+        elapsed = (time.perf_counter() - started) * 1000
+        mode = "с опечатками" if fuzzy else "по началу слов"
+        print(
+            f"{query!r:24} {mode:15} {elapsed:8.2f} мс, "
+            f"найдено {len(found)}"
+        )
+
+    started = time.perf_counter()
+    scan(menu, "несуществующее", 10)
+    print(
+        f"Перебор get_data (без совпадений): "
+        f"{(time.perf_counter() - started) * 1000:.0f} мс"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Пропускная способность пакетного импорта в ShardedMenu в зависимости
+от количества процессов-шардов.
+
+Запуск: python benchmarks/sharded_import.py [количество карточек]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from importer import chunked  # noqa: E402
+from sharding import ShardedMenu  # noqa: E402
+from synthetic import card_rows  # noqa: E402
+
+
+def run(workers: int, rows: list) -> float:
+    with ShardedMenu(workers) as menu:
+        started = time.perf_counter()
+
+        for chunk in chunked(rows, 20000):
+            menu.create_cards(chunk)
+
+        elapsed = time.perf_counter() - started
+        assert len(menu) == len(rows)
+
+    return len(rows) / elapsed
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    rows = list(card_rows(count))
+    cores = os.cpu_count() or 1
+    workers = 1
+    base = None
+
+    print(f"Карточек: {count}, ядер: {cores}")
+
+    while True:
+        throughput = run(workers, rows)
+        base = base or throughput
+        print(
+            f"Шардов: {workers:3}  {throughput:10.0f} карточек/с  "
+            f"(x{throughput / base:.2f})"
+        )
+
+        if workers >= cores:
+            break
+
+        workers = min(workers * 2, cores)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Двоичный снимок через mmap против JSON Lines со словарями get_data.
+
+Запуск: python benchmarks/snapshot_format.py [количество карточек]
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from binary_snapshot import SnapshotReader  # noqa: E402
+from card_store import CardStore  # noqa: E402
+from events import NullSink  # noqa: E402
+from menu import Menu  # noqa: E402
+from synthetic import card_rows  # noqa: E402
+
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+
+    return result, time.perf_counter() - started
+
+
+def write_json(path: str, menu: Menu) -> None:
+    """Прежний способ: строки JSON с отформатированными данными."""
+
+    with open(path, "w", encoding="utf-8") as file:
+        for card in menu.cards.values():
+            file.write(json.dumps(card.get_data(), ensure_ascii=False) + "\n")
+
+
+def read_json(path: str) -> list:
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file]
+
+
+def lookups(reader: SnapshotReader, card_ids: list) -> None:
+    for card_id in card_ids:
+        reader.get(card_id)
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    menu = Menu(cards=CardStore(), sink=NullSink())
+    menu.create_cards(card_rows(count), atomic=False)
+    sample = random.Random(0).sample(list(menu.cards), 1000)
+
+    with tempfile.TemporaryDirectory() as directory:
+        binary_path = os.path.join(directory, "cards.snap")
+        json_path = os.path.join(directory, "cards.jsonl")
+
+        _, binary_write = timed(menu.export_snapshot, binary_path)
+        _, json_write = timed(write_json, json_path, menu)
+        print(f"Карточек: {count}")
+        print(
+            f"Запись:  двоичный {binary_write:.2f} с "
+            f"({os.path.getsize(binary_path) / 2 ** 20:.0f} МБ), "
+            f"JSON {json_write:.2f} с "
+            f"({os.path.getsize(json_path) / 2 ** 20:.0f} МБ)"
+        )
+
+        reader, opened = timed(SnapshotReader, binary_path)
+        _, looked_up = timed(lookups, reader, sample)
+        total, summed = timed(sum, reader.column("quantity"))
+        reader.close()
+        print(f"Открытие двоичного снимка: {opened * 1000:.2f} мс")
+        print(
+            f"1000 случайных карточек по ID: {looked_up * 1000:.1f} мс"
+        )
+        print(f"Сумма колонки quantity: {summed * 1000:.0f} мс")
+
+        _, json_read = timed(read_json, json_path)
+        restored = Menu(cards=CardStore(), sink=NullSink())
+        _, imported = timed(restored.import_snapshot, binary_path)
+        print(
+            f"Полная загрузка: JSON (только разбор) {json_read:.2f} с, "
+            f"import_snapshot в Menu {imported:.2f} с"
+        )
+
+
+if __name__ == "__main__":
+    main()
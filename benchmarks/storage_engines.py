@@ -0,0 +1,105 @@
+"""
+Пропускная способность Menu с разными хранилищами карточек: dict,
+CardStore и SqliteStore (файл SQLite с LRU-кэшем).
+
+Запуск: python benchmarks/storage_engines.py [количество карточек]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from card_store import CardStore  # noqa: E402
+from events import NullSink  # noqa: E402
+from menu import Menu  # noqa: E402
+from sqlite_store import SqliteStore  # noqa: E402
+from synthetic import card_rows  # noqa: E402
+
+
+OPERATIONS = 10000
+
+
+def rate(count: int, function, *args) -> float:
+    """Операций в секунду при count операциях вызова function."""
+
+    started = time.perf_counter()
+    function(*args)
+
+    return count / (time.perf_counter() - started)
+
+
+def create_each(menu: Menu, rows: list) -> None:
+    for card_id, data in rows:
+        menu.create_card(card_id, data)
+
+
+def get_each(menu: Menu, card_ids: list) -> None:
+    for card_id in card_ids:
+        menu.get_card(card_id)
+
+
+def update_each(menu: Menu, card_ids: list) -> None:
+    for index, card_id in enumerate(card_ids):
+        menu.update_card(card_id, {"quantity": index, "cost": index / 2})
+
+
+def scan(menu: Menu) -> None:
+    for _ in menu.iter_cards():
+        pass
+
+
+def measure(name: str, menu: Menu, count: int) -> None:
+    rows = list(card_rows(count + OPERATIONS))
+    rnd = random.Random(0)
+    results = {
+        "create_cards": rate(
+            count, menu.create_cards, rows[:count], False
+        ),
+        "create_card": rate(OPERATIONS, create_each, menu, rows[count:])
+    }
+
+    if hasattr(menu.cards, "flush"):
+        menu.cards.flush()
+
+    card_ids = [card_id for card_id, _ in rows]
+    hot = card_ids[-1000:] * (OPERATIONS // 1000)
+    cold = rnd.sample(card_ids, OPERATIONS)
+    results["get_card (горячие)"] = rate(OPERATIONS, get_each, menu, hot)
+    results["get_card (случайные)"] = rate(OPERATIONS, get_each, menu, cold)
+    results["update_card"] = rate(OPERATIONS, update_each, menu, cold)
+    results["iter_cards"] = rate(len(card_ids), scan, menu)
+
+    for operation, value in results.items():
+        print(f"{name:12} {operation:22} {value:>12,.0f} оп/с")
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    print(f"Карточек: {count}, операций в замере: {OPERATIONS}")
+    measure("dict", Menu(sink=NullSink()), count)
+    measure("CardStore", Menu(cards=CardStore(), sink=NullSink()), count)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "cards.db")
+        menu = Menu(cards=SqliteStore(path), sink=NullSink())
+        measure("SqliteStore", menu, count)
+        menu.close()
+        print(f"Размер базы: {os.path.getsize(path) / 2 ** 20:.1f} МБ")
+
+        started = time.perf_counter()
+        menu = Menu(cards=SqliteStore(path), sink=NullSink())
+        menu.stock_totals()
+        print(
+            f"Открытие базы и stock_totals: "
+            f"{time.perf_counter() - started:.3f} с"
+        )
+        menu.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+"""
+Набор замеров горячих путей ProductCard и Menu с проверкой регрессий.
+
+Для каждого размера (количества карточек) и каждого замера
+записываются операции в секунду и пик памяти (tracemalloc) во время
+замера. Результаты сохраняются в JSON и сравниваются с сохранённой
+базой: замер считается регрессией, если операций в секунду стало
+меньше или пик памяти больше, чем допускает порог.
+
+Запуск:
+    python benchmarks/suite.py --sizes 1000,100000 --output new.json
+    python benchmarks/suite.py --baseline base.json --threshold 0.1
+
+Код возврата 1 - найдены регрессии.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from events import NullSink  # noqa: E402
+from menu import Menu  # noqa: E402
+from product_card import ProductCard, confirm_always  # noqa: E402
+from synthetic import card_rows  # noqa: E402
+
+
+CHUNK = 100000
+SINK = NullSink()
+
+
+def chunks(count: int):
+    """Синтетические строки (card_id, data) пачками не больше CHUNK."""
+
+    rows = card_rows(count)
+
+    for start in range(0, count, CHUNK):
+        yield [next(rows) for _ in range(min(CHUNK, count - start))]
+
+
+def new_card(card_id: str, data: dict) -> ProductCard:
+    return ProductCard(
+        card_id,
+        data["name"],
+        data["quantity"],
+        data["supplier"],
+        data["manufacturer"],
+        data["cost"],
+        data["location"],
+        data["articul"],
+        data["guarantee"],
+        data["receipt_date"]
+    )
+
+
+def from_data(card_id: str, data: dict) -> ProductCard:
+    return ProductCard.from_data(card_id, data)
+
+
+def filled_menu(count: int) -> Menu:
+    menu = Menu(sink=SINK)
+
+    for rows in chunks(count):
+        menu.create_cards(rows, atomic=False)
+
+    return menu
+
+
+def card_init(count: int) -> float:
+    elapsed = 0.0
+
+    for rows in chunks(count):
+        started = time.perf_counter()
+
+        for card_id, data in rows:
+            new_card(card_id, data)
+
+        elapsed += time.perf_counter() - started
+
+    return elapsed
+
+
+def card_create(count: int) -> float:
+    elapsed = 0.0
+
+    for rows in chunks(count):
+        cards = [new_card(card_id, data) for card_id, data in rows]
+        started = time.perf_counter()
+
+        for card, (_, data) in zip(cards, rows):
+            card.create(data, SINK)
+
+        elapsed += time.perf_counter() - started
+
+    return elapsed
+
+
+def card_update(count: int) -> float:
+    elapsed = 0.0
+
+    for rows in chunks(count):
+        cards = [from_data(card_id, data) for card_id, data in rows]
+        started = time.perf_counter()
+
+        for index, card in enumerate(cards):
+            card.update({"quantity": index, "cost": index / 2}, SINK)
+
+        elapsed += time.perf_counter() - started
+
+    return elapsed
+
+
+def card_get_data(count: int) -> float:
+    elapsed = 0.0
+
+    for rows in chunks(count):
+        cards = [from_data(card_id, data) for card_id, data in rows]
+        started = time.perf_counter()
+
+        for card in cards:
+            card.get_data()
+
+        elapsed += time.perf_counter() - started
+
+    return elapsed
+
+
+def card_set_receipt_date(count: int) -> float:
+    elapsed = 0.0
+
+    for rows in chunks(count):
+        cards = [from_data(card_id, data) for card_id, data in rows]
+        dates = [data["receipt_date"] for _, data in reversed(rows)]
+        started = time.perf_counter()
+
+        for card, value in zip(cards, dates):
+            card.set_receipt_date(value)
+
+        elapsed += time.perf_counter() - started
+
+    return elapsed
+
+
+def menu_create_card(count: int) -> float:
+    menu = Menu(sink=SINK)
+    elapsed = 0.0
+
+    for rows in chunks(count):
+        started = time.perf_counter()
+
+        for card_id, data in rows:
+            menu.create_card(card_id, data)
+
+        elapsed += time.perf_counter() - started
+
+    return elapsed
+
+
+def menu_get_card(count: int) -> float:
+    menu = filled_menu(count)
+    card_ids = list(menu.cards)
+    started = time.perf_counter()
+
+    for card_id in card_ids:
+        menu.get_card(card_id)
+
+    return time.perf_counter() - started
+
+
+def menu_list_cards(count: int) -> float:
+    menu = filled_menu(count)
+    started = time.perf_counter()
+    menu.list_cards()
+
+    return time.perf_counter() - started
+
+
+def menu_write_off_card(count: int) -> float:
+    menu = filled_menu(count)
+    card_ids = list(menu.cards)
+    started = time.perf_counter()
+
+    for card_id in card_ids:
+        menu.write_off_card(card_id, confirm_always)
+
+    return time.perf_counter() - started
+
+
+# Каждый замер обрабатывает count карточек и возвращает время в секундах
+CASES = {
+    "ProductCard.__init__": card_init,
+    "ProductCard.create": card_create,
+    "ProductCard.update": card_update,
+    "ProductCard.get_data": card_get_data,
+    "ProductCard.set_receipt_date": card_set_receipt_date,
+    "Menu.create_card": menu_create_card,
+    "Menu.get_card": menu_get_card,
+    "Menu.list_cards": menu_list_cards,
+    "Menu.write_off_card": menu_write_off_card
+}
+
+
+def measure(case, count: int, repeat: int = 3, memory: bool = True) -> dict:
+    """
+    Замер одного случая: лучшее время из repeat прогонов без
+    tracemalloc, затем отдельный прогон для пика памяти.
+
+    Returns:
+        dict: {"ops", "seconds", "ops_per_sec", "peak_bytes"}
+    """
+
+    seconds = min(case(count) for _ in range(repeat))
+    peak = None
+
+    if memory:
+        tracemalloc.start()
+        case(count)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {
+        "ops": count,
+        "seconds": round(seconds, 6),
+        "ops_per_sec": round(count / seconds, 1) if seconds else None,
+        "peak_bytes": peak
+    }
+
+
+def run(
+        sizes: list,
+        names: list,
+        repeat: int = 3,
+        memory: bool = True
+) -> dict:
+    """Выполнение замеров для всех размеров и вывод по мере готовности."""
+
+    results = {}
+
+    for count in sizes:
+        for name in names:
+            key = f"{name}@{count}"
+            results[key] = measure(CASES[name], count, repeat, memory)
+            print(format_result(key, results[key]), flush=True)
+
+    return {
+        "meta": {
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sizes": sizes,
+            "repeat": repeat
+        },
+        "results": results
+    }
+
+
+def format_result(key: str, result: dict) -> str:
+    peak = result["peak_bytes"]
+    memory = f"{peak / 2 ** 20:9.1f} МБ" if peak is not None else ""
+
+    return f"{key:40} {result['ops_per_sec']:>14,.0f} оп/с {memory}"
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """
+    Сравнение результатов с базой.
+
+    Args:
+        current: Результаты run
+        baseline: Сохранённые результаты run
+        threshold: Допустимая доля ухудшения (0.1 - 10%)
+
+    Returns:
+        list: Строки с описанием регрессий
+    """
+
+    regressions = []
+
+    for key, result in current["results"].items():
+        base = baseline["results"].get(key)
+
+        if base is None:
+            continue
+
+        speed = result["ops_per_sec"] / base["ops_per_sec"]
+
+        if speed < 1 - threshold:
+            regressions.append(
+                f"{key}: {result['ops_per_sec']:,.0f} оп/с против "
+                f"{base['ops_per_sec']:,.0f} ({speed - 1:+.0%})"
+            )
+
+        if result["peak_bytes"] and base["peak_bytes"]:
+            growth = result["peak_bytes"] / base["peak_bytes"]
+
+            if growth > 1 + threshold:
+                regressions.append(
+                    f"{key}: пик памяти {result['peak_bytes']:,} байт "
+                    f"против {base['peak_bytes']:,} ({growth - 1:+.0%})"
+                )
+
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", default="1000,10000,100000",
+        help="Количества карточек через запятую (до 10000000)"
+    )
+    parser.add_argument(
+        "--cases", help="Замеры через запятую (по умолчанию все)"
+    )
+    parser.add_argument("--output", help="Файл для результатов в JSON")
+    parser.add_argument("--baseline", help="Файл базы для сравнения")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1,
+        help="Допустимая доля ухудшения (по умолчанию 0.1)"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3,
+        help="Количество прогонов для замера времени (берётся лучший)"
+    )
+    parser.add_argument(
+        "--no-memory", action="store_true",
+        help="Не замерять пик памяти"
+    )
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    names = args.cases.split(",") if args.cases else list(CASES)
+    unknown = set(names) - set(CASES)
+
+    if unknown:
+        parser.error(f"Неизвестные замеры: {', '.join(sorted(unknown))}")
+
+    current = run(sizes, names, args.repeat, not args.no_memory)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(current, file, ensure_ascii=False, indent=2)
+
+    if not args.baseline:
+        return
+
+    with open(args.baseline, encoding="utf-8") as file:
+        baseline = json.load(file)
+
+    regressions = compare(current, baseline, args.threshold)
+
+    if regressions:
+        print(f"\nРегрессии (порог {args.threshold:.0%}):")
+
+        for line in regressions:
+            print("  " + line)
+
+        sys.exit(1)
+
+    print(f"\nРегрессий нет (порог {args.threshold:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import random
+
+
+SUPPLIERS = [f"Поставщик {i}" for i in range(50)]
+MANUFACTURERS = [f"Производитель {i}" for i in range(200)]
+LOCATIONS = [f"Склад {i // 10}, стеллаж {i % 10}" for i in range(100)]
+
+
+def card_rows(count: int, seed: int = 0):
+    """
+    Генератор синтетических данных для карточек товаров.
+
+    Args:
+        count: Количество карточек
+        seed: Зерно генератора случайных чисел
+
+    Yields:
+        tuple: Пара (card_id, data) в формате Menu.create_card
+    """
+
+    rnd = random.Random(seed)
+
+    for i in range(count):
+        yield f"C{i:08d}", {
+            "name": f"Товар {rnd.randrange(100000)}",
+            "quantity": rnd.randrange(1000),
+            "supplier": rnd.choice(SUPPLIERS),
+            "manufacturer": rnd.choice(MANUFACTURERS),
+            "cost": round(rnd.uniform(1, 100000), 2),
+            "location": rnd.choice(LOCATIONS),
+            "articul": f"A-{rnd.randrange(10 ** 6):06d}",
+            "guarantee": rnd.choice((0, 6, 12, 24, 36)),
+            "receipt_date": (
+                f"{rnd.randint(1, 28):02d}.{rnd.randint(1, 12):02d}."
+                f"{rnd.randint(2015, 2025)}"
+            )
+        }
@@ -0,0 +1,192 @@
+"""
+Скорость проверки данных карточки: цепочка сеттеров против валидатора схемы.
+
+LegacyCard повторяет прежнюю реализацию - отдельный сеттер с проверкой
+и уведомлением на каждое поле, вызываемые из _fill по очереди.
+
+Запуск: python benchmarks/validation.py [количество строк]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dates import to_datetime  # noqa: E402
+from events import NullSink  # noqa: E402
+from product_card import ProductCard, validate_card  # noqa: E402
+from synthetic import card_rows  # noqa: E402
+
+SINK = NullSink()
+
+
+class LegacyCard(ProductCard):
+    """Карточка с прежней цепочкой сеттеров."""
+
+    __slots__ = ()
+
+    def _notify(self, field, old, new):
+        self._view = None
+
+        if self._observer is not None and old != new:
+            self._observer.card_changed(self, field, old, new)
+
+    def set_name(self, value):
+        if not value or not value.strip():
+            raise ValueError("Название не может быть пустым")
+
+        old = self._name
+        self._name = value.strip()
+        self._notify("name", old, self._name)
+
+    def set_supplier(self, value):
+        if not value or not value.strip():
+            raise ValueError("Поставщик не может быть пустым")
+
+        old = self._supplier
+        self._supplier = value.strip()
+        self._notify("supplier", old, self._supplier)
+
+    def set_manufacturer(self, value):
+        if not value or not value.strip():
+            raise ValueError("Производитель не может быть пустым")
+
+        old = self._manufacturer
+        self._manufacturer = value.strip()
+        self._notify("manufacturer", old, self._manufacturer)
+
+    def set_location(self, value):
+        if not value or not value.strip():
+            raise ValueError("Местоположение не может быть пустым")
+
+        old = self._location
+        self._location = value.strip()
+        self._notify("location", old, self._location)
+
+    def set_quantity(self, value):
+        if value < 0:
+            raise ValueError("Количество не может быть отрицательным")
+
+        old = self._quantity
+        self._quantity = value
+        self._notify("quantity", old, value)
+
+    def set_cost(self, value):
+        if value < 0:
+            raise ValueError("Стоимость не может быть отрицательной")
+
+        old = self._cost
+        self._cost = value
+        self._notify("cost", old, value)
+
+    def set_guarantee(self, value):
+        if value < 0:
+            raise ValueError("Гарантия не может быть отрицательной")
+
+        old = self._guarantee
+        self._guarantee = value
+        self._notify("guarantee", old, value)
+
+    def set_articul(self, value):
+        old = self._articul
+        self._articul = value.strip() if value else ""
+        self._notify("articul", old, self._articul)
+
+    def set_receipt_date(self, value):
+        receipt = to_datetime(value)
+        old = self._receipt_date
+        self._receipt_date = receipt
+        self._notify("receipt_date", old, receipt)
+
+    def set_status(self, value):
+        if value not in (self.STATUS_DRAFT, self.STATUS_IN_STOCK,
+                         self.STATUS_WRITTEN_OFF):
+            raise ValueError("Некорректный статус")
+
+        old = self._status
+        self._status = value
+        self._notify("status", old, value)
+
+    def _fill(self, data):
+        self.set_name(data["name"])
+        self.set_quantity(data["quantity"])
+        self.set_supplier(data["supplier"])
+        self.set_manufacturer(data["manufacturer"])
+        self.set_cost(data["cost"])
+        self.set_location(data["location"])
+        self.set_articul(data.get("articul", ""))
+        self.set_guarantee(data.get("guarantee", 0))
+        self.set_receipt_date(data.get("receipt_date", ""))
+        self.set_status(self.STATUS_IN_STOCK)
+
+
+def _draft(cls, card_id: str, data: dict) -> ProductCard:
+    """Черновик карточки, как его прежде строил Menu.create_card."""
+
+    return cls(
+        card_id,
+        data.get("name", ""),
+        data.get("quantity", 0),
+        data.get("supplier", ""),
+        data.get("manufacturer", ""),
+        data.get("cost", 0.0),
+        data.get("location", ""),
+        data.get("articul", ""),
+        data.get("guarantee", 0),
+        data.get("receipt_date", "")
+    )
+
+
+def _timed(functions: dict, rows, repeat: int = 7) -> dict:
+    """
+    Лучшее среднее время обработки строки в микросекундах.
+
+    Прогоны разных вариантов чередуются, чтобы колебания нагрузки
+    машины сказывались на всех вариантах одинаково.
+    """
+
+    best = {}
+
+    for _ in range(repeat):
+        for label, function in functions.items():
+            started = time.perf_counter()
+
+            for card_id, data in rows:
+                function(card_id, data)
+
+            elapsed = time.perf_counter() - started
+            best[label] = min(best.get(label, elapsed), elapsed)
+
+    return {label: value / len(rows) * 1e6 for label, value in best.items()}
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    rows = list(card_rows(count))
+
+    def legacy(card_id, data):
+        _draft(LegacyCard, card_id, data).create(data, SINK)
+
+    def create(card_id, data):
+        _draft(ProductCard, card_id, data).create(data, SINK)
+
+    times = _timed({
+        "Цепочка сеттеров": legacy,
+        "Схема, черновик + create": create,
+        "Схема, from_data": ProductCard.from_data,
+        "Только validate_card": lambda card_id, data: validate_card(data)
+    }, rows)
+    legacy_time = times["Цепочка сеттеров"]
+
+    print(f"Строк: {count}")
+
+    for label, value in times.items():
+        print(
+            f"{label + ':':<26} {value:.2f} мкс/строка "
+            f"(x{legacy_time / value:.2f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
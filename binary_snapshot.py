@@ -0,0 +1,347 @@
+import bisect
+import datetime
+import itertools
+import mmap
+import struct
+import sys
+from array import array
+
+from product_card import STATUSES, ProductCard
+
+
+MAGIC = b"CARDSNAP"
+VERSION = 1
+HEADER = struct.Struct("<8sHHIQ")
+ENTRY = struct.Struct("<16s1s7xQQQQ")
+ALIGN = 8
+
+# (поле, вид колонки): "s" - строки, "k" - коды общего словаря строк,
+# остальное - код типа array
+COLUMNS = (
+    ("card_id", "s"),
+    ("name", "s"),
+    ("quantity", "q"),
+    ("status", "b"),
+    ("supplier", "k"),
+    ("manufacturer", "k"),
+    ("cost", "d"),
+    ("location", "k"),
+    ("articul", "s"),
+    ("guarantee", "q"),
+    ("receipt_date", "i")
+)
+DICTIONARY = "dictionary"
+
+
+def _strings(values: list) -> tuple:
+    """Смещения (array Q, на одно больше строк) и байты UTF-8 строк."""
+
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = array("Q", [0])
+    offsets.extend(itertools.accumulate(map(len, encoded)))
+
+    return offsets, b"".join(encoded)
+
+
+def write_snapshot(path: str, cards) -> int:
+    """
+    Запись карточек в двоичный колоночный снимок.
+
+    Формат (little-endian): заголовок HEADER (сигнатура, версия,
+    количество колонок и карточек), каталог колонок из записей ENTRY
+    (имя, вид, смещение и размер основного и дополнительного блока)
+    и блоки колонок, выровненные по 8 байт. Числа хранятся
+    типизированными массивами, даты - номерами дней (0 - нет даты),
+    статусы - номерами в STATUSES. Строковые колонки - массив смещений
+    uint64 и байты UTF-8, а поставщик, производитель и местоположение -
+    коды uint32 в общем словаре строк. Карточки упорядочены по ID.
+
+    Args:
+        path: Путь к файлу снимка
+        cards: Итерируемый набор карточек ProductCard
+
+    Returns:
+        int: Количество записанных карточек
+    """
+
+    records = sorted(
+        (card.get_raw() for card in cards), key=lambda raw: raw["card_id"]
+    )
+    codes = {}
+    status_codes = {status: code for code, status in enumerate(STATUSES)}
+    blocks = []
+
+    for field, kind in COLUMNS:
+        values = [raw[field] for raw in records]
+
+        if kind == "s":
+            blocks.append((field, kind, *_strings(values)))
+        elif kind == "k":
+            column = array("I", [
+                codes.setdefault(value, len(codes)) for value in values
+            ])
+            blocks.append((field, kind, column, b""))
+        elif field == "status":
+            column = array("b", [status_codes[value] for value in values])
+            blocks.append((field, kind, column, b""))
+        elif field == "receipt_date":
+            column = array("i", [
+                value.toordinal() if value else 0 for value in values
+            ])
+            blocks.append((field, kind, column, b""))
+        else:
+            blocks.append((field, kind, array(kind, values), b""))
+
+    blocks.append((DICTIONARY, "s", *_strings(list(codes))))
+
+    if sys.byteorder != "little":
+        for _, _, column, _ in blocks:
+            column.byteswap()
+
+    position = HEADER.size + ENTRY.size * len(blocks)
+    entries = []
+    layout = []
+
+    for name, kind, main, aux in blocks:
+        main = main.tobytes() if isinstance(main, array) else main
+        offsets = []
+
+        for block in (main, aux):
+            position += -position % ALIGN
+            offsets.append((position, len(block)))
+            layout.append((position, block))
+            position += len(block)
+
+        (main_offset, main_size), (aux_offset, aux_size) = offsets
+        entries.append(ENTRY.pack(
+            name.encode(), kind.encode(),
+            main_offset, main_size, aux_offset, aux_size
+        ))
+
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, 0, len(blocks), len(records)))
+        file.write(b"".join(entries))
+
+        for offset, block in layout:
+            file.write(b"\0" * (offset - file.tell()))
+            file.write(block)
+
+    return len(records)
+
+
+class SnapshotReader:
+    """
+    Чтение двоичного снимка (см. write_snapshot) через mmap.
+
+    Файл отображается в память, а колонки доступны как memoryview
+    без копирования данных, поэтому открытие снимка не зависит от
+    количества карточек, а страницы файла читаются с диска только при
+    обращении к ним. Карточки в снимке упорядочены по ID, поэтому
+    поиск по ID - двоичный поиск по колонке ID.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Открытие снимка.
+
+        Args:
+            path: Путь к файлу снимка
+
+        Raises:
+            ValueError: Если файл не является снимком поддерживаемой
+                        версии или повреждён
+        """
+
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._views = []
+
+        try:
+            self._open()
+        except (ValueError, TypeError, struct.error) as e:
+            self.close()
+            raise ValueError(f"Некорректный файл снимка {path}: {e}") from e
+
+    def _open(self) -> None:
+        """Разбор заголовка и каталога колонок."""
+
+        magic, version, _, columns, count = HEADER.unpack_from(self._mmap)
+
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("неизвестная сигнатура или версия")
+
+        if sys.byteorder != "little":
+            raise ValueError("чтение поддерживается только на little-endian")
+
+        self._count = count
+        self._columns = {}
+        data = memoryview(self._mmap)
+        self._views.append(data)
+
+        for index in range(columns):
+            name, kind, main, main_size, aux, aux_size = ENTRY.unpack_from(
+                self._mmap, HEADER.size + ENTRY.size * index
+            )
+
+            if max(main + main_size, aux + aux_size) > len(self._mmap):
+                raise ValueError("колонка выходит за пределы файла")
+
+            kind = kind.decode()
+            main_view = data[main:main + main_size]
+            self._views.append(main_view)
+
+            if kind == "s":
+                column = (main_view.cast("Q"), data[aux:aux + aux_size])
+            elif kind == "k":
+                column = main_view.cast("I")
+            else:
+                column = main_view.cast(kind)
+
+            self._views.extend(column if kind == "s" else (column,))
+            self._columns[name.rstrip(b"\0").decode()] = column
+
+    def __enter__(self) -> 'SnapshotReader':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def column(self, field: str) -> memoryview:
+        """
+        Числовая колонка без копирования (quantity, status, cost,
+        guarantee, receipt_date или коды supplier/manufacturer/location).
+
+        Raises:
+            KeyError: Для неизвестной или строковой колонки
+        """
+
+        column = self._columns[field]
+
+        if isinstance(column, tuple):
+            raise KeyError(field)
+
+        return column
+
+    def _string(self, field: str, row: int) -> str:
+        offsets, data = self._columns[field]
+
+        return str(data[offsets[row]:offsets[row + 1]], "utf-8")
+
+    def card_id(self, row: int) -> str:
+        """ID карточки в строке row."""
+
+        return self._string("card_id", row)
+
+    def raw(self, row: int) -> dict:
+        """
+        Данные карточки в строке row в формате ProductCard.get_raw:
+        дата поступления - datetime, построенный прямо из номера дня.
+
+        Raises:
+            IndexError: Если строки нет в снимке
+        """
+
+        if not 0 <= row < self._count:
+            raise IndexError(row)
+
+        columns = self._columns
+        record = {}
+
+        for field, kind in COLUMNS:
+            if kind == "s":
+                record[field] = self._string(field, row)
+            elif kind == "k":
+                record[field] = self._string(DICTIONARY, columns[field][row])
+            else:
+                record[field] = columns[field][row]
+
+        record["status"] = STATUSES[record["status"]]
+        ordinal = record["receipt_date"]
+        record["receipt_date"] = (
+            datetime.datetime.fromordinal(ordinal) if ordinal else None
+        )
+
+        return record
+
+    def record(self, row: int) -> dict:
+        """
+        Данные карточки в строке row в формате ProductCard.get_record.
+
+        Raises:
+            IndexError: Если строки нет в снимке
+        """
+
+        record = self.raw(row)
+        receipt = record["receipt_date"]
+        record["receipt_date"] = (
+            receipt.strftime("%d.%m.%Y") if receipt else ""
+        )
+
+        return record
+
+    def get(self, card_id: str):
+        """
+        Данные карточки по ID (см. record) или None, если её нет.
+        """
+
+        keys = _Keys(self)
+        row = bisect.bisect_left(keys, card_id)
+
+        if row < self._count and keys[row] == card_id:
+            return self.record(row)
+
+        return None
+
+    def records(self):
+        """
+        Данные всех карточек по порядку ID.
+
+        Yields:
+            dict: Записи в формате ProductCard.get_record
+        """
+
+        for row in range(self._count):
+            yield self.record(row)
+
+    def cards(self):
+        """
+        Карточки снимка по порядку ID.
+
+        Yields:
+            ProductCard: Карточки, построенные из raw без разбора дат
+        """
+
+        for row in range(self._count):
+            fields = self.raw(row)
+            status = fields.pop("status")
+            card = ProductCard(**fields)
+            card._status = status
+
+            yield card
+
+    def close(self) -> None:
+        """Освобождение представлений колонок и закрытие отображения."""
+
+        for view in reversed(self._views):
+            view.release()
+
+        self._views = []
+        self._columns = {}
+        self._mmap.close()
+
+
+class _Keys:
+    """Последовательность ID карточек снимка для модуля bisect."""
+
+    def __init__(self, reader: SnapshotReader) -> None:
+        self._reader = reader
+
+    def __len__(self) -> int:
+        return len(self._reader)
+
+    def __getitem__(self, row: int) -> str:
+        return self._reader.card_id(row)
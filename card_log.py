@@ -0,0 +1,182 @@
+import json
+import os
+import time
+
+
+class CardLog:
+    """
+    Журнал изменений карточек на диске: снимок + журнал только на дозапись.
+
+    Каждая операция записывается в журнал как полный набор полей
+    карточки после изменения, поэтому повторное применение записей
+    безопасно. Периодически все карточки сохраняются в компактный
+    снимок, после чего журнал очищается.
+    """
+
+    SNAPSHOT_FILE = "snapshot.jsonl"
+    LOG_FILE = "cards.log"
+    # Примерный размер порции файла (в байтах), читаемой при replay
+    REPLAY_CHUNK = 1 << 20
+
+    def __init__(
+            self,
+            directory: str,
+            sync_every: int = 1000,
+            sync_interval: float = 1.0,
+            snapshot_every: int = 100000
+    ) -> None:
+        """
+        Открытие (или создание) журнала в указанном каталоге.
+
+        Args:
+            directory: Каталог для файлов снимка и журнала
+            sync_every: Количество записей, после которого вызывается fsync
+            sync_interval: Максимальное время в секундах между fsync
+            snapshot_every: Количество записей журнала, после которого
+                            следует сделать новый снимок
+        """
+
+        os.makedirs(directory, exist_ok=True)
+        self.snapshot_path = os.path.join(directory, self.SNAPSHOT_FILE)
+        self.log_path = os.path.join(directory, self.LOG_FILE)
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.snapshot_every = snapshot_every
+        self._repair()
+        self._file = open(self.log_path, "a", encoding="utf-8")
+        self._unsynced = 0
+        self._synced_at = time.monotonic()
+        self._entries = 0
+
+    def _repair(self) -> None:
+        """Отбрасывание недописанной последней строки журнала после сбоя."""
+
+        if not os.path.exists(self.log_path):
+            return
+
+        with open(self.log_path, "rb+") as file:
+            size = file.seek(0, os.SEEK_END)
+
+            if not size:
+                return
+
+            file.seek(max(0, size - 65536))
+            tail = file.read()
+
+            if tail.endswith(b"\n"):
+                return
+
+            end = tail.rfind(b"\n")
+            file.truncate(size - len(tail) + end + 1 if end >= 0 else 0)
+
+    def replay(self):
+        """
+        Чтение сохранённого состояния: сначала снимок, затем журнал.
+
+        Yields:
+            dict: Записи карточек в формате ProductCard.get_record.
+                  Более поздняя запись карточки заменяет более раннюю
+        """
+
+        for path in (self.snapshot_path, self.log_path):
+            if not os.path.exists(path):
+                continue
+
+            with open(path, "rb") as file:
+                while True:
+                    chunk = file.read(self.REPLAY_CHUNK)
+
+                    if not chunk:
+                        break
+
+                    chunk += file.readline()
+                    # Недописанной может быть только последняя строка файла
+                    complete = chunk.endswith(b"\n")
+
+                    if not complete:
+                        chunk = chunk[:chunk.rfind(b"\n") + 1]
+
+                    # Порция разбирается одним вызовом json.loads как
+                    # массив: в JSON перевод строки внутри значений
+                    # экранируется, поэтому байты \n разделяют записи
+                    entries = json.loads(
+                        b"[" + chunk[:-1].replace(b"\n", b",") + b"]"
+                    )
+
+                    if path == self.log_path:
+                        self._entries += len(entries)
+                        entries = [entry["record"] for entry in entries]
+
+                    yield from entries
+
+                    if not complete:
+                        break
+
+    def append(self, op: str, record: dict) -> None:
+        """
+        Дозапись операции в журнал.
+
+        Args:
+            op: Название операции (create, update, write_off)
+            record: Состояние карточки после операции (get_record)
+        """
+
+        self._file.write(json.dumps(
+            {"op": op, "record": record}, ensure_ascii=False
+        ) + "\n")
+        self._unsynced += 1
+        self._entries += 1
+
+        if (
+            self._unsynced >= self.sync_every
+            or time.monotonic() - self._synced_at >= self.sync_interval
+        ):
+            self.sync()
+
+    def sync(self) -> None:
+        """Сброс буфера журнала на диск с помощью fsync."""
+
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._synced_at = time.monotonic()
+
+    def should_snapshot(self) -> bool:
+        """Пора ли сделать новый снимок."""
+
+        return self._entries >= self.snapshot_every
+
+    def snapshot(self, cards) -> None:
+        """
+        Запись компактного снимка всех карточек и очистка журнала.
+
+        Снимок пишется во временный файл и атомарно заменяет старый,
+        поэтому сбой во время записи не портит сохранённые данные.
+
+        Args:
+            cards: Итерируемый набор карточек ProductCard
+        """
+
+        temp_path = self.snapshot_path + ".tmp"
+
+        with open(temp_path, "w", encoding="utf-8") as file:
+            for card in cards:
+                file.write(
+                    json.dumps(card.get_record(), ensure_ascii=False) + "\n"
+                )
+
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(temp_path, self.snapshot_path)
+        self._file.close()
+        self._file = open(self.log_path, "w", encoding="utf-8")
+        self.sync()
+        self._entries = 0
+
+    def close(self) -> None:
+        """Сброс несохранённых записей и закрытие журнала."""
+
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
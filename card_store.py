@@ -0,0 +1,191 @@
+import datetime
+import sys
+from array import array
+
+from dates import to_datetime
+from product_card import STATUSES, ProductCard
+
+
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+
+
+def _column(name: str, load=None, dump=None) -> property:
+    """
+    Свойство представления, читающее и пишущее одну колонку хранилища.
+
+    Args:
+        name: Имя колонки в CardStore
+        load: Преобразование значения колонки в значение поля карточки
+        dump: Преобразование значения поля карточки в значение колонки
+
+    Returns:
+        property: Свойство для класса CardView
+    """
+
+    def fget(self):
+        value = getattr(self._store, name)[self._row]
+
+        return load(value) if load else value
+
+    def fset(self, value):
+        getattr(self._store, name)[self._row] = dump(value) if dump else value
+
+    return property(fget, fset)
+
+
+def _load_date(value: int):
+    return datetime.datetime.fromordinal(value) if value else None
+
+
+def _dump_date(value) -> int:
+    value = to_datetime(value)
+
+    return value.toordinal() if value else 0
+
+
+def _intern(value: str) -> str:
+    return sys.intern(value) if value else value
+
+
+class CardView(ProductCard):
+    """
+    Лёгкое представление строки CardStore с API карточки товара.
+
+    Все get_*/set_* и операции create/update/write_off унаследованы
+    от ProductCard и работают напрямую с колонками хранилища.
+    Представления недолговечны, поэтому get_data не кэшируется.
+    """
+
+    __slots__ = ("_store", "_row")
+
+    _card_id = _column("card_ids")
+    _name = _column("names")
+    _quantity = _column("quantities")
+    _status = _column(
+        "statuses", STATUSES.__getitem__, STATUS_CODES.__getitem__
+    )
+    _supplier = _column("suppliers", dump=_intern)
+    _manufacturer = _column("manufacturers", dump=_intern)
+    _cost = _column("costs")
+    _location = _column("locations", dump=_intern)
+    _articul = _column("articuls")
+    _guarantee = _column("guarantees")
+    _receipt_date = _column("receipt_dates", _load_date, _dump_date)
+
+    _view = property(lambda self: None, lambda self, value: None)
+
+    @property
+    def _observer(self):
+        return self._store.observer
+
+    @_observer.setter
+    def _observer(self, value) -> None:
+        self._store.observer = value
+
+    def __init__(self, store: 'CardStore', row: int) -> None:
+        """
+        Создание представления строки хранилища.
+
+        Args:
+            store: Хранилище карточек
+            row: Номер строки в колонках хранилища
+        """
+
+        self._store = store
+        self._row = row
+
+
+class CardStore:
+    """
+    Колоночное хранилище карточек товаров для Menu.
+
+    Числовые поля хранятся в типизированных массивах, поставщик,
+    производитель и местоположение - в виде интернированных строк.
+    Поддерживает тот же интерфейс словаря, что и Menu.cards.
+    """
+
+    def __init__(self) -> None:
+        """Инициализация пустого хранилища."""
+
+        self._rows = {}
+        self.observer = None
+        self.card_ids = []
+        self.names = []
+        self.quantities = array("q")
+        self.statuses = array("b")
+        self.suppliers = []
+        self.manufacturers = []
+        self.costs = array("d")
+        self.locations = []
+        self.articuls = []
+        self.guarantees = array("q")
+        self.receipt_dates = array("l")
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, card_id: str) -> bool:
+        return card_id in self._rows
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __getitem__(self, card_id: str) -> CardView:
+        """
+        Получение представления карточки по ID.
+
+        Raises:
+            KeyError: Если карточка с указанным ID не найдена
+        """
+
+        return CardView(self, self._rows[card_id])
+
+    def __setitem__(self, card_id: str, card: ProductCard) -> None:
+        """
+        Сохранение данных карточки в колонки хранилища.
+
+        Args:
+            card_id: Идентификатор карточки
+            card: Карточка, данные которой копируются в хранилище
+        """
+
+        row = self._rows.get(card_id)
+
+        if row is None:
+            row = len(self.card_ids)
+            self._rows[card_id] = row
+            self.card_ids.append(card_id)
+            self.names.append("")
+            self.quantities.append(0)
+            self.statuses.append(0)
+            self.suppliers.append("")
+            self.manufacturers.append("")
+            self.costs.append(0.0)
+            self.locations.append("")
+            self.articuls.append("")
+            self.guarantees.append(0)
+            self.receipt_dates.append(0)
+
+        view = CardView(self, row)
+        view._card_id = card_id
+        view._name = card.get_name()
+        view._quantity = card.get_quantity()
+        view._status = card.get_status()
+        view._supplier = card.get_supplier()
+        view._manufacturer = card.get_manufacturer()
+        view._cost = card.get_cost()
+        view._location = card.get_location()
+        view._articul = card.get_articul()
+        view._guarantee = card.get_guarantee()
+        view._receipt_date = card.get_receipt_date()
+
+    def keys(self):
+        return self._rows.keys()
+
+    def values(self):
+        for row in range(len(self.card_ids)):
+            yield CardView(self, row)
+
+    def items(self):
+        for row, card_id in enumerate(self.card_ids):
+            yield card_id, CardView(self, row)
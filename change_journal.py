@@ -0,0 +1,141 @@
+import bisect
+from operator import itemgetter
+
+
+class ChangeJournal:
+    """
+    Журнал изменений карточек в памяти для потребителей ленты изменений.
+
+    Каждое изменение получает возрастающий номер seq и хранится как
+    словарь {"seq", "card_id", "op", "changes"}, где op - "create",
+    "update" или "write_off", а changes - {поле: (старое, новое)}.
+    Когда записей становится больше limit, старая половина журнала
+    сжимается: все записи одной карточки сливаются в одну с номером
+    последнего изменения. Поэтому память ограничена количеством
+    карточек плюс limit, а потребитель, отставший от сжатия, всё равно
+    получает достаточно данных, чтобы обновить свою копию.
+    """
+
+    def __init__(self, limit: int = 100000) -> None:
+        """
+        Создание пустого журнала.
+
+        Args:
+            limit: Количество несжатых записей, после которого старая
+                   половина журнала сжимается
+        """
+
+        self.limit = limit
+        self.last_seq = 0
+        self._merged = {}
+        self._compacted = []
+        self._entries = []
+
+    def __len__(self) -> int:
+        return len(self._compacted) + len(self._entries)
+
+    def record(self, card_id: str, op: str, changes: dict) -> int:
+        """
+        Добавление записи об изменении карточки.
+
+        Args:
+            card_id: ID изменённой карточки
+            op: Операция: "create", "update" или "write_off"
+            changes: Изменения полей {поле: (старое, новое)}
+
+        Returns:
+            int: Номер записи
+        """
+
+        self.last_seq += 1
+        self._entries.append({
+            "seq": self.last_seq,
+            "card_id": card_id,
+            "op": op,
+            "changes": changes
+        })
+
+        if len(self._entries) > self.limit:
+            self.compact(len(self._entries) - self.limit // 2)
+
+        return self.last_seq
+
+    def compact(self, count: int = None) -> None:
+        """
+        Сжатие первых count несжатых записей (по умолчанию всех).
+
+        Записи сливаются со сжатой частью журнала, в которой у каждой
+        карточки одна запись: старое значение поля берётся из первой
+        записи, новое - из последней, поля, вернувшиеся к исходному
+        значению, отбрасываются. Операция "create" сохраняется, иначе
+        берётся операция последней записи.
+
+        Args:
+            count: Количество сжимаемых записей с начала журнала
+        """
+
+        if count is None:
+            count = len(self._entries)
+
+        merged = self._merged
+
+        for entry in self._entries[:count]:
+            current = merged.pop(entry["card_id"], None)
+
+            if current is None:
+                current = dict(entry, changes=dict(entry["changes"]))
+            else:
+                changes = current["changes"]
+
+                for field, (old, new) in entry["changes"].items():
+                    if field in changes:
+                        old = changes[field][0]
+
+                    if old == new and current["op"] != "create":
+                        changes.pop(field, None)
+                    else:
+                        changes[field] = (old, new)
+
+                current["seq"] = entry["seq"]
+
+                if current["op"] != "create":
+                    current["op"] = entry["op"]
+
+            # Повторная вставка сохраняет порядок словаря по seq
+            merged[entry["card_id"]] = current
+
+        del self._entries[:count]
+        self._compacted = list(merged.values())
+
+    def since(self, seq: int) -> list:
+        """
+        Записи с номером больше seq.
+
+        Args:
+            seq: Номер последней полученной потребителем записи
+                 (0 - с самого начала)
+
+        Returns:
+            list: Копии записей в порядке номеров
+
+        Raises:
+            ValueError: Если номер больше последнего выданного журналом
+                        (например, после перезапуска процесса)
+        """
+
+        if seq > self.last_seq:
+            raise ValueError(
+                f"Неизвестный номер изменения {seq}, последний - "
+                f"{self.last_seq}"
+            )
+
+        key = itemgetter("seq")
+        head = self._compacted[bisect.bisect_right(
+            self._compacted, seq, key=key
+        ):]
+        tail = self._entries[bisect.bisect_right(self._entries, seq, key=key):]
+
+        return [
+            dict(entry, changes=dict(entry["changes"]))
+            for entry in head + tail
+        ]
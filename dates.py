@@ -0,0 +1,101 @@
+import calendar
+import datetime
+from functools import lru_cache
+
+
+DATE_FORMAT = "%d.%m.%Y"
+DATE_ERROR = "Дата должна быть в формате ДД.ММ.ГГГГ"
+
+
+@lru_cache(maxsize=4096)
+def parse_date(value: str) -> datetime.datetime:
+    """
+    Разбор даты из строки с кэшированием результатов.
+
+    Строки фиксированной ширины ДД.ММ.ГГГГ и ГГГГ-ММ-ДД разбираются
+    напрямую, всё остальное передаётся в strptime.
+
+    Args:
+        value: Дата в формате ДД.ММ.ГГГГ или ГГГГ-ММ-ДД
+
+    Returns:
+        datetime.datetime: Дата (время 00:00)
+
+    Raises:
+        ValueError: При неверном формате или несуществующей дате
+    """
+
+    if len(value) == 10 and value.isascii():
+        if (
+            value[2] == "." and value[5] == "."
+            and value[:2].isdigit()
+            and value[3:5].isdigit()
+            and value[6:].isdigit()
+        ):
+            return datetime.datetime(
+                int(value[6:]), int(value[3:5]), int(value[:2])
+            )
+
+        if (
+            value[4] == "-" and value[7] == "-"
+            and value[:4].isdigit()
+            and value[5:7].isdigit()
+            and value[8:].isdigit()
+        ):
+            return datetime.datetime(
+                int(value[:4]), int(value[5:7]), int(value[8:])
+            )
+
+    return datetime.datetime.strptime(value, DATE_FORMAT)
+
+
+def to_datetime(value):
+    """
+    Приведение даты поступления к datetime.
+
+    Args:
+        value: Строка (см. parse_date), date, datetime, пустая строка
+               или None
+
+    Returns:
+        datetime.datetime: Дата или None для пустого значения
+
+    Raises:
+        ValueError: При неверном формате даты
+    """
+
+    if not value:
+        return None
+
+    if isinstance(value, datetime.datetime):
+        return value
+
+    if isinstance(value, datetime.date):
+        return datetime.datetime(value.year, value.month, value.day)
+
+    try:
+        return parse_date(value)
+    except (ValueError, TypeError) as e:
+        raise ValueError(DATE_ERROR) from e
+
+
+def add_months(value, months: int) -> datetime.date:
+    """
+    Дата через months месяцев после value.
+
+    Если в итоговом месяце нет такого числа, берётся последний день
+    месяца (31.01 + 1 месяц = 28.02 или 29.02).
+
+    Args:
+        value: date или datetime
+        months: Количество месяцев
+
+    Returns:
+        datetime.date: Итоговая дата
+    """
+
+    index = value.year * 12 + value.month - 1 + months
+    year, month = divmod(index, 12)
+    day = min(value.day, calendar.monthrange(year, month + 1)[1])
+
+    return datetime.date(year, month + 1, day)
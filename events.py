@@ -0,0 +1,94 @@
+import collections
+import json
+import logging
+
+
+class ConsoleSink:
+    """Вывод сообщений о событиях в консоль (поведение по умолчанию)."""
+
+    def emit(self, event: str, message: str, **fields) -> None:
+        """
+        Обработка события.
+
+        Args:
+            event: Тип события, например card_created
+            message: Текст сообщения для пользователя
+            fields: Дополнительные данные события (card_id и др.)
+        """
+
+        print(message)
+
+
+class NullSink:
+    """Игнорирование всех событий (для пакетных операций)."""
+
+    def emit(self, event: str, message: str, **fields) -> None:
+        pass
+
+
+class BufferedSink:
+    """
+    Накопление событий в памяти для последующей обработки или вывода.
+    """
+
+    def __init__(self, limit: int = None) -> None:
+        """
+        Инициализация пустого буфера.
+
+        Args:
+            limit: Максимальное количество хранимых событий; при
+                   переполнении отбрасываются самые старые
+        """
+
+        self.limit = limit
+        self.events = collections.deque(maxlen=limit)
+
+    def emit(self, event: str, message: str, **fields) -> None:
+        self.events.append((event, message, fields))
+
+    def flush(self, sink=None) -> list:
+        """
+        Передача накопленных событий в другой приёмник и очистка буфера.
+
+        Args:
+            sink: Приёмник событий (по умолчанию события только удаляются)
+
+        Returns:
+            list: Список событий (event, message, fields) из буфера
+        """
+
+        events = list(self.events)
+        self.events.clear()
+
+        if sink is not None:
+            for event, message, fields in events:
+                sink.emit(event, message, **fields)
+
+        return events
+
+
+class LogSink:
+    """
+    Запись событий в журнал logging в виде JSON-объектов.
+    """
+
+    def __init__(self, logger: logging.Logger = None,
+                 level: int = logging.INFO) -> None:
+        """
+        Настройка приёмника.
+
+        Args:
+            logger: Логгер (по умолчанию logging.getLogger("product_card"))
+            level: Уровень записей журнала
+        """
+
+        self.logger = logger or logging.getLogger("product_card")
+        self.level = level
+
+    def emit(self, event: str, message: str, **fields) -> None:
+        if self.logger.isEnabledFor(self.level):
+            self.logger.log(self.level, json.dumps(
+                {"event": event, "message": message, **fields},
+                ensure_ascii=False,
+                default=str
+            ))
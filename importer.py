@@ -0,0 +1,275 @@
+import argparse
+import csv
+import itertools
+import json
+import os
+import time
+
+from card_log import CardLog
+from menu import Menu
+
+
+FIELDS = (
+    "name",
+    "quantity",
+    "supplier",
+    "manufacturer",
+    "cost",
+    "location",
+    "articul",
+    "guarantee",
+    "receipt_date"
+)
+
+NUMBER_FIELDS = {
+    "quantity": (int, "Количество должно быть числом"),
+    "cost": (float, "Стоимость должна быть числом"),
+    "guarantee": (int, "Гарантия должна быть числом")
+}
+
+
+def read_csv(path: str, delimiter: str = ","):
+    """
+    Построчное чтение CSV-файла с заголовком.
+
+    Args:
+        path: Путь к файлу
+        delimiter: Разделитель колонок
+
+    Yields:
+        dict: Строка файла в виде словаря {колонка: значение}
+    """
+
+    with open(path, newline="", encoding="utf-8") as file:
+        yield from csv.DictReader(file, delimiter=delimiter)
+
+
+def read_jsonl(path: str):
+    """
+    Построчное чтение JSONL-файла (один JSON-объект в строке).
+
+    Ошибка в одной строке не прерывает чтение: строка, которая не
+    разбирается как JSON, передаётся дальше как текст и отклоняется
+    в map_row.
+
+    Args:
+        path: Путь к файлу
+
+    Yields:
+        Значение из очередной непустой строки файла (dict для
+        корректной строки) или текст строки, если это не JSON
+    """
+
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            line = line.strip()
+
+            if not line:
+                continue
+
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                yield line
+
+
+def read_rows(path: str):
+    """
+    Выбор способа чтения по расширению файла (.csv или .jsonl).
+
+    Raises:
+        ValueError: При неподдерживаемом формате файла
+    """
+
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == ".csv":
+        return read_csv(path)
+
+    if extension in (".jsonl", ".ndjson"):
+        return read_jsonl(path)
+
+    raise ValueError(f"Неподдерживаемый формат файла: {extension}")
+
+
+def map_row(raw: dict, columns: dict = None) -> tuple:
+    """
+    Преобразование строки файла в аргументы Menu.create_card.
+
+    Args:
+        raw: Строка файла
+        columns: Соответствие {поле карточки: колонка файла}. Поле ID
+                 карточки называется "card_id". По умолчанию имена
+                 колонок совпадают с именами полей
+
+    Returns:
+        tuple: Пара (card_id, data)
+
+    Raises:
+        ValueError: Если строка не словарь (не JSON-объект), при пустом
+                    ID или нечисловых строках в числовых полях. Значения
+                    других типов передаются без преобразования и
+                    проверяются при создании карточки
+    """
+
+    if not isinstance(raw, dict):
+        raise ValueError("Строка должна быть JSON-объектом")
+
+    columns = columns or {}
+    card_id = str(raw.get(columns.get("card_id", "card_id")) or "").strip()
+
+    if not card_id:
+        raise ValueError("ID не может быть пустым")
+
+    data = {}
+
+    for field in FIELDS:
+        column = columns.get(field, field)
+
+        if column not in raw:
+            continue
+
+        value = raw[column]
+
+        if field in NUMBER_FIELDS:
+            convert, message = NUMBER_FIELDS[field]
+
+            if isinstance(value, str):
+                value = value.strip()
+
+            if field == "guarantee" and value in ("", None):
+                value = 0
+            elif isinstance(value, str):
+                # Числа из JSON проверяет схема: 1.5 и true в количестве
+                # отклоняются, а не усекаются до 1
+                try:
+                    value = convert(value)
+                except ValueError:
+                    raise ValueError(message) from None
+
+        data[field] = value
+
+    return card_id, data
+
+
+def chunked(iterable, size: int):
+    """
+    Разбиение потока на списки фиксированного размера.
+
+    Yields:
+        list: Очередная порция из не более чем size элементов
+    """
+
+    iterator = iter(iterable)
+
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+
+        if not chunk:
+            return
+
+        yield chunk
+
+
+def import_file(
+        menu: Menu,
+        path: str,
+        chunk_size: int = 1000,
+        rejects_path: str = None,
+        columns: dict = None
+) -> dict:
+    """
+    Потоковый импорт карточек из CSV/JSONL-файла в систему.
+
+    Файл читается лениво и передаётся в Menu.create_cards порциями
+    по chunk_size строк. Отклонённые строки вместе с сообщением об
+    ошибке записываются в отдельный JSONL-файл.
+
+    Args:
+        menu: Система карточек, в которую выполняется импорт
+        path: Путь к CSV или JSONL-файлу
+        chunk_size: Размер порции строк
+        rejects_path: Путь к файлу отклонённых строк
+                      (по умолчанию <path>.rejected.jsonl)
+        columns: Соответствие полей карточки колонкам файла (см. map_row)
+
+    Returns:
+        dict: Статистика импорта: rows, created, rejected, seconds,
+              rows_per_sec, rejects_path
+    """
+
+    rejects_path = rejects_path or path + ".rejected.jsonl"
+    started = time.perf_counter()
+    total = created = rejected = 0
+
+    with open(rejects_path, "w", encoding="utf-8") as rejects:
+        def reject(line: int, raw: dict, message: str) -> None:
+            rejects.write(json.dumps(
+                {"line": line, "row": raw, "error": message},
+                ensure_ascii=False
+            ) + "\n")
+
+        numbered = enumerate(read_rows(path), start=1)
+
+        for chunk in chunked(numbered, chunk_size):
+            total += len(chunk)
+            batch = []
+            sources = []
+
+            for line, raw in chunk:
+                try:
+                    batch.append(map_row(raw, columns))
+                except ValueError as e:
+                    reject(line, raw, str(e))
+                    rejected += 1
+                else:
+                    sources.append((line, raw))
+
+            report = menu.create_cards(batch, atomic=False)
+            created += len(report["created"])
+
+            for index, _, message in report["errors"]:
+                reject(*sources[index], message)
+                rejected += 1
+
+    seconds = time.perf_counter() - started
+
+    return {
+        "rows": total,
+        "created": created,
+        "rejected": rejected,
+        "seconds": seconds,
+        "rows_per_sec": total / seconds if seconds else 0.0,
+        "rejects_path": rejects_path
+    }
+
+
+def main() -> None:
+    """Запуск импорта из командной строки."""
+
+    parser = argparse.ArgumentParser(
+        description="Импорт карточек товаров из CSV/JSONL-файла"
+    )
+    parser.add_argument("path", help="CSV или JSONL-файл с карточками")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--rejects", help="Файл для отклонённых строк")
+    parser.add_argument(
+        "--data", help="Каталог журнала CardLog для сохранения карточек"
+    )
+    args = parser.parse_args()
+
+    menu = Menu(log=CardLog(args.data) if args.data else None)
+
+    try:
+        stats = import_file(menu, args.path, args.chunk_size, args.rejects)
+    finally:
+        menu.close()
+
+    print(f"Строк: {stats['rows']}")
+    print(f"Создано: {stats['created']}")
+    print(f"Отклонено: {stats['rejected']} ({stats['rejects_path']})")
+    print(f"Скорость: {stats['rows_per_sec']:.0f} строк/с")
+
+
+if __name__ == "__main__":
+    main()
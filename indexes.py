@@ -0,0 +1,397 @@
+import bisect
+from array import array
+from operator import itemgetter
+
+
+class HashIndex:
+    """
+    Вторичный хеш-индекс: значение поля -> множество ID карточек.
+    """
+
+    def __init__(self) -> None:
+        """Инициализация пустого индекса."""
+
+        self._ids = {}
+
+    def add(self, key, card_id: str) -> None:
+        """Добавление карточки с указанным значением поля."""
+
+        ids = self._ids.get(key)
+
+        if ids is None:
+            self._ids[key] = {card_id}
+        else:
+            ids.add(card_id)
+
+    def add_many(self, keys, ids) -> None:
+        """
+        Добавление сразу нескольких карточек.
+
+        Args:
+            keys: Значения поля карточек
+            ids: ID карточек в том же порядке
+        """
+
+        index = self._ids
+
+        for key, card_id in zip(keys, ids):
+            found = index.get(key)
+
+            if found is None:
+                index[key] = {card_id}
+            else:
+                found.add(card_id)
+
+    def remove(self, key, card_id: str) -> None:
+        """Удаление карточки из множества для указанного значения поля."""
+
+        ids = self._ids.get(key)
+
+        if ids is None:
+            return
+
+        ids.discard(card_id)
+
+        if not ids:
+            del self._ids[key]
+
+    def move(self, card_id: str, old, new) -> None:
+        """Перенос карточки при изменении значения поля."""
+
+        self.remove(old, card_id)
+        self.add(new, card_id)
+
+    def get(self, key) -> set:
+        """
+        ID карточек с указанным значением поля.
+
+        Returns:
+            set: Множество ID (пустое, если таких карточек нет).
+                 Изменять возвращаемое множество нельзя
+        """
+
+        return self._ids.get(key, set())
+
+
+class SortedIndex:
+    """
+    Упорядоченный индекс для запросов по диапазону значений поля.
+
+    Пары (значение, ID карточки) хранятся по порядку в блоках не
+    длиннее BLOCK_SIZE, а для каждого блока запоминается последняя
+    пара. Вставка и удаление находят блок двоичным поиском по этим
+    парам и сдвигают только элементы одного блока, поэтому их
+    стоимость почти не зависит от числа карточек. Значения в блоке
+    лежат в типизированном массиве (см. __init__), ID - в списке
+    рядом с ним, без кортежа на каждую карточку. Пустые значения
+    (None) в индекс не попадают.
+    """
+
+    BLOCK_SIZE = 1024
+    BULK_SIZE = 16
+
+    def __init__(self, typecode: str = None, encode=None, decode=None):
+        """
+        Инициализация пустого индекса.
+
+        Args:
+            typecode: Код типа array для значений ("d", "q", ...).
+                      None - значения хранятся в обычных списках
+            encode: Преобразование значения поля в элемент массива
+                    (например, datetime.toordinal) с сохранением порядка
+            decode: Обратное преобразование для items
+        """
+
+        self._typecode = typecode
+        self._encode = encode
+        self._decode = decode
+        self._keys = []
+        self._ids = []
+        self._lasts = []
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def _block(self, values=()):
+        """Новый блок значений."""
+
+        if self._typecode is None:
+            return list(values)
+
+        return array(self._typecode, values)
+
+    def _find(self, key, card_id: str, right: bool = False) -> tuple:
+        """
+        Место пары (key, card_id) с закодированным значением key.
+
+        Returns:
+            tuple: (номер блока, позиция в блоке) для вставки пары
+                   перед равной ей (right=True - после). Номер блока
+                   равен числу блоков, если пара больше всех
+        """
+
+        entry = (key, card_id)
+
+        if right:
+            block = bisect.bisect_right(self._lasts, entry)
+        else:
+            block = bisect.bisect_left(self._lasts, entry)
+
+        if block == len(self._lasts):
+            return block, 0
+
+        keys = self._keys[block]
+        ids = self._ids[block]
+        low = bisect.bisect_left(keys, key)
+        high = bisect.bisect_right(keys, key, low)
+
+        if right:
+            return block, bisect.bisect_right(ids, card_id, low, high)
+
+        return block, bisect.bisect_left(ids, card_id, low, high)
+
+    def add(self, key, card_id: str) -> None:
+        """Добавление карточки с указанным значением поля."""
+
+        if key is None:
+            return
+
+        if self._encode is not None:
+            key = self._encode(key)
+
+        if not self._lasts:
+            self._keys.append(self._block((key,)))
+            self._ids.append([card_id])
+            self._lasts.append((key, card_id))
+            self._len += 1
+            return
+
+        block, position = self._find(key, card_id)
+
+        if block == len(self._lasts):
+            block -= 1
+            position = len(self._ids[block])
+
+        keys = self._keys[block]
+        ids = self._ids[block]
+        keys.insert(position, key)
+        ids.insert(position, card_id)
+        self._len += 1
+
+        if position == len(ids) - 1:
+            self._lasts[block] = (key, card_id)
+
+        if len(ids) > self.BLOCK_SIZE:
+            half = len(ids) // 2
+            self._keys.insert(block + 1, keys[half:])
+            self._ids.insert(block + 1, ids[half:])
+            self._lasts.insert(block, (keys[half - 1], ids[half - 1]))
+            del keys[half:]
+            del ids[half:]
+
+    def add_many(self, keys: list, ids: list) -> None:
+        """
+        Добавление сразу нескольких карточек.
+
+        Большие пакеты объединяются с содержимым индекса, и блоки
+        строятся заново за одну сортировку, что быстрее, чем вставлять
+        каждую карточку по отдельности. Сортируются номера карточек:
+        сначала по ID, затем устойчиво по значению. Так сравниваются
+        строки и числа, а не кортежи.
+
+        Args:
+            keys: Значения поля карточек
+            ids: ID карточек в том же порядке
+        """
+
+        if None in keys:
+            kept = [
+                number for number, key in enumerate(keys) if key is not None
+            ]
+            keys = [keys[number] for number in kept]
+            ids = [ids[number] for number in kept]
+
+        if len(ids) < self.BULK_SIZE:
+            for key, card_id in zip(keys, ids):
+                self.add(key, card_id)
+
+            return
+
+        if self._encode is not None:
+            keys = list(map(self._encode, keys))
+        else:
+            keys = list(keys)
+
+        ids = list(ids)
+
+        for block_keys, block_ids in zip(self._keys, self._ids):
+            keys.extend(block_keys)
+            ids.extend(block_ids)
+
+        order = sorted(range(len(ids)), key=ids.__getitem__)
+        order.sort(key=keys.__getitem__)
+        keys = [keys[number] for number in order]
+        ids = [ids[number] for number in order]
+        size = self.BLOCK_SIZE // 2
+        self._keys = []
+        self._ids = []
+        self._lasts = []
+        self._len = len(ids)
+
+        for start in range(0, len(ids), size):
+            end = min(start + size, len(ids))
+            self._keys.append(self._block(keys[start:end]))
+            self._ids.append(ids[start:end])
+            self._lasts.append((keys[end - 1], ids[end - 1]))
+
+    def remove(self, key, card_id: str) -> None:
+        """Удаление карточки с указанным значением поля."""
+
+        if key is None:
+            return
+
+        if self._encode is not None:
+            key = self._encode(key)
+
+        block, position = self._find(key, card_id)
+
+        if block == len(self._lasts):
+            return
+
+        keys = self._keys[block]
+        ids = self._ids[block]
+
+        if keys[position] != key or ids[position] != card_id:
+            return
+
+        del keys[position]
+        del ids[position]
+        self._len -= 1
+
+        if not ids:
+            del self._keys[block]
+            del self._ids[block]
+            del self._lasts[block]
+        elif position == len(ids):
+            self._lasts[block] = (keys[-1], ids[-1])
+
+    def move(self, card_id: str, old, new) -> None:
+        """Перемещение карточки при изменении значения поля."""
+
+        self.remove(old, card_id)
+        self.add(new, card_id)
+
+    def range(self, low=None, high=None):
+        """
+        ID карточек со значением поля в диапазоне [low, high].
+
+        Args:
+            low: Нижняя граница (включительно), None - без границы
+            high: Верхняя граница (включительно), None - без границы
+
+        Yields:
+            str: ID карточек в порядке возрастания значения поля
+        """
+
+        if self._encode is not None:
+            low = None if low is None else self._encode(low)
+            high = None if high is None else self._encode(high)
+
+        first = 0
+
+        if low is not None:
+            first = bisect.bisect_left(self._lasts, low, key=itemgetter(0))
+
+        blocks = zip(self._keys[first:], self._ids[first:])
+
+        for number, (keys, ids) in enumerate(blocks):
+            start = 0
+            end = len(keys)
+
+            if low is not None and number == 0:
+                start = bisect.bisect_left(keys, low)
+
+            if high is not None:
+                end = bisect.bisect_right(keys, high, start)
+
+            yield from ids[start:end]
+
+            if end < len(keys):
+                return
+
+    def items(self, after=None, descending: bool = False):
+        """
+        Обход пар (значение, ID карточки) по порядку значений.
+
+        Args:
+            after: Пара (значение, ID), после которой начинается обход
+            descending: Обход в порядке убывания
+
+        Обход читает индекс по блокам и каждый следующий блок ищет
+        заново по последней отданной паре. Если индекс меняется во
+        время обхода, изменения в уже прочитанном блоке не видны, но
+        пары не пропускаются и не повторяются из-за сдвига позиций.
+
+        Yields:
+            tuple: Пары (значение, ID карточки)
+        """
+
+        if after is not None and self._encode is not None:
+            after = (self._encode(after[0]), after[1])
+
+        decode = self._decode
+
+        while self._lasts:
+            if descending:
+                keys, ids = self._before(after)
+                keys = keys[::-1]
+                ids = ids[::-1]
+            else:
+                keys, ids = self._after(after)
+
+            if not ids:
+                return
+
+            if decode is None:
+                yield from zip(keys, ids)
+            else:
+                for key, card_id in zip(keys, ids):
+                    yield decode(key), card_id
+
+            after = (keys[-1], ids[-1])
+
+    def _after(self, after) -> tuple:
+        """Значения и ID блока, следующие за парой after."""
+
+        block, position = 0, 0
+
+        if after is not None:
+            block, position = self._find(*after, right=True)
+
+        if block == len(self._lasts):
+            return (), ()
+
+        return self._keys[block][position:], self._ids[block][position:]
+
+    def _before(self, before) -> tuple:
+        """Значения и ID блока, предшествующие паре before."""
+
+        block = len(self._lasts) - 1
+        position = len(self._ids[block])
+
+        if before is not None:
+            block, position = self._find(*before)
+
+            if block == len(self._lasts):
+                block -= 1
+                position = len(self._ids[block])
+
+            if position == 0:
+                if block == 0:
+                    return (), ()
+
+                block -= 1
+                position = len(self._ids[block])
+
+        return self._keys[block][:position], self._ids[block][:position]
@@ -0,0 +1,308 @@
+import cProfile
+import functools
+import io
+import pstats
+import threading
+import time
+import tracemalloc
+
+from menu import Menu
+from product_card import ProductCard
+
+
+# Операции Menu, замеряемые вместе с сеттерами ProductCard
+MENU_OPERATIONS = (
+    "create_card",
+    "update_card",
+    "get_card",
+    "get_card_object",
+    "write_off_card",
+    "list_cards"
+)
+SETTERS = tuple(name for name in vars(ProductCard) if name.startswith("set_"))
+PERCENTILES = (50, 90, 99)
+
+_lock = threading.Lock()
+_originals = {}
+_stats = {}
+_capture = {}
+
+
+class OperationStats:
+    """
+    Статистика одной операции: количество вызовов, время и ошибки.
+
+    Задержки копятся в гистограмме с границами-степенями двойки
+    наносекунд: номер корзины - bit_length задержки, поэтому запись
+    замера не требует поиска корзины. Перцентили оцениваются по
+    верхней границе корзины (с точностью до двух раз).
+    """
+
+    def __init__(self) -> None:
+        """Инициализация пустой статистики."""
+
+        self.clear()
+
+    def clear(self) -> None:
+        """Сброс статистики."""
+
+        self.calls = 0
+        self.total = 0
+        self.max = 0
+        self.buckets = {}
+        self.failures = {}
+
+    def add(self, elapsed: int) -> None:
+        """Учёт вызова длительностью elapsed наносекунд."""
+
+        bucket = elapsed.bit_length()
+
+        with _lock:
+            self.calls += 1
+            self.total += elapsed
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+            if elapsed > self.max:
+                self.max = elapsed
+
+    def fail(self, error: ValueError, card_id=None) -> None:
+        """
+        Учёт ошибки валидации по причинам.
+
+        Сообщение разбивается на отдельные причины (ошибки полей
+        объединяются через "; "), а ID карточки заменяется на
+        {card_id}, чтобы одинаковые ошибки разных карточек попадали
+        в одну причину.
+        """
+
+        with _lock:
+            for reason in str(error).split("; "):
+                if card_id:
+                    reason = reason.replace(str(card_id), "{card_id}")
+
+                self.failures[reason] = self.failures.get(reason, 0) + 1
+
+    def percentile(self, percent: float) -> int:
+        """Оценка перцентиля задержки в наносекундах (0 без вызовов)."""
+
+        rank = self.calls * percent / 100
+        seen = 0
+
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+
+            if seen >= rank:
+                return min(2 ** bucket, self.max)
+
+        return self.max
+
+    def report(self) -> dict:
+        """
+        Сводка статистики.
+
+        Returns:
+            dict: {"calls", "mean_us", "max_us", "p50_us", "p90_us",
+                  "p99_us", "histogram", "failures"}, где histogram -
+                  {верхняя граница корзины в мкс: количество вызовов}
+        """
+
+        with _lock:
+            calls = self.calls
+            report = {
+                "calls": calls,
+                "mean_us": self.total / calls / 1000 if calls else 0,
+                "max_us": self.max / 1000
+            }
+
+            for percent in PERCENTILES:
+                report[f"p{percent}_us"] = self.percentile(percent) / 1000
+
+            report["histogram"] = {
+                2 ** bucket / 1000: self.buckets[bucket]
+                for bucket in sorted(self.buckets)
+            }
+            report["failures"] = dict(self.failures)
+
+        return report
+
+
+def _timed(name: str, func, with_card_id: bool):
+    """Обёртка func, учитывающая вызовы в статистике операции name."""
+
+    stats = _stats.setdefault(name, OperationStats())
+    clock = time.perf_counter_ns
+
+    @functools.wraps(func)
+    def timed(*args, **kwargs):
+        started = clock()
+
+        try:
+            return func(*args, **kwargs)
+        except ValueError as e:
+            stats.fail(e, args[1] if with_card_id and len(args) > 1 else None)
+            raise
+        finally:
+            stats.add(clock() - started)
+
+    return timed
+
+
+def enable() -> None:
+    """
+    Включение замеров операций Menu и сеттеров ProductCard.
+
+    Методы классов заменяются обёртками, а при выключении
+    восстанавливаются, поэтому без включённых замеров накладных
+    расходов нет. Замеры действуют на все экземпляры в текущем
+    процессе, включая унаследовавшие сеттеры CardView и SqliteCard.
+    Шарды ShardedMenu работают в своих процессах, и их операции не
+    замеряются. Сеттеры учитываются только при прямом вызове:
+    create, update и from_data записывают поля напрямую, минуя
+    сеттеры, и видны лишь в замерах операций Menu.
+    Повторный вызов ничего не делает.
+    """
+
+    if _originals:
+        return
+
+    targets = [(Menu, name, True) for name in MENU_OPERATIONS]
+    targets += [(ProductCard, name, False) for name in SETTERS]
+
+    for cls, name, with_card_id in targets:
+        func = vars(cls)[name]
+        _originals[cls, name] = func
+        label = f"{cls.__name__}.{name}"
+        setattr(cls, name, _timed(label, func, with_card_id))
+
+
+def disable() -> None:
+    """Выключение замеров с сохранением накопленной статистики."""
+
+    while _originals:
+        (cls, name), func = _originals.popitem()
+        setattr(cls, name, func)
+
+
+def enabled() -> bool:
+    """Включены ли замеры."""
+
+    return bool(_originals)
+
+
+def reset() -> None:
+    """Сброс накопленной статистики."""
+
+    with _lock:
+        for operation in _stats.values():
+            operation.clear()
+
+
+def stats() -> dict:
+    """
+    Статистика операций, вызывавшихся хотя бы раз.
+
+    Returns:
+        dict: {"Класс.метод": OperationStats.report()}
+    """
+
+    return {
+        name: operation.report()
+        for name, operation in sorted(_stats.items())
+        if operation.calls
+    }
+
+
+def start_capture(frames: int = 1) -> None:
+    """
+    Запуск профилирования cProfile и отслеживания памяти tracemalloc.
+
+    cProfile профилирует только поток, вызвавший start_capture.
+
+    Args:
+        frames: Глубина стека, сохраняемая tracemalloc для выделений
+
+    Raises:
+        ValueError: Если профилирование уже запущено
+    """
+
+    if _capture:
+        raise ValueError("Профилирование уже запущено")
+
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+        _capture["tracemalloc"] = True
+
+    _capture["profile"] = cProfile.Profile()
+    _capture["profile"].enable()
+
+
+def capturing() -> bool:
+    """Запущено ли профилирование."""
+
+    return bool(_capture)
+
+
+def stop_capture(limit: int = 20) -> str:
+    """
+    Остановка профилирования и отчёт о нём.
+
+    Args:
+        limit: Количество строк в каждой части отчёта
+
+    Returns:
+        str: Самые затратные функции (по суммарному времени) и места
+             выделения памяти, оставшейся занятой
+
+    Raises:
+        ValueError: Если профилирование не запущено
+    """
+
+    if not _capture:
+        raise ValueError("Профилирование не запущено")
+
+    profile = _capture.pop("profile")
+    profile.disable()
+    snapshot = tracemalloc.take_snapshot()
+    current, peak = tracemalloc.get_traced_memory()
+
+    if _capture.pop("tracemalloc", False):
+        tracemalloc.stop()
+
+    output = io.StringIO()
+    report = pstats.Stats(profile, stream=output).sort_stats("cumulative")
+    report.print_stats(limit)
+    lines = [output.getvalue().strip(), "", "Память:"]
+    lines.append(f"  занято {current / 1024:.1f} КБ, пик {peak / 1024:.1f} КБ")
+
+    for stat in snapshot.statistics("lineno")[:limit]:
+        lines.append(f"  {stat}")
+
+    return "\n".join(lines)
+
+
+def format_stats() -> str:
+    """Текстовый отчёт по stats для вывода в консоль."""
+
+    report = stats()
+
+    if not report:
+        return "Нет данных замеров"
+
+    lines = [
+        f"{'Операция':32} {'вызовы':>8} {'средн':>9} "
+        f"{'p50':>9} {'p90':>9} {'p99':>9} {'макс':>9} (мкс)"
+    ]
+
+    for name, item in report.items():
+        lines.append(
+            f"{name:32} {item['calls']:>8} {item['mean_us']:>9.1f} "
+            f"{item['p50_us']:>9.1f} {item['p90_us']:>9.1f} "
+            f"{item['p99_us']:>9.1f} {item['max_us']:>9.1f}"
+        )
+
+        for reason, count in sorted(
+                item["failures"].items(), key=lambda pair: -pair[1]
+        ):
+            lines.append(f"    ошибка x{count}: {reason}")
+
+    return "\n".join(lines)
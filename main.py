@@ -1,13 +1,19 @@
+import instrumentation
+from card_log import CardLog
 from menu import Menu
 from product_card import ProductCard
 
 
+DATA_DIR = "cards_data"
+PAGE_SIZE = 20
+
+
 def main() -> None:
     """
     Класс для запуска консольного интерфейса для работы с данными карточки.
     """
 
-    system = Menu()
+    system = Menu(log=CardLog(DATA_DIR))
 
     while True:
         print("1 - Создать карточку")
@@ -16,8 +22,9 @@ def main() -> None:
         print("4 - Списать карточку")
         print("5 - Список всех карточек")
         print("6 - Выход")
+        print("7 - Замеры производительности")
 
-        choice = input("Выберите действие (1-6): ").strip()
+        choice = input("Выберите действие (1-7): ").strip()
 
         match choice:
             case "1":
@@ -204,14 +211,84 @@ def main() -> None:
                     print(f"Ошибка при списании карточки: {e}")
 
             case "5":
-                system.list_cards()
+                if not system.cards:
+                    print("\nНет созданных карточек")
+                    continue
+
+                print("\n" + "=" * 60)
+                cursor = None
+
+                while True:
+                    rows, cursor = system.page_cards(PAGE_SIZE, cursor)
+
+                    for row in rows:
+                        print(
+                            f"{row['card_id']}: {row['name']} | "
+                            f"{row['status']} | {row['quantity']} шт."
+                        )
+
+                    if cursor is None:
+                        break
+
+                    answer = input(
+                        "Enter - следующая страница, q - завершить просмотр: "
+                    )
+
+                    if answer.strip().lower() == "q":
+                        break
+
+                print(f"\nВсего карточек: {len(system.cards)}")
 
             case "6":
+                system.close()
                 print("До свидания!")
                 break
 
+            case "7":
+                performance()
+
             case _:
-                print("Неверный выбор. Пожалуйста, выберите 1-6")
+                print("Неверный выбор. Пожалуйста, выберите 1-7")
+
+
+def performance() -> None:
+    """
+    Управление замерами операций и профилированием (см. instrumentation).
+    """
+
+    on = "выключить" if instrumentation.enabled() else "включить"
+    capture = "остановить" if instrumentation.capturing() else "запустить"
+
+    print("1 - Показать статистику")
+    print(f"2 - {on.capitalize()} замеры")
+    print(f"3 - {capture.capitalize()} профилирование cProfile/tracemalloc")
+    print("4 - Сбросить статистику")
+
+    match input("Выберите действие (1-4): ").strip():
+        case "1":
+            print(instrumentation.format_stats())
+
+        case "2":
+            if instrumentation.enabled():
+                instrumentation.disable()
+                print("Замеры выключены")
+            else:
+                instrumentation.enable()
+                print("Замеры включены")
+
+        case "3":
+            if instrumentation.capturing():
+                print(instrumentation.stop_capture())
+            else:
+                instrumentation.start_capture()
+                print("Профилирование запущено")
+
+        case "4":
+            instrumentation.reset()
+            print("Статистика сброшена")
+
+        case _:
+            print("Неверный выбор")
 
 
 if __name__ == "__main__":
@@ -1,4 +1,42 @@
-from product_card import ProductCard
+import contextlib
+import datetime
+import heapq
+import itertools
+import operator
+import threading
+
+from alerts import AlertEngine
+from binary_snapshot import SnapshotReader, write_snapshot
+from dates import to_datetime
+from indexes import HashIndex, SortedIndex
+from product_card import ProductCard, confirm_always, validate_changes
+from stock import StockTotals
+from transaction import Transaction
+from versions import MenuSnapshot
+
+
+SORT_FIELDS = (
+    "card_id",
+    "name",
+    "quantity",
+    "status",
+    "supplier",
+    "manufacturer",
+    "cost",
+    "location",
+    "articul",
+    "guarantee",
+    "receipt_date"
+)
+
+# Поля карточки, по которым ищет search
+TEXT_FIELDS = ("name", "articul")
+
+# Поля с хеш-индексами (find) и упорядоченными индексами (find_range)
+FIND_FIELDS = ("supplier", "manufacturer", "location", "status")
+RANGE_FIELDS = ("cost", "quantity", "receipt_date")
+
+_NO_LOCK = contextlib.nullcontext()
 
 
 class Menu:
@@ -8,10 +46,482 @@ class Menu:
     обеспечивает создание, хранение и операции с карточками товаров.
     """
 
-    def __init__(self) -> None:
-        """Инициализация пустой системы хранения карточек."""
+    def __init__(
+            self,
+            cards=None,
+            log=None,
+            sink=None,
+            journal=None,
+            ledger=None,
+            alerts=None,
+            search=None,
+            thread_safe: bool = False,
+            lock_stripes: int = 64
+    ) -> None:
+        """
+        Инициализация системы хранения карточек.
+
+        Args:
+            cards: Хранилище карточек с интерфейсом словаря
+                   (например, CardStore или SqliteStore). По умолчанию -
+                   обычный dict
+            log: Журнал CardLog для сохранения карточек на диске.
+                 Сохранённые карточки загружаются при создании Menu
+            sink: Приёмник событий (ConsoleSink, NullSink, BufferedSink,
+                  LogSink). По умолчанию - ProductCard.sink
+            journal: Журнал изменений ChangeJournal для changes_since.
+                     Карточки, загруженные из log, в него не попадают
+            ledger: Журнал движения товара StockLedger для
+                    receive_stock, issue_stock, adjust_stock и прочих
+                    изменений количества
+            alerts: Оповещения AlertEngine об окончании гарантии и
+                    дозаказе для due_alerts
+            search: Индекс TextIndex для поиска по наименованию и
+                    артикулу (search). Хранит в памяти слова всех
+                    карточек
+            thread_safe: Режим для работы из нескольких потоков: операции
+                         с карточкой защищаются одной из lock_stripes
+                         блокировок, выбираемой по ID карточки
+            lock_stripes: Количество блокировок в потокобезопасном режиме
+        """
+
+        self.cards = cards if cards is not None else {}
+        self.log = log
+        self.sink = sink if sink is not None else ProductCard.sink
+        self.journal = journal
+        self.ledger = ledger
+        self.alerts = alerts
+        self.search_index = search
+        # Хранилище со своими индексами (SqliteStore) само отвечает на
+        # find, find_range, сортировку и stock_totals, и Menu не держит
+        # для него индексов, порядка карточек и остатков в памяти
+        self._indexed = getattr(self.cards, "indexed", False)
+        self._movement = threading.local()
+        # Версии для снимков (см. snapshot): эпохи живых снимков, эпохи
+        # создания карточек и откат изменений
+        self._epoch = 0
+        self._snapshots = set()
+        self._oldest = None
+        self._born = {}
+        self._history = {}
+
+        if thread_safe:
+            self._stripes = [threading.RLock() for _ in range(lock_stripes)]
+            self._shared = threading.RLock()
+        else:
+            self._stripes = None
+            self._shared = _NO_LOCK
+
+        if self._indexed:
+            self.totals = None
+            self._order = None
+            self._indexes = {}
+            self._ranges = {}
+        else:
+            self.totals = StockTotals()
+            # ID карточек в порядке добавления
+            self._order = []
+            self._indexes = {field: HashIndex() for field in FIND_FIELDS}
+            # Значения упорядоченных индексов хранятся в массивах,
+            # даты - номерами дней, как в CardStore
+            self._ranges = {
+                "cost": SortedIndex("d"),
+                "quantity": SortedIndex("q"),
+                "receipt_date": SortedIndex(
+                    "l",
+                    datetime.datetime.toordinal,
+                    datetime.datetime.fromordinal
+                )
+            }
+
+        if log is not None:
+            for record in log.replay():
+                self.cards[record["card_id"]] = ProductCard.from_record(record)
+
+        if self._indexed and alerts is None and search is None:
+            # Обходить карточки незачем: подписка ставится на хранилище
+            self.cards.observer = self
+        else:
+            self._attach(self.cards.values())
+
+    def _lock(self, card_id: str):
+        """Блокировка карточки (заглушка вне потокобезопасного режима)."""
+
+        if self._stripes is None:
+            return _NO_LOCK
+
+        return self._stripes[hash(card_id) % len(self._stripes)]
+
+    @contextlib.contextmanager
+    def _lock_all(self):
+        """Захват блокировок всех карточек для пакетных операций."""
+
+        with contextlib.ExitStack() as stack:
+            for lock in self._stripes or ():
+                stack.enter_context(lock)
+
+            with self._shared:
+                yield
+
+    def _values(self):
+        """
+        Карточки системы для обхода.
+
+        В потокобезопасном режиме возвращает копию списка, чтобы
+        добавление карточек другими потоками не прерывало обход.
+        """
+
+        if self._stripes is None:
+            return self.cards.values()
+
+        with self._shared:
+            return list(self.cards.values())
+
+    def _attach(self, cards) -> None:
+        """
+        Подписка на изменения карточек и добавление их в индексы.
+
+        Индексы и остатки строятся пакетно: значения каждого поля
+        собираются в список одним проходом map, и индекс заполняется
+        из этого списка, а не вызовом add на каждую карточку. Хранилищу
+        со своими индексами нужны только AlertEngine и TextIndex, и
+        cards обходится один раз без списка, поэтому при открытии
+        SqliteStore карточки не загружаются в память все сразу.
+        """
+
+        if self._indexed:
+            self._subscribe(cards)
+            return
+
+        cards = list(cards)
+        ids = [card.get_card_id() for card in cards]
+        columns = {
+            field: list(map(operator.methodcaller("get_" + field), cards))
+            for field in FIND_FIELDS + RANGE_FIELDS
+        }
+        self._order.extend(ids)
+        self.totals.add_many(columns)
+
+        for field, index in self._indexes.items():
+            index.add_many(columns[field], ids)
+
+        for field, index in self._ranges.items():
+            index.add_many(columns[field], ids)
+
+        self._subscribe(cards)
+
+    def _subscribe(self, cards) -> None:
+        """
+        Подписка на изменения карточек и их учёт в версиях снимков,
+        оповещениях и поиске.
+        """
+
+        born = self._epoch if self._snapshots else None
+
+        for card in cards:
+            card._observer = self
+
+            if born is not None:
+                self._born[card.get_card_id()] = born
+
+            if self.alerts is not None:
+                self.alerts.track(card)
+
+            if self.search_index is not None:
+                self.search_index.add(
+                    card.get_card_id(), card.get_name(), card.get_articul()
+                )
+
+    def card_changed(self, card: ProductCard, field: str, old, new) -> None:
+        """
+        Обработка изменения поля карточки, вызывается её сеттерами.
+
+        Args:
+            card: Изменённая карточка
+            field: Имя изменённого поля
+            old: Прежнее значение
+            new: Новое значение
+        """
+
+        with self._shared:
+            if self._snapshots:
+                self._remember(card.get_card_id(), field, old)
+
+            index = self._indexes.get(field) or self._ranges.get(field)
+
+            if index is not None:
+                index.move(card.get_card_id(), old, new)
+
+            if self.search_index is not None and field in TEXT_FIELDS:
+                texts = {
+                    "name": card.get_name(),
+                    "articul": card.get_articul()
+                }
+                self.search_index.replace(
+                    card.get_card_id(),
+                    tuple({**texts, field: old}.values()),
+                    tuple(texts.values())
+                )
+
+            if self.totals is not None and field in StockTotals.FIELDS:
+                self.totals.move(card, field, old)
+
+            if self.alerts is not None and field in AlertEngine.FIELDS:
+                self.alerts.card_changed(card, field, old, new)
+
+            if field == "quantity" and self.ledger is not None:
+                kind, note = getattr(
+                    self._movement, "current", ("adjustment", "")
+                )
+                self.ledger.record(
+                    card.get_card_id(), kind, new - old, new, note
+                )
+
+            if self.journal is not None:
+                op = "update"
+
+                if field == "status" and new == ProductCard.STATUS_WRITTEN_OFF:
+                    op = "write_off"
+
+                self.journal.record(
+                    card.get_card_id(), op, {field: (old, new)}
+                )
+
+    def snapshot(self) -> MenuSnapshot:
+        """
+        Согласованное представление всех карточек на текущий момент.
+
+        Снимок создаётся за O(1) и не меняется при последующих
+        изменениях, созданиях и списаниях карточек, поэтому длинные
+        обходы и выгрузки не видят частично применённых изменений и не
+        блокируют запись на всё время обхода. Пока снимок жив, каждое
+        изменение поля дополнительно запоминает прежнее значение.
+
+        Returns:
+            MenuSnapshot: Снимок; освобождается методом close или
+                          блоком with
+        """
+
+        with self._shared:
+            epoch = self._epoch
+            self._epoch += 1
+
+            if self._oldest is None:
+                self._oldest = epoch
+
+            self._snapshots.add(epoch)
+
+            return MenuSnapshot(self, epoch, len(self.cards))
+
+    def _release(self, epoch: int) -> None:
+        """Забывание снимка эпохи epoch и ненужных больше версий."""
+
+        with self._shared:
+            self._snapshots.discard(epoch)
+
+            if self._snapshots:
+                self._oldest = min(self._snapshots)
+            else:
+                self._oldest = None
+                self._born = {}
+                self._history = {}
+
+    def _remember(self, card_id: str, field: str, old) -> None:
+        """
+        Запоминание прежнего значения поля для живых снимков.
+
+        Записи с эпохой не новее самого старого снимка не нужны ни
+        одному снимку и отбрасываются.
+        """
+
+        history = self._history.setdefault(card_id, [])
+        history.append((self._epoch, field, old))
+        stale = 0
+
+        while history[stale][0] <= self._oldest:
+            stale += 1
+
+        if stale:
+            del history[:stale]
+
+    def _raw_at(self, card_id: str, epoch: int):
+        """
+        Значения полей карточки на момент снимка эпохи epoch.
+
+        Returns:
+            dict: Словарь get_raw или None, если карточки тогда не было
+        """
+
+        with self._lock(card_id):
+            if (
+                    card_id not in self.cards
+                    or self._born.get(card_id, epoch) > epoch
+            ):
+                return None
+
+            raw = self.cards[card_id].get_raw()
+
+            for changed, field, old in reversed(
+                    self._history.get(card_id, ())
+            ):
+                if changed <= epoch:
+                    break
+
+                raw[field] = old
+
+            return raw
+
+    def transaction(self) -> Transaction:
+        """
+        Транзакция над несколькими карточками.
+
+        Использование:
+            with menu.transaction() as tx:
+                tx.update_card("A1", {"cost": 120.0})
+                tx.issue_stock("A2", 5)
+
+        Операции накапливаются и при выходе из блока with проверяются
+        и применяются все вместе; при исключении в блоке или ошибке
+        проверки не применяется ни одна (см. Transaction).
+
+        Returns:
+            Transaction: Новая транзакция
+        """
+
+        return Transaction(self)
+
+    def _record_create(self, card: ProductCard) -> None:
+        """Запись создания карточки в подключённые журналы."""
+
+        if self.ledger is not None and card.get_quantity():
+            self.ledger.record(
+                card.get_card_id(),
+                "receipt",
+                card.get_quantity(),
+                card.get_quantity()
+            )
 
-        self.cards = {}
+        if self.journal is None:
+            return
+
+        raw = card.get_raw()
+        card_id = raw.pop("card_id")
+        self.journal.record(
+            card_id,
+            "create",
+            {field: (None, value) for field, value in raw.items()}
+        )
+
+    def changes_since(self, seq: int = 0):
+        """
+        Лента изменений карточек после записи с номером seq.
+
+        Потребитель запоминает seq последней полученной записи и при
+        следующем опросе получает только новые изменения.
+
+        Args:
+            seq: Номер последней полученной записи (0 - с начала журнала)
+
+        Returns:
+            iterator: Записи {"seq", "card_id", "op", "changes"}, где
+                      op - "create", "update" или "write_off", а changes -
+                      {поле: (старое значение, новое значение)}
+
+        Raises:
+            ValueError: Если журнал изменений не подключён или номер seq
+                        журналу неизвестен
+        """
+
+        if self.journal is None:
+            raise ValueError("Журнал изменений не подключён")
+
+        with self._shared:
+            return iter(self.journal.since(seq))
+
+    def _persist(self, op: str, card: ProductCard) -> None:
+        """Запись операции над карточкой в журнал, если он подключён."""
+
+        with self._shared:
+            if self.log is None:
+                return
+
+            self.log.append(op, card.get_record())
+
+            if self.log.should_snapshot():
+                self.log.snapshot(self.cards.values())
+
+    def close(self) -> None:
+        """
+        Сохранение несохранённых изменений и закрытие журнала и
+        хранилища карточек (если у хранилища есть метод close).
+        """
+
+        if self.log is not None:
+            self.log.close()
+
+        close = getattr(self.cards, "close", None)
+
+        if close is not None:
+            close()
+
+    def export_snapshot(self, path: str) -> int:
+        """
+        Сохранение всех карточек в двоичный снимок (см. write_snapshot).
+
+        Карточки читаются из снимка snapshot, поэтому выгрузка
+        согласована и не блокирует изменение карточек.
+
+        Args:
+            path: Путь к файлу снимка
+
+        Returns:
+            int: Количество сохранённых карточек
+        """
+
+        with self.snapshot() as view:
+            return write_snapshot(path, view.cards())
+
+    def import_snapshot(self, path: str) -> int:
+        """
+        Добавление в систему всех карточек двоичного снимка.
+
+        Карточки не проверяются повторно, как и при загрузке журнала.
+        Если подключён журнал CardLog, после загрузки делается снимок.
+
+        Args:
+            path: Путь к файлу снимка
+
+        Returns:
+            int: Количество добавленных карточек
+
+        Raises:
+            ValueError: Если файл снимка некорректен или карточка с одним
+                        из ID уже есть в системе (тогда не добавляется
+                        ни одна карточка)
+        """
+
+        with SnapshotReader(path) as reader, self._lock_all():
+            cards = list(reader.cards())
+
+            for card in cards:
+                if card.get_card_id() in self.cards:
+                    raise ValueError(
+                        f"Карточка с ID {card.get_card_id()} уже существует"
+                    )
+
+            for card in cards:
+                self.cards[card.get_card_id()] = card
+
+            cards = [self.cards[card.get_card_id()] for card in cards]
+            self._attach(cards)
+
+            for card in cards:
+                self._record_create(card)
+
+            if self.log is not None:
+                self.log.snapshot(self.cards.values())
+
+            return len(cards)
 
     def create_card(self, card_id: str, data: dict) -> ProductCard:
         """
@@ -26,31 +536,136 @@ class Menu:
 
         Raises:
             ValueError: При попытке создать карточку с существующим ID
-            Exception: При ошибке создания карточки
+                        или при ошибках валидации данных
         """
 
-        if card_id in self.cards:
-            raise ValueError(f"Карточка с ID {card_id} уже существует")
+        with self._lock(card_id):
+            if card_id in self.cards:
+                raise ValueError(f"Карточка с ID {card_id} уже существует")
 
-        card = ProductCard(
-            card_id,
-            data.get("name", ""),
-            data.get("quantity", 0),
-            data.get("supplier", ""),
-            data.get("manufacturer", ""),
-            data.get("cost", 0.0),
-            data.get("location", ""),
-            data.get("articul", ""),
-            data.get("guarantee", 0),
-            data.get("receipt_date", "")
-        )
+            card = ProductCard.from_data(card_id, data, self.sink)
+
+            with self._shared:
+                self.cards[card_id] = card
+                card = self.cards[card_id]
+                self._attach([card])
+                self._record_create(card)
+                self._persist("create", card)
 
-        if card.get_status() == ProductCard.STATUS_DRAFT:
-            card.create(data)
+            return card
 
-        self.cards[card_id] = card
+    def create_cards(self, rows, atomic: bool = True) -> dict:
+        """
+        Пакетное создание карточек.
+
+        Сначала проверяются все строки пакета, затем карточки
+        добавляются в систему. Сообщения по каждой карточке не выводятся.
+
+        Args:
+            rows: Итерируемый набор пар (card_id, data)
+            atomic: True - при любой ошибке не создаётся ни одна карточка,
+                    False - создаются все карточки без ошибок
+
+        Returns:
+            dict: Отчёт с ключами "created" (список ID созданных карточек)
+                  и "errors" (список кортежей (номер строки, ID, сообщение))
+        """
+
+        with self._lock_all():
+            staged = {}
+            errors = []
+
+            for index, (card_id, data) in enumerate(rows):
+                if card_id in self.cards or card_id in staged:
+                    errors.append((
+                        index,
+                        card_id,
+                        f"Карточка с ID {card_id} уже существует"
+                    ))
+                    continue
+
+                try:
+                    staged[card_id] = ProductCard.from_data(card_id, data)
+                except ValueError as e:
+                    errors.append((index, card_id, str(e)))
+
+            if atomic and errors:
+                staged = {}
+
+            for card_id, card in staged.items():
+                self.cards[card_id] = card
+                self._record_create(card)
+                self._persist("create", card)
+
+            self._attach(self.cards[card_id] for card_id in staged)
+
+            return {"created": list(staged), "errors": errors}
+
+    def update_cards(self, rows, atomic: bool = True) -> dict:
+        """
+        Пакетное обновление карточек.
+
+        Все строки сначала проверяются валидатором схемы и только затем
+        применяются к карточкам в системе. Сообщения не выводятся.
+
+        Args:
+            rows: Итерируемый набор пар (card_id, data)
+            atomic: True - при любой ошибке не изменяется ни одна карточка,
+                    False - применяются все изменения без ошибок
+
+        Returns:
+            dict: Отчёт с ключами "updated" (список ID изменённых карточек)
+                  и "errors" (список кортежей (номер строки, ID, сообщение))
+        """
+
+        with self._lock_all():
+            staged = []
+            errors = []
+
+            for index, (card_id, data) in enumerate(rows):
+                if card_id not in self.cards:
+                    errors.append(
+                        (index, card_id, f"Карточка {card_id} не найдена")
+                    )
+                    continue
+
+                if not data:
+                    errors.append(
+                        (index, card_id, "Нет данных для обновления")
+                    )
+                    continue
+
+                card = self.cards[card_id]
+
+                if card.get_status() == ProductCard.STATUS_WRITTEN_OFF:
+                    errors.append((
+                        index,
+                        card_id,
+                        "Невозможно изменить списанную карточку"
+                    ))
+                    continue
 
-        return card
+                values, problems = validate_changes(data)
+
+                if problems:
+                    errors.append(
+                        (index, card_id, "; ".join(problems.values()))
+                    )
+                else:
+                    staged.append((card_id, values))
+
+            if atomic and errors:
+                staged = []
+
+            updated = {}
+
+            for card_id, values in staged:
+                card = self.cards[card_id]
+                card._assign(values)
+                self._persist("update", card)
+                updated[card_id] = None
+
+            return {"updated": list(updated), "errors": errors}
 
     def update_card(self, card_id: str, data: dict) -> ProductCard:
         """
@@ -67,10 +682,14 @@ class Menu:
             ValueError: Если карточка с указанным ID не найдена
         """
 
-        if card_id not in self.cards:
-            raise ValueError(f"Карточка {card_id} не найдена")
+        with self._lock(card_id):
+            if card_id not in self.cards:
+                raise ValueError(f"Карточка {card_id} не найдена")
+
+            card = self.cards[card_id].update(data, self.sink)
+            self._persist("update", card)
 
-        return self.cards[card_id].update(data)
+            return card
 
     def get_card(self, card_id: str) -> dict:
         """
@@ -86,10 +705,11 @@ class Menu:
             ValueError: Если карточка с указанным ID не найдена
         """
 
-        if card_id not in self.cards:
-            raise ValueError(f"Карточка {card_id} не найдена")
+        with self._lock(card_id):
+            if card_id not in self.cards:
+                raise ValueError(f"Карточка {card_id} не найдена")
 
-        return self.cards[card_id].get_data()
+            return self.cards[card_id].get_data()
 
     def get_card_object(self, card_id: str) -> ProductCard:
         """
@@ -105,17 +725,19 @@ class Menu:
             ValueError: Если карточка с указанным ID не найдена
         """
 
-        if card_id not in self.cards:
-            raise ValueError(f"Карточка {card_id} не найдена")
+        with self._lock(card_id):
+            if card_id not in self.cards:
+                raise ValueError(f"Карточка {card_id} не найдена")
 
-        return self.cards[card_id]
+            return self.cards[card_id]
 
-    def write_off_card(self, card_id: str) -> ProductCard:
+    def write_off_card(self, card_id: str, confirm=None) -> ProductCard:
         """
         Списание карточки по ID.
 
         Args:
             card_id: Идентификатор списываемой карточки
+            confirm: Политика подтверждения (см. ProductCard.write_off)
 
         Returns:
             ProductCard: Списанная карточка
@@ -124,10 +746,669 @@ class Menu:
             ValueError: Если карточка с указанным ID не найдена
         """
 
-        if card_id not in self.cards:
-            raise ValueError(f"Карточка {card_id} не найдена")
+        with self._lock(card_id):
+            if card_id not in self.cards:
+                raise ValueError(f"Карточка {card_id} не найдена")
+
+            card = self.cards[card_id].write_off(confirm, self.sink)
+            self._persist("write_off", card)
+
+            return card
+
+    def write_off_cards(
+            self,
+            card_ids=None,
+            confirm=confirm_always,
+            atomic: bool = True,
+            **criteria
+    ) -> dict:
+        """
+        Пакетное списание карточек без запросов и вывода сообщений.
+
+        Сначала проверяются все карточки пакета, затем они списываются.
+
+        Args:
+            card_ids: Итерируемый набор ID списываемых карточек
+            confirm: Политика подтверждения, вызывается для каждой карточки
+            atomic: True - при любой ошибке не списывается ни одна карточка,
+                    False - списываются все карточки без ошибок
+            criteria: Условия отбора карточек (см. find), если card_ids
+                      не указаны. Без условия status отбираются только
+                      карточки на учёте
+
+        Returns:
+            dict: Отчёт с ключами "written_off" (список ID списанных
+                  карточек) и "errors" (список пар (ID, сообщение))
+
+        Raises:
+            ValueError: Если не указаны ни card_ids, ни условия отбора
+        """
+
+        with self._lock_all():
+            if card_ids is None:
+                if not criteria:
+                    raise ValueError("Не указаны карточки для списания")
+
+                criteria.setdefault("status", ProductCard.STATUS_IN_STOCK)
+                card_ids = [
+                    card.get_card_id() for card in self.find(**criteria)
+                ]
+
+            staged = {}
+            errors = []
+
+            for card_id in card_ids:
+                if card_id not in self.cards:
+                    errors.append((card_id, f"Карточка {card_id} не найдена"))
+                    continue
+
+                if card_id in staged:
+                    continue
+
+                card = self.cards[card_id]
+
+                try:
+                    card._check_write_off()
+                except ValueError as e:
+                    errors.append((card_id, str(e)))
+                    continue
+
+                if not confirm(card):
+                    errors.append((card_id, "Списание отменено"))
+                    continue
+
+                staged[card_id] = card
+
+            if atomic and errors:
+                staged = {}
+
+            for card in staged.values():
+                card.set_status(ProductCard.STATUS_WRITTEN_OFF)
+                self._persist("write_off", card)
+
+            return {"written_off": list(staged), "errors": errors}
+
+    def receive_stock(
+            self,
+            card_id: str,
+            quantity: int,
+            note: str = ""
+    ) -> ProductCard:
+        """
+        Поступление товара на склад.
+
+        Args:
+            card_id: ID карточки
+            quantity: Количество поступивших единиц
+            note: Комментарий к движению (номер накладной и т.п.)
+
+        Returns:
+            ProductCard: Карточка с увеличенным остатком
+
+        Raises:
+            ValueError: Если карточка не найдена, списана или
+                        количество не положительное целое число
+        """
+
+        return self._move_stock(card_id, "receipt", quantity, note)
+
+    def issue_stock(
+            self,
+            card_id: str,
+            quantity: int,
+            note: str = ""
+    ) -> ProductCard:
+        """
+        Расход (отпуск) товара со склада.
+
+        Args:
+            card_id: ID карточки
+            quantity: Количество отпущенных единиц
+            note: Комментарий к движению
+
+        Returns:
+            ProductCard: Карточка с уменьшенным остатком
+
+        Raises:
+            ValueError: Если карточка не найдена или списана, количество
+                        не положительное целое число или превышает остаток
+        """
+
+        return self._move_stock(card_id, "issue", quantity, note)
+
+    def adjust_stock(
+            self,
+            card_id: str,
+            quantity: int,
+            note: str = ""
+    ) -> ProductCard:
+        """
+        Корректировка остатка по результатам инвентаризации.
+
+        Args:
+            card_id: ID карточки
+            quantity: Фактический остаток
+            note: Комментарий к движению
+
+        Returns:
+            ProductCard: Карточка с новым остатком
+
+        Raises:
+            ValueError: Если карточка не найдена или списана,
+                        или остаток отрицательный
+        """
+
+        return self._move_stock(card_id, "adjustment", quantity, note)
+
+    def _move_stock(
+            self,
+            card_id: str,
+            kind: str,
+            quantity: int,
+            note: str
+    ) -> ProductCard:
+        """Изменение остатка карточки с записью вида движения в журнал."""
+
+        with self._lock(card_id):
+            if card_id not in self.cards:
+                raise ValueError(f"Карточка {card_id} не найдена")
+
+            card = self.cards[card_id]
+
+            if card.get_status() == ProductCard.STATUS_WRITTEN_OFF:
+                raise ValueError("Невозможно изменить списанную карточку")
+
+            balance = self._balance(card, kind, quantity)
+            self._apply("stock", card_id, (kind, note, balance))
+
+            return card
+
+    @staticmethod
+    def _balance(card: ProductCard, kind: str, quantity: int) -> int:
+        """
+        Остаток карточки после движения товара вида kind.
+
+        Raises:
+            ValueError: Если количество не положительное целое число
+                        (кроме корректировки) или превышает остаток
+        """
+
+        if kind != "adjustment" and (
+                not isinstance(quantity, int)
+                or isinstance(quantity, bool)
+                or quantity <= 0
+        ):
+            raise ValueError(
+                "Количество должно быть положительным целым числом"
+            )
+
+        balance = card.get_quantity()
+
+        if kind == "receipt":
+            return balance + quantity
+
+        if kind == "issue":
+            if quantity > balance:
+                raise ValueError(
+                    f"Недостаточно товара: на складе {balance} шт."
+                )
+
+            return balance - quantity
+
+        return quantity
+
+    def _apply(self, op: str, card_id: str, value) -> None:
+        """
+        Применение проверенной операции к системе (см. Transaction).
+
+        Args:
+            op: "create", "update", "write_off" или "stock"
+            card_id: ID карточки
+            value: Новая карточка для "create", проверенные значения для
+                   "update", (вид движения, комментарий, новый остаток)
+                   для "stock"
+        """
+
+        if op == "create":
+            with self._shared:
+                self.cards[card_id] = value
+                card = self.cards[card_id]
+                self._attach([card])
+                self._record_create(card)
+                self._persist("create", card)
+
+            return
+
+        card = self.cards[card_id]
+
+        if op == "update":
+            card._assign(value)
+        elif op == "write_off":
+            card.set_status(ProductCard.STATUS_WRITTEN_OFF)
+        else:
+            kind, note, balance = value
+            self._movement.current = (kind, note)
+
+            try:
+                card.set_quantity(balance)
+            finally:
+                del self._movement.current
+
+        self._persist("write_off" if op == "write_off" else "update", card)
+
+    def stock_totals(self, group: str = None) -> dict:
+        """
+        Остатки и их стоимость без обхода карточек.
+
+        Хранилище со своими индексами считает остатки запросом к себе.
+
+        Args:
+            group: None - по всему складу, "location", "supplier"
+                   или "manufacturer" - в разрезе значений поля
+
+        Returns:
+            dict: {"cards", "units", "value"} для всего склада или
+                  {значение поля: {"cards", "units", "value"}}
+
+        Raises:
+            ValueError: При неизвестной группировке
+        """
+
+        with self._shared:
+            if self._indexed:
+                return self.cards.totals(group)
+
+            if group is None:
+                return self.totals.total()
+
+            return self.totals.by(group)
+
+    def stock_movements(self, card_id: str) -> list:
+        """
+        Движения товара по карточке (см. StockLedger.entries).
+
+        Raises:
+            ValueError: Если журнал движения не подключён
+        """
+
+        if self.ledger is None:
+            raise ValueError("Журнал движения товара не подключён")
+
+        with self._shared:
+            return self.ledger.entries(card_id)
+
+    def set_reorder_threshold(self, card_id: str, threshold) -> None:
+        """
+        Порог дозаказа карточки (см. AlertEngine.set_threshold).
+
+        Args:
+            card_id: ID карточки
+            threshold: Остаток, при котором нужен дозаказ, или None -
+                       порог по умолчанию
+
+        Raises:
+            ValueError: Если оповещения не подключены, карточка не
+                        найдена или порог не неотрицательное целое число
+        """
+
+        if self.alerts is None:
+            raise ValueError("Оповещения не подключены")
+
+        if threshold is not None and (
+                not isinstance(threshold, int)
+                or isinstance(threshold, bool)
+                or threshold < 0
+        ):
+            raise ValueError("Порог должен быть неотрицательным целым числом")
+
+        with self._lock(card_id):
+            if card_id not in self.cards:
+                raise ValueError(f"Карточка {card_id} не найдена")
+
+            with self._shared:
+                self.alerts.set_threshold(self.cards[card_id], threshold)
+
+    def due_alerts(self, today=None) -> list:
+        """
+        Наступившие оповещения об окончании гарантии и дозаказе
+        (см. AlertEngine.pop_due). Каждое оповещение выдаётся один раз.
+
+        Args:
+            today: Текущая дата (по умолчанию - сегодня)
+
+        Returns:
+            list: Словари оповещений
+
+        Raises:
+            ValueError: Если оповещения не подключены
+        """
+
+        if self.alerts is None:
+            raise ValueError("Оповещения не подключены")
+
+        with self._shared:
+            return self.alerts.pop_due(today)
+
+    def find(self, **criteria) -> list:
+        """
+        Поиск карточек по точному совпадению значений полей.
+
+        Пересекает вторичные индексы, начиная с самого маленького
+        множества, поэтому не просматривает все карточки системы.
+        Хранилище со своими индексами отвечает одним запросом.
 
-        return self.cards[card_id].write_off()
+        Args:
+            criteria: Значения полей supplier, manufacturer, location
+                      и/или status, например
+                      find(status=ProductCard.STATUS_IN_STOCK, location="A1")
+
+        Returns:
+            list: Карточки ProductCard, подходящие под все условия
+
+        Raises:
+            ValueError: При поиске по неподдерживаемому полю
+        """
+
+        for field in criteria:
+            if field not in FIND_FIELDS:
+                raise ValueError(f"Поиск по полю {field} не поддерживается")
+
+        if not criteria:
+            return list(self._values())
+
+        with self._shared:
+            if self._indexed:
+                return self.cards.find(criteria)
+
+            sets = sorted(
+                (
+                    self._indexes[field].get(value)
+                    for field, value in criteria.items()
+                ),
+                key=len
+            )
+            others = sets[1:]
+
+            return [
+                self.cards[card_id]
+                for card_id in sets[0]
+                if all(card_id in ids for ids in others)
+            ]
+
+    def search(
+            self,
+            query: str,
+            limit: int = 10,
+            fuzzy: bool = False
+    ) -> list:
+        """
+        Поиск карточек по началу слов наименования и артикула.
+
+        Каждое слово запроса должно совпасть с началом какого-либо слова
+        наименования или артикула карточки (см. TextIndex.search).
+
+        Args:
+            query: Строка запроса, например "болт м8" или "A-50"
+            limit: Максимальное количество результатов
+            fuzzy: Допускать опечатки в словах запроса
+
+        Returns:
+            list: Найденные карточки, лучшие совпадения первыми
+
+        Raises:
+            ValueError: Если Menu создан без индекса search
+        """
+
+        if self.search_index is None:
+            raise ValueError("Поиск не подключён")
+
+        with self._shared:
+            return [
+                self.cards[card_id]
+                for card_id in self.search_index.search(
+                    query, self._texts, limit, fuzzy
+                )
+            ]
+
+    def _texts(self, card_id: str) -> tuple:
+        """Тексты карточки для индекса поиска."""
+
+        card = self.cards[card_id]
+
+        return card.get_name(), card.get_articul()
+
+    def find_range(self, field: str, low=None, high=None) -> list:
+        """
+        Поиск карточек по диапазону значений поля.
+
+        Args:
+            field: Поле cost, quantity или receipt_date
+            low: Нижняя граница (включительно), None - без границы
+            high: Верхняя граница (включительно), None - без границы.
+                  Для receipt_date границы - date, datetime или строка
+                  ДД.ММ.ГГГГ; даты сравниваются по дням
+
+        Returns:
+            list: Карточки ProductCard в порядке возрастания значения поля.
+                  Карточки без даты поступления в поиск по дате не попадают
+
+        Raises:
+            ValueError: При поиске по неподдерживаемому полю
+        """
+
+        if field not in RANGE_FIELDS:
+            raise ValueError(
+                f"Поиск по диапазону поля {field} не поддерживается"
+            )
+
+        if field == "receipt_date":
+            low = to_datetime(low)
+            high = to_datetime(high)
+
+        with self._shared:
+            if self._indexed:
+                return self.cards.find_range(field, low, high)
+
+            return [
+                self.cards[card_id]
+                for card_id in self._ranges[field].range(low, high)
+            ]
+
+    def iter_cards(
+            self,
+            order_by: str = None,
+            descending: bool = False,
+            after=None,
+            where=None,
+            **criteria
+    ):
+        """
+        Ленивый обход карточек с фильтрацией и сортировкой.
+
+        Args:
+            order_by: Поле сортировки (см. SORT_FIELDS). Без сортировки
+                      карточки идут в порядке добавления
+            descending: Сортировка по убыванию (только вместе с order_by)
+            after: Курсор, после которого продолжается обход
+            where: Функция-фильтр, принимающая ProductCard
+            criteria: Условия на точное совпадение полей (см. find)
+
+        Yields:
+            dict: Строки с исходными значениями полей (см. get_raw)
+        """
+
+        scan = self._scan(order_by, descending, after, where, criteria)
+
+        for _, card in scan:
+            yield card.get_raw()
+
+    def page_cards(
+            self,
+            limit: int = 20,
+            cursor=None,
+            order_by: str = None,
+            descending: bool = False,
+            where=None,
+            **criteria
+    ) -> tuple:
+        """
+        Одна страница списка карточек.
+
+        Args:
+            limit: Количество строк на странице
+            cursor: Курсор из предыдущего вызова (None - первая страница)
+            order_by, descending, where, criteria: См. iter_cards
+
+        Returns:
+            tuple: Пара (список строк get_raw, курсор следующей страницы).
+                   Курсор равен None, если страница последняя
+
+        Raises:
+            ValueError: Если limit меньше 1, а также см. iter_cards
+        """
+
+        if limit < 1:
+            raise ValueError("Размер страницы должен быть не меньше 1")
+
+        scan = self._scan(
+            order_by, descending, cursor, where, criteria, limit + 1
+        )
+        page = list(itertools.islice(scan, limit + 1))
+        next_cursor = page[limit - 1][0] if len(page) > limit else None
+
+        return [card.get_raw() for _, card in page[:limit]], next_cursor
+
+    def _scan(self, order_by, descending, after, where, criteria, limit=None):
+        """
+        Обход пар (курсор, карточка) для iter_cards и page_cards.
+
+        Без сортировки курсор - номер позиции в порядке добавления
+        карточек, и обход продолжается с этой позиции списка ID без
+        перебора предыдущих карточек. С сортировкой - пара
+        ((значение отсутствует, значение), ID карточки). Если для поля
+        есть упорядоченный индекс (в памяти или в хранилище),
+        покрывающий все карточки, обход идёт по нему без полной
+        сортировки. Иначе отбираются карточки после
+        курсора, и при заданном limit (page_cards) из них выбираются
+        limit первых через heapq, без сортировки всех карточек.
+
+        Raises:
+            ValueError: При неподдерживаемом поле сортировки
+        """
+
+        if order_by is not None and order_by not in SORT_FIELDS:
+            raise ValueError(
+                f"Сортировка по полю {order_by} не поддерживается"
+            )
+
+        if descending and order_by is None:
+            raise ValueError("Сортировка по убыванию требует поле сортировки")
+
+        ids = None
+
+        if criteria:
+            ids = {card.get_card_id() for card in self.find(**criteria)}
+
+            if order_by is None:
+                order_by = "card_id"
+
+        if order_by is None:
+            if not after:
+                for position, card in enumerate(self._values(), 1):
+                    if where is None or where(card):
+                        yield position, card
+
+                return
+
+            for position, card in enumerate(self._from(after), after + 1):
+                if where is None or where(card):
+                    yield position, card
+
+            return
+
+        if order_by in RANGE_FIELDS and self._covered(order_by):
+            if after is not None:
+                (missing, value), card_id = after
+                after = None if missing else (value, card_id)
+
+                if missing and not descending:
+                    return
+
+            if self._indexed:
+                items = self.cards.range_items(order_by, after, descending)
+            else:
+                items = self._ranges[order_by].items(after, descending)
+
+            for value, card_id in items:
+                if ids is not None and card_id not in ids:
+                    continue
+
+                card = self.cards[card_id]
+
+                if where is None or where(card):
+                    yield ((False, value), card_id), card
+
+            return
+
+        cards = self._values() if ids is None else map(
+            self.cards.__getitem__, ids
+        )
+        keyed = self._keyed(cards, order_by, descending, after, where)
+
+        if limit is None:
+            yield from sorted(
+                keyed, key=lambda item: item[0], reverse=descending
+            )
+        elif descending:
+            yield from heapq.nlargest(limit, keyed, key=lambda item: item[0])
+        else:
+            yield from heapq.nsmallest(limit, keyed, key=lambda item: item[0])
+
+    def _from(self, position: int):
+        """Карточки в порядке добавления, начиная с позиции position."""
+
+        if self._indexed:
+            yield from self.cards.values(start=position)
+            return
+
+        order = self._order
+
+        while position < len(order):
+            yield self.cards[order[position]]
+            position += 1
+
+    def _covered(self, field: str) -> bool:
+        """Покрывает ли упорядоченный индекс поля field все карточки."""
+
+        if self._indexed:
+            return self.cards.range_count(field) == len(self.cards)
+
+        return len(self._ranges[field]) == len(self.cards)
+
+    def _ids(self, count: int):
+        """ID первых count карточек в порядке добавления."""
+
+        ids = self.cards.keys() if self._indexed else self._order
+
+        return itertools.islice(ids, count)
+
+    @staticmethod
+    def _keyed(cards, order_by, descending, after, where):
+        """Пары (курсор, карточка) для карточек после курсора after."""
+
+        getter = "get_" + order_by
+
+        for card in cards:
+            value = getattr(card, getter)()
+            key = ((value is None, value), card.get_card_id())
+
+            if after is not None and (
+                    key >= after if descending else key <= after
+            ):
+                continue
+
+            if where is None or where(card):
+                yield key, card
 
     def list_cards(self) -> None:
         """
@@ -136,14 +1417,34 @@ class Menu:
         Для каждой карточки отображается: ID, наименование, статус, количество.
         """
 
-        if not self.cards:
-            print("\nНет созданных карточек")
+        self._print_cards(self._values())
+
+    def _print_cards(self, cards) -> None:
+        """Вывод краткой информации о карточках cards (см. list_cards)."""
+
+        emit = self.sink.emit
+        count = 0
+
+        # cards может быть генератором (CardStore, SqliteStore), поэтому
+        # карточки считаются при выводе, а не через len
+        for card in cards:
+            if not count:
+                emit("list_started", "\n" + "=" * 60)
+
+            count += 1
+            card_id = card.get_card_id()
+            emit(
+                "list_row",
+                f"{card_id}: {card.get_name()} | "
+                f"{card.get_status()} | {card.get_quantity()} шт.",
+                card_id=card_id
+            )
+
+        if not count:
+            emit("list_empty", "\nНет созданных карточек")
         else:
-            print("\n" + "=" * 60)
-            for card in self.cards.values():
-                data = card.get_data()
-                print(
-                    f"{data['ID']}: {data['Наименование']} | "
-                    f"{data['Состояние']} | {data['Количество']} шт."
-                )
-            print(f"\nВсего карточек: {len(self.cards)}")
\ No newline at end of file
+            emit(
+                "list_finished",
+                f"\nВсего карточек: {count}",
+                count=count
+            )
\ No newline at end of file
@@ -1,4 +1,11 @@
-import datetime
+from dates import to_datetime
+from events import ConsoleSink
+from schema import (
+    Field,
+    compile_assigner,
+    compile_filler,
+    compile_validator
+)
 
 
 class ProductCard:
@@ -6,10 +13,28 @@ class ProductCard:
     Класс для создания, изменения, просматривания и списания карточки.
     """
 
+    __slots__ = (
+        "_card_id",
+        "_name",
+        "_quantity",
+        "_status",
+        "_supplier",
+        "_manufacturer",
+        "_cost",
+        "_location",
+        "_articul",
+        "_guarantee",
+        "_receipt_date",
+        "_observer",
+        "_view"
+    )
+
     STATUS_DRAFT = "черновик"
     STATUS_IN_STOCK = "состоит на учёте"
     STATUS_WRITTEN_OFF = "списано"
 
+    sink = ConsoleSink()
+
     def __init__(
             self,
             card_id: str,
@@ -50,6 +75,8 @@ class ProductCard:
         self._articul = articul
         self._guarantee = guarantee
         self._receipt_date = receipt_date
+        self._observer = None
+        self._view = None
 
     def get_card_id(self) -> str:
         """Айди карточки."""
@@ -117,10 +144,13 @@ class ProductCard:
             ValueError: При попытке установить пустое наименование
         """
 
-        if not value or not value.strip():
-            raise ValueError("Название не может быть пустым")
+        value = CHECKS["name"](value)
 
-        self._name = value.strip()
+        if self._observer is None:
+            self._view = None
+            self._name = value
+        else:
+            self._assign({"name": value})
 
     def set_quantity(self, value: int) -> None:
         """
@@ -130,13 +160,17 @@ class ProductCard:
             value: Новое количество единиц товара
 
         Raises:
-            ValueError: При попытке установить отрицательное количество
+            ValueError: При попытке установить отрицательное
+                        или нечисловое количество
         """
 
-        if value < 0:
-            raise ValueError("Количество не может быть отрицательным")
+        value = CHECKS["quantity"](value)
 
-        self._quantity = value
+        if self._observer is None:
+            self._view = None
+            self._quantity = value
+        else:
+            self._assign({"quantity": value})
 
     def set_status(self, value: str) -> None:
         """
@@ -149,19 +183,13 @@ class ProductCard:
             ValueError: При попытке установить недопустимый статус
         """
 
-        valid_statuses = [
-            self.STATUS_DRAFT,
-            self.STATUS_IN_STOCK,
-            self.STATUS_WRITTEN_OFF
-        ]
+        value = CHECKS["status"](value)
 
-        if value not in valid_statuses:
-            raise ValueError(
-                f"Некорректный статус. Допустимые значения: "
-                f"{', '.join(valid_statuses)}"
-            )
-
-        self._status = value
+        if self._observer is None:
+            self._view = None
+            self._status = value
+        else:
+            self._assign({"status": value})
 
     def set_supplier(self, value: str) -> None:
         """
@@ -174,10 +202,13 @@ class ProductCard:
             ValueError: При попытке установить пустого поставщика
         """
 
-        if not value or not value.strip():
-            raise ValueError("Поставщик не может быть пустым")
+        value = CHECKS["supplier"](value)
 
-        self._supplier = value.strip()
+        if self._observer is None:
+            self._view = None
+            self._supplier = value
+        else:
+            self._assign({"supplier": value})
 
     def set_manufacturer(self, value: str) -> None:
         """
@@ -190,10 +221,13 @@ class ProductCard:
             ValueError: При попытке установить пустого производителя
         """
 
-        if not value or not value.strip():
-            raise ValueError("Производитель не может быть пустым")
+        value = CHECKS["manufacturer"](value)
 
-        self._manufacturer = value.strip()
+        if self._observer is None:
+            self._view = None
+            self._manufacturer = value
+        else:
+            self._assign({"manufacturer": value})
 
     def set_cost(self, value: float) -> None:
         """
@@ -204,12 +238,16 @@ class ProductCard:
 
         Raises:
             ValueError: При попытке установить отрицательную стоимость
+                        или не число
         """
 
-        if value < 0:
-            raise ValueError("Стоимость не может быть отрицательной")
+        value = CHECKS["cost"](value)
 
-        self._cost = value
+        if self._observer is None:
+            self._view = None
+            self._cost = value
+        else:
+            self._assign({"cost": value})
 
     def set_location(self, value: str) -> None:
         """
@@ -222,10 +260,13 @@ class ProductCard:
             ValueError: При попытке установить пустое местоположение
         """
 
-        if not value or not value.strip():
-            raise ValueError("Местоположение не может быть пустым")
+        value = CHECKS["location"](value)
 
-        self._location = value.strip()
+        if self._observer is None:
+            self._view = None
+            self._location = value
+        else:
+            self._assign({"location": value})
 
     def set_articul(self, value: str) -> None:
         """
@@ -235,7 +276,13 @@ class ProductCard:
             value: Новый артикул товара
         """
 
-        self._articul = value.strip() if value else ""
+        value = CHECKS["articul"](value)
+
+        if self._observer is None:
+            self._view = None
+            self._articul = value
+        else:
+            self._assign({"articul": value})
 
     def set_guarantee(self, value: int) -> None:
         """
@@ -245,38 +292,39 @@ class ProductCard:
             value: Новый гарантийный срок в месяцах
 
         Raises:
-            ValueError: При попытке установить отрицательный срок
+            ValueError: При попытке установить отрицательный
+                        или нечисловой срок
         """
 
-        if value < 0:
-            raise ValueError("Гарантия не может быть отрицательной")
+        value = CHECKS["guarantee"](value)
 
-        self._guarantee = value
+        if self._observer is None:
+            self._view = None
+            self._guarantee = value
+        else:
+            self._assign({"guarantee": value})
 
-    def set_receipt_date(self, value: str) -> None:
+    def set_receipt_date(self, value) -> None:
         """
         Изменение даты поступления товара.
 
         Args:
-            value: Новая дата в формате ДД.ММ.ГГГГ
+            value: Новая дата в формате ДД.ММ.ГГГГ, ГГГГ-ММ-ДД
+                   или уже разобранная дата (date/datetime)
 
         Raises:
             ValueError: При неверном формате даты
         """
 
-        if value:
-            try:
-                self._receipt_date = datetime.datetime.strptime(
-                    value, "%d.%m.%Y"
-                )
-            except ValueError as e:
-                raise ValueError(
-                    "Дата должна быть в формате ДД.ММ.ГГГГ"
-                ) from e
+        value = CHECKS["receipt_date"](value)
+
+        if self._observer is None:
+            self._view = None
+            self._receipt_date = value
         else:
-            self._receipt_date = None
+            self._assign({"receipt_date": value})
 
-    def create(self, data: dict) -> 'ProductCard':
+    def create(self, data: dict, sink=None) -> 'ProductCard':
         """
         Заполнение карточки данными и перевод в статус "на учёте".
 
@@ -284,29 +332,26 @@ class ProductCard:
             data: Словарь с данными карточки, содержащий ключи:
                 name, quantity, supplier, manufacturer, cost,
                 location, articul, guarantee, receipt_date
+            sink: Приёмник событий (по умолчанию ProductCard.sink)
 
         Returns:
             ProductCard: Заполненная карточка в статусе "на учёте"
 
         Raises:
-            Exception: При ошибке валидации или заполнения данных
+            ValueError: При отсутствии обязательных полей или ошибках
+                        валидации (все ошибки в одном сообщении)
         """
 
-        self.set_name(data["name"])
-        self.set_quantity(data["quantity"])
-        self.set_supplier(data["supplier"])
-        self.set_manufacturer(data["manufacturer"])
-        self.set_cost(data["cost"])
-        self.set_location(data["location"])
-        self.set_articul(data.get("articul", ""))
-        self.set_guarantee(data.get("guarantee", 0))
-        self.set_receipt_date(data.get("receipt_date", ""))
-        self.set_status(self.STATUS_IN_STOCK)
-        print(f"Карточка {self._card_id} создана")
+        self._fill(data)
+        (sink or self.sink).emit(
+            "card_created",
+            f"Карточка {self._card_id} создана",
+            card_id=self._card_id
+        )
 
         return self
 
-    def update(self, data: dict) -> 'ProductCard':
+    def update(self, data: dict, sink=None) -> 'ProductCard':
         """
         Обновление указанных полей карточки.
 
@@ -315,14 +360,15 @@ class ProductCard:
                   Может содержать ключи: name, quantity, supplier,
                   manufacturer, cost, location, articul, guarantee,
                   receipt_date
+            sink: Приёмник событий (по умолчанию ProductCard.sink)
 
         Returns:
             ProductCard: Обновленная карточка
 
         Raises:
             ValueError: При попытке обновить списанную карточку
-                       или при передаче пустого словаря
-            Exception: При ошибке валидации новых данных
+                       или при передаче пустого словаря, а также
+                       при ошибках валидации новых данных
         """
 
         if self._status == self.STATUS_WRITTEN_OFF:
@@ -333,44 +379,179 @@ class ProductCard:
         if not data:
             raise ValueError("Нет данных для обновления")
 
-        if "name" in data:
-            self.set_name(data["name"])
+        self._apply(data)
+        (sink or self.sink).emit(
+            "card_updated",
+            f"Карточка {self._card_id} обновлена",
+            card_id=self._card_id,
+            fields=list(data)
+        )
 
-        if "quantity" in data:
-            self.set_quantity(data["quantity"])
+        return self
+
+    def _fill(self, data: dict) -> None:
+        """
+        Заполнение всех полей карточки без вывода сообщений.
 
-        if "supplier" in data:
-            self.set_supplier(data["supplier"])
+        Все поля проверяются до изменения карточки. Карточка без
+        владельца заполняется так же, как в from_data: проверенные
+        значения записываются прямо в атрибуты, без словаря значений.
 
-        if "manufacturer" in data:
-            self.set_manufacturer(data["manufacturer"])
+        Args:
+            data: Словарь с данными карточки (см. create)
 
-        if "cost" in data:
-            self.set_cost(data["cost"])
+        Raises:
+            ValueError: При отсутствии обязательных полей или ошибках
+                        валидации (все ошибки в одном сообщении)
+        """
 
-        if "location" in data:
-            self.set_location(data["location"])
+        if self._observer is not None:
+            values = validated(validate_card, data)
+            values["status"] = self.STATUS_IN_STOCK
+            self._assign(values)
+            return
 
-        if "articul" in data:
-            self.set_articul(data["articul"])
+        errors = fill_card(self, data)
 
-        if "guarantee" in data:
-            self.set_guarantee(data["guarantee"])
+        if errors:
+            raise ValueError("; ".join(errors.values()))
 
-        if "receipt_date" in data:
-            self.set_receipt_date(data["receipt_date"])
-        print(f"Карточка {self._card_id} обновлена")
+        self._status = self.STATUS_IN_STOCK
+        self._view = None
 
-        return self
+    def _apply(self, data: dict) -> None:
+        """
+        Изменение переданных полей карточки без вывода сообщений.
+
+        Все поля проверяются до изменения карточки, поэтому при ошибке
+        карточка остаётся прежней.
+
+        Args:
+            data: Словарь с обновляемыми данными (см. update)
+
+        Raises:
+            ValueError: При ошибках валидации (все ошибки в одном
+                        сообщении)
+        """
+
+        self._assign(validated(validate_changes, data))
+
+    def _assign(self, values: dict) -> None:
+        """
+        Запись уже проверенных значений полей с уведомлением владельца.
+
+        Args:
+            values: Словарь {имя поля: значение}, полученный валидатором
+        """
+
+        self._view = None
+        observer = self._observer
+
+        if observer is None:
+            assign_fields(self, values)
+            return
+
+        for field, value in values.items():
+            slot = SLOTS[field]
+            old = getattr(self, slot)
+            setattr(self, slot, value)
+
+            if observer is not None and old != value:
+                observer.card_changed(self, field, old, value)
+
+    @classmethod
+    def from_data(
+            cls,
+            card_id: str,
+            data: dict,
+            sink=None
+    ) -> 'ProductCard':
+        """
+        Новая карточка в статусе "на учёте" из словаря данных create.
+
+        В отличие от create, карточка строится без черновика: её поля
+        сразу заполняются проверенными значениями (см. compile_filler).
+
+        Args:
+            card_id: Айди карточки
+            data: Словарь с данными карточки (см. create)
+            sink: Приёмник события card_created (по умолчанию
+                  событие не отправляется)
+
+        Returns:
+            ProductCard: Заполненная карточка
+
+        Raises:
+            ValueError: При отсутствии обязательных полей или ошибках
+                        валидации (все ошибки в одном сообщении)
+        """
+
+        card = cls.__new__(cls)
+        errors = fill_card(card, data)
+
+        if errors:
+            raise ValueError("; ".join(errors.values()))
+
+        card._card_id = card_id
+        card._status = cls.STATUS_IN_STOCK
+        card._observer = None
+        card._view = None
+
+        if sink is not None:
+            sink.emit(
+                "card_created",
+                f"Карточка {card_id} создана",
+                card_id=card_id
+            )
+
+        return card
+
+    def copy(self) -> 'ProductCard':
+        """
+        Отдельная копия карточки со всеми текущими значениями полей.
+
+        Returns:
+            ProductCard: Новая карточка, не связанная с хранилищем
+        """
+
+        card = ProductCard(
+            self._card_id,
+            self._name,
+            self._quantity,
+            self._supplier,
+            self._manufacturer,
+            self._cost,
+            self._location,
+            self._articul,
+            self._guarantee,
+            self._receipt_date
+        )
+        card._status = self._status
+
+        return card
 
     def get_data(self) -> dict:
         """
         Полные данные карточки в формате словаря.
 
+        Отформатированный словарь строится при первом обращении и
+        хранится до следующего изменения карточки через сеттеры.
+
         Returns:
             dict: Словарь со всеми полями карточки и их значениями
         """
 
+        view = self._view
+
+        if view is None:
+            view = self._render()
+            self._view = view
+
+        return dict(view)
+
+    def _render(self) -> dict:
+        """Построение отформатированного словаря данных карточки."""
+
         receipt = "не указана"
 
         if self._receipt_date:
@@ -395,17 +576,118 @@ class ProductCard:
             "Дата поступления": receipt
         }
 
-    def write_off(self) -> 'ProductCard':
+    def get_raw(self) -> dict:
+        """
+        Исходные значения полей карточки без какого-либо форматирования.
+
+        Returns:
+            dict: Словарь с ключами card_id, status и ключами словаря
+                  данных create; дата поступления - datetime или None
+        """
+
+        return {
+            "card_id": self._card_id,
+            "name": self._name,
+            "quantity": self._quantity,
+            "status": self._status,
+            "supplier": self._supplier,
+            "manufacturer": self._manufacturer,
+            "cost": self._cost,
+            "location": self._location,
+            "articul": self._articul,
+            "guarantee": self._guarantee,
+            "receipt_date": self._receipt_date
+        }
+
+    def get_record(self) -> dict:
+        """
+        Значения полей карточки для сохранения (см. get_raw).
+
+        Returns:
+            dict: Словарь get_raw, в котором дата поступления - строка
+                  ДД.ММ.ГГГГ или пустая строка
+        """
+
+        record = self.get_raw()
+        receipt = record["receipt_date"]
+        record["receipt_date"] = (
+            receipt.strftime("%d.%m.%Y") if receipt else ""
+        )
+
+        return record
+
+    @classmethod
+    def from_record(cls, record: dict) -> 'ProductCard':
+        """
+        Восстановление карточки из словаря get_record без валидации.
+
+        Args:
+            record: Словарь, полученный методом get_record
+
+        Returns:
+            ProductCard: Карточка с теми же значениями полей
+        """
+
+        # Поля заполняются напрямую, без __init__: так карточки
+        # восстанавливаются быстрее при загрузке журнала (см. CardLog)
+        card = cls.__new__(cls)
+        card._card_id = record["card_id"]
+        card._name = record["name"]
+        card._quantity = record["quantity"]
+        card._status = record["status"]
+        card._supplier = record["supplier"]
+        card._manufacturer = record["manufacturer"]
+        card._cost = record["cost"]
+        card._location = record["location"]
+        card._articul = record["articul"]
+        card._guarantee = record["guarantee"]
+        card._receipt_date = to_datetime(record["receipt_date"])
+        card._observer = None
+        card._view = None
+
+        return card
+
+    def write_off(self, confirm=None, sink=None) -> 'ProductCard':
         """
         Списание карточки со статусом "на учёте".
 
         Запрашивает подтверждение списания для безопасности.
 
+        Args:
+            confirm: Политика подтверждения - функция, принимающая
+                     карточку и возвращающая True для подтверждения
+                     (confirm_input, confirm_always, confirm_never или своя).
+                     По умолчанию - запрос подтверждения в консоли
+            sink: Приёмник событий (по умолчанию ProductCard.sink)
+
         Returns:
             ProductCard: Списанная карточка со статусом "списано"
 
         Raises:
-            ValueError: При неверном статусе или отмене списания пользователем
+            ValueError: При неверном статусе или отмене списания
+        """
+
+        self._check_write_off()
+        confirm = confirm or confirm_input
+
+        if not confirm(self):
+            raise ValueError("Списание отменено пользователем")
+
+        self.set_status(self.STATUS_WRITTEN_OFF)
+        (sink or self.sink).emit(
+            "card_written_off",
+            f"Карточка {self._card_id} списана",
+            card_id=self._card_id
+        )
+
+        return self
+
+    def _check_write_off(self) -> None:
+        """
+        Проверка, что карточку можно списать.
+
+        Raises:
+            ValueError: Если карточка не в статусе "на учёте"
         """
 
         if self._status != self.STATUS_IN_STOCK:
@@ -413,14 +695,105 @@ class ProductCard:
                 f"Списание возможно только для статуса "
                 f"'{self.STATUS_IN_STOCK}'"
             )
-        print(f"Остаток на складе: {self._quantity} шт.")
 
-        answer = input("Подтвердить списание? (да/нет): ").lower()
 
-        if answer != "да":
-            raise ValueError("Списание отменено пользователем")
+STATUSES = (
+    ProductCard.STATUS_DRAFT,
+    ProductCard.STATUS_IN_STOCK,
+    ProductCard.STATUS_WRITTEN_OFF
+)
+
+FIELDS = {
+    "name": Field("text", "Название не может быть пустым", required=True),
+    "quantity": Field(
+        "int",
+        "Количество не может быть отрицательным",
+        "Количество должно быть числом",
+        required=True
+    ),
+    "supplier": Field(
+        "text", "Поставщик не может быть пустым", required=True
+    ),
+    "manufacturer": Field(
+        "text", "Производитель не может быть пустым", required=True
+    ),
+    "cost": Field(
+        "number",
+        "Стоимость не может быть отрицательной",
+        "Стоимость должна быть числом",
+        required=True
+    ),
+    "location": Field(
+        "text", "Местоположение не может быть пустым", required=True
+    ),
+    "articul": Field(
+        "optional_text", type_error="Артикул должен быть строкой", default=""
+    ),
+    "guarantee": Field(
+        "int",
+        "Гарантия не может быть отрицательной",
+        "Гарантия должна быть числом",
+        default=0
+    ),
+    "receipt_date": Field("date", default="")
+}
+
+STATUS_FIELD = Field(
+    "choice",
+    "Некорректный статус. Допустимые значения: " + ", ".join(STATUSES),
+    choices=STATUSES
+)
+
+SLOTS = {field: "_" + field for field in (*FIELDS, "status")}
+assign_fields = compile_assigner(SLOTS)
+
+CHECKS = {name: field.compile() for name, field in FIELDS.items()}
+CHECKS["status"] = STATUS_FIELD.compile()
+
+validate_card = compile_validator(FIELDS)
+fill_card = compile_filler(FIELDS)
+validate_changes = compile_validator(FIELDS, partial=True)
+
+
+def validated(validator, data: dict) -> dict:
+    """
+    Проверка словаря данных валидатором схемы.
 
-        self.set_status(self.STATUS_WRITTEN_OFF)
-        print(f"Карточка {self._card_id} списана")
+    Args:
+        validator: validate_card или validate_changes
+        data: Проверяемый словарь данных
+
+    Returns:
+        dict: Очищенные значения полей
+
+    Raises:
+        ValueError: Со всеми ошибками полей через "; "
+    """
+
+    values, errors = validator(data)
+
+    if errors:
+        raise ValueError("; ".join(errors.values()))
+
+    return values
+
+
+def confirm_input(card: ProductCard) -> bool:
+    """Подтверждение списания пользователем в консоли."""
+
+    print(f"Остаток на складе: {card.get_quantity()} шт.")
+    answer = input("Подтвердить списание? (да/нет): ").lower()
+
+    return answer == "да"
+
+
+def confirm_always(card: ProductCard) -> bool:
+    """Списание без подтверждения (для скриптов и пакетных операций)."""
+
+    return True
+
+
+def confirm_never(card: ProductCard) -> bool:
+    """Запрет списания."""
 
-        return self
\ No newline at end of file
+    return False
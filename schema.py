@@ -0,0 +1,310 @@
+from dates import to_datetime
+
+
+class Field:
+    """
+    Декларативное описание поля карточки и правил его проверки.
+    """
+
+    def __init__(
+            self,
+            kind: str,
+            error: str = None,
+            type_error: str = None,
+            required: bool = False,
+            default=None,
+            choices: tuple = None
+    ) -> None:
+        """
+        Описание поля.
+
+        Args:
+            kind: Тип поля: "text" (непустая строка), "optional_text",
+                  "int" и "number" (неотрицательные числа), "choice"
+                  (одно из choices), "date" (см. dates.to_datetime)
+            error: Сообщение при пустом или отрицательном значении,
+                   неверной дате или значении вне choices
+            type_error: Сообщение при значении неверного типа
+            required: Обязательно ли поле при создании карточки
+            default: Значение необязательного поля по умолчанию
+            choices: Допустимые значения для типа "choice"
+        """
+
+        self.kind = kind
+        self.error = error
+        self.type_error = type_error or error
+        self.required = required
+        self.default = default
+        self.choices = choices
+
+    def compile(self):
+        """
+        Построение функции проверки одного значения поля.
+
+        Код проверки генерируется так же, как в compile_validator, но
+        сразу возвращает значение или вызывает исключение, без
+        промежуточных словарей.
+
+        Returns:
+            function: Функция, возвращающая очищенное значение поля
+                      или вызывающая ValueError с сообщением поля
+        """
+
+        namespace = {"to_datetime": to_datetime, **self.constants("f_")}
+        lines = ["def check(v):"]
+        lines.extend(
+            "    " + line for line in self.source("value", "f_", direct=True)
+        )
+        exec(compile("\n".join(lines), "<schema>", "exec"), namespace)
+
+        return namespace["check"]
+
+    def source(
+            self,
+            name: str,
+            prefix: str,
+            direct: bool = False,
+            target: str = None
+    ) -> list:
+        """
+        Строки кода проверки значения v для функции валидатора.
+
+        Код записывает очищенное значение в values[name] или сообщение
+        об ошибке в errors[name]. Константы поля берутся из переменных
+        с префиксом prefix (см. compile_validator).
+
+        Args:
+            name: Имя поля в словаре данных
+            prefix: Префикс имён констант поля
+            direct: Вместо записи в словари возвращать значение
+                    и вызывать ValueError (см. compile)
+            target: Имя переменной, в которую записывается очищенное
+                    значение вместо values[name] (см. compile_filler)
+
+        Returns:
+            list: Строки кода без отступа
+        """
+
+        key = repr(name)
+
+        if direct:
+            def ok(value):
+                return f"return {value}"
+
+            def fail(message):
+                return f"raise ValueError({message})"
+        else:
+            def ok(value):
+                if target:
+                    return f"{target} = {value}"
+
+                return f"values[{key}] = {value}"
+
+            def fail(message):
+                return f"errors[{key}] = {message}"
+
+        error = fail(f"{prefix}error")
+        type_error = fail(f"{prefix}type_error")
+
+        if self.kind == "text":
+            return [
+                "if v.__class__ is not str or not (v := v.strip()):",
+                f"    {error}",
+                "else:",
+                f"    {ok('v')}"
+            ]
+
+        if self.kind == "optional_text":
+            return [
+                "if not v:",
+                f"    {ok(repr(''))}",
+                "elif v.__class__ is str:",
+                f"    {ok('v.strip()')}",
+                "else:",
+                f"    {type_error}"
+            ]
+
+        if self.kind in ("int", "number"):
+            return [
+                f"if v.__class__ not in {prefix}types:",
+                f"    {type_error}",
+                "elif v < 0:",
+                f"    {error}",
+                "else:",
+                f"    {ok('v')}"
+            ]
+
+        if self.kind == "choice":
+            return [
+                f"if v in {prefix}choices:",
+                f"    {ok('v')}",
+                "else:",
+                f"    {error}"
+            ]
+
+        if self.kind == "date":
+            if direct:
+                return [ok("to_datetime(v)")]
+
+            return [
+                "try:",
+                f"    {ok('to_datetime(v)')}",
+                "except ValueError as e:",
+                f"    {fail('str(e)')}"
+            ]
+
+        raise ValueError(f"Неизвестный тип поля {self.kind}")
+
+    def constants(self, prefix: str) -> dict:
+        """Константы, на которые ссылается код source."""
+
+        return {
+            prefix + "error": self.error,
+            prefix + "type_error": self.type_error,
+            prefix + "default": self.default,
+            prefix + "types": (
+                frozenset((int,)) if self.kind == "int"
+                else frozenset((int, float))
+            ),
+            prefix + "choices": frozenset(self.choices or ())
+        }
+
+
+def compile_validator(fields: dict, partial: bool = False):
+    """
+    Построение функции проверки словаря данных по схеме полей.
+
+    Схема разбирается один раз: по ней генерируется и компилируется
+    код одной функции, в которой проверки всех полей идут подряд без
+    вызовов вспомогательных функций. Функция проверяет все поля
+    за один проход и собирает все ошибки, а не только первую.
+
+    Args:
+        fields: Схема {имя поля: Field}
+        partial: True - проверяются только переданные поля (изменение),
+                 False - обязательные поля должны присутствовать,
+                 а для остальных подставляются значения по умолчанию
+
+    Returns:
+        function: Функция data -> (values, errors), где values - словарь
+                  очищенных значений, errors - словарь {поле: сообщение}
+    """
+
+    namespace = {"to_datetime": to_datetime}
+    lines = ["def validate(data):", "    values = {}", "    errors = {}"]
+    lines += _checks(fields, namespace, partial)
+    lines.append("    return values, errors")
+    exec(compile("\n".join(lines), "<schema>", "exec"), namespace)
+
+    return namespace["validate"]
+
+
+def compile_filler(fields: dict, prefix: str = "_"):
+    """
+    Построение функции проверки данных с записью прямо в атрибуты.
+
+    Проверки те же, что в compile_validator(fields), но очищенные
+    значения хранятся в локальных переменных и после проверки всех
+    полей записываются в атрибуты объекта, без словаря values.
+    При ошибках объект не изменяется.
+
+    Args:
+        fields: Схема {имя поля: Field}
+        prefix: Префикс имени атрибута (поле name -> атрибут _name)
+
+    Returns:
+        function: Функция (obj, data) -> errors, где errors - словарь
+                  {поле: сообщение}, пустой при успешной записи
+    """
+
+    namespace = {"to_datetime": to_datetime}
+    lines = ["def fill(obj, data):", "    errors = {}"]
+    lines += _checks(fields, namespace, local=True)
+    lines.append("    if errors:")
+    lines.append("        return errors")
+
+    for index, name in enumerate(fields):
+        lines.append(f"    obj.{prefix}{name} = x{index}")
+
+    lines.append("    return errors")
+    exec(compile("\n".join(lines), "<schema>", "exec"), namespace)
+
+    return namespace["fill"]
+
+
+def _checks(
+        fields: dict,
+        namespace: dict,
+        partial: bool = False,
+        local: bool = False
+) -> list:
+    """
+    Строки кода проверки всех полей для compile_validator и
+    compile_filler.
+
+    Args:
+        fields: Схема {имя поля: Field}
+        namespace: Пространство имён функции, в которое добавляются
+                   константы полей
+        partial: См. compile_validator
+        local: Записывать значение поля с номером i в переменную xi,
+               а не в словарь values
+
+    Returns:
+        list: Строки кода с отступом тела функции
+    """
+
+    lines = []
+
+    for index, (name, field) in enumerate(fields.items()):
+        prefix = f"f{index}_"
+        key = repr(name)
+        target = f"x{index}" if local else None
+        check = [
+            "        " + line
+            for line in field.source(name, prefix, target=target)
+        ]
+        namespace.update(field.constants(prefix))
+
+        if partial or field.required:
+            lines.append(f"    if {key} in data:")
+            lines.append(f"        v = data[{key}]")
+            lines.extend(check)
+
+            if not partial:
+                namespace[prefix + "missing"] = (
+                    f"Не указано обязательное поле {name}"
+                )
+                lines.append("    else:")
+                lines.append(f"        errors[{key}] = {prefix}missing")
+        else:
+            lines.append(f"    v = data.get({key}, {prefix}default)")
+            lines.extend(line[4:] for line in check)
+
+    return lines
+
+
+def compile_assigner(names, prefix: str = "_"):
+    """
+    Построение функции записи значений полей в атрибуты объекта.
+
+    Args:
+        names: Имена полей
+        prefix: Префикс имени атрибута (поле name -> атрибут _name)
+
+    Returns:
+        function: Функция (obj, values), записывающая каждое значение
+                  из словаря values в соответствующий атрибут obj
+    """
+
+    lines = ["def assign(obj, values):"]
+
+    for name in names:
+        lines.append(f"    if {name!r} in values:")
+        lines.append(f"        obj.{prefix}{name} = values[{name!r}]")
+
+    lines.append("    return None")
+    namespace = {}
+    exec(compile("\n".join(lines), "<schema>", "exec"), namespace)
+
+    return namespace["assign"]
@@ -0,0 +1,226 @@
+import argparse
+import asyncio
+import datetime
+import json
+
+from card_log import CardLog
+from events import NullSink
+from menu import Menu
+from product_card import confirm_always
+
+
+def to_json(value):
+    """
+    Приведение значения к виду, пригодному для JSON.
+
+    Кортежи превращаются в списки, даты - в {"date": "ГГГГ-ММ-ДД"}.
+    """
+
+    if isinstance(value, datetime.datetime):
+        return {"date": value.date().isoformat()}
+
+    if isinstance(value, (list, tuple)):
+        return [to_json(item) for item in value]
+
+    if isinstance(value, dict):
+        return {key: to_json(item) for key, item in value.items()}
+
+    return value
+
+
+def from_json_cursor(value):
+    """Восстановление курсора page_cards, полученного через to_json."""
+
+    if isinstance(value, list):
+        return tuple(from_json_cursor(item) for item in value)
+
+    if isinstance(value, dict) and "date" in value:
+        return datetime.datetime.fromisoformat(value["date"])
+
+    return value
+
+
+class CardServer:
+    """
+    Асинхронный сервис доступа к Menu по протоколу JSON Lines.
+
+    Каждый запрос - одна строка JSON вида
+    {"id": 1, "method": "get_card", "params": {"card_id": "A1"}},
+    ответ - строка {"id": 1, "result": ...} или {"id": 1, "error": "..."}.
+    Клиент может отправлять запросы, не дожидаясь ответов: они
+    обрабатываются и возвращаются в порядке поступления. Если клиент
+    не успевает читать ответы, сервер перестаёт читать его запросы.
+    """
+
+    def __init__(self, menu: Menu, read_limit: int = 2 ** 16) -> None:
+        """
+        Создание сервиса.
+
+        Args:
+            menu: Система карточек, с которой работает сервис
+            read_limit: Размер буфера чтения одного соединения в байтах
+        """
+
+        self.menu = menu
+        self.read_limit = read_limit
+        self.connections = 0
+        self._methods = {
+            "create_card": self._create_card,
+            "update_card": self._update_card,
+            "get_card": self._get_card,
+            "write_off_card": self._write_off_card,
+            "list_cards": self._list_cards
+        }
+
+    def _create_card(self, card_id: str, data: dict) -> dict:
+        return self.menu.create_card(card_id, data).get_record()
+
+    def _update_card(self, card_id: str, data: dict) -> dict:
+        return self.menu.update_card(card_id, data).get_record()
+
+    def _get_card(self, card_id: str) -> dict:
+        return self.menu.get_card(card_id)
+
+    def _write_off_card(self, card_id: str) -> dict:
+        return self.menu.write_off_card(card_id, confirm_always).get_record()
+
+    def _list_cards(
+            self,
+            limit: int = 100,
+            cursor=None,
+            order_by: str = None,
+            descending: bool = False,
+            criteria: dict = None
+    ) -> dict:
+        rows, cursor = self.menu.page_cards(
+            limit,
+            from_json_cursor(cursor),
+            order_by,
+            descending,
+            **(criteria or {})
+        )
+
+        return {"rows": rows, "cursor": cursor}
+
+    def dispatch(self, line: bytes) -> dict:
+        """
+        Выполнение одного запроса.
+
+        Args:
+            line: Строка запроса в формате JSON
+
+        Returns:
+            dict: Ответ на запрос
+        """
+
+        request_id = None
+
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            method = self._methods.get(request.get("method"))
+
+            if method is None:
+                raise ValueError(f"Неизвестный метод {request.get('method')}")
+
+            result = method(**request.get("params", {}))
+        except (ValueError, TypeError, KeyError, AttributeError) as e:
+            return {"id": request_id, "error": str(e)}
+
+        return {"id": request_id, "result": to_json(result)}
+
+    async def handle(
+            self,
+            reader: asyncio.StreamReader,
+            writer: asyncio.StreamWriter
+    ) -> None:
+        """Обслуживание одного клиентского соединения."""
+
+        self.connections += 1
+
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    writer.write(json.dumps(
+                        {"id": None, "error": "Слишком длинный запрос"},
+                        ensure_ascii=False
+                    ).encode() + b"\n")
+                    break
+
+                if not line:
+                    break
+
+                if not line.strip():
+                    continue
+
+                response = self.dispatch(line)
+                writer.write(
+                    json.dumps(response, ensure_ascii=False).encode() + b"\n"
+                )
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765,
+                    path: str = None) -> asyncio.AbstractServer:
+        """
+        Запуск сервиса на TCP-порту или Unix-сокете.
+
+        Args:
+            host: Адрес для TCP
+            port: Порт для TCP
+            path: Путь к Unix-сокету (если указан, TCP не используется)
+
+        Returns:
+            asyncio.AbstractServer: Запущенный сервер
+        """
+
+        if path:
+            return await asyncio.start_unix_server(
+                self.handle, path, limit=self.read_limit, backlog=4096
+            )
+
+        return await asyncio.start_server(
+            self.handle, host, port, limit=self.read_limit, backlog=4096
+        )
+
+
+async def serve(menu: Menu, host: str, port: int, path: str = None) -> None:
+    """Запуск сервиса и обслуживание клиентов до остановки процесса."""
+
+    server = await CardServer(menu).start(host, port, path)
+
+    async with server:
+        await server.serve_forever()
+
+
+def main() -> None:
+    """Запуск сервиса из командной строки."""
+
+    parser = argparse.ArgumentParser(description="Сервис карточек товаров")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="Путь к Unix-сокету")
+    parser.add_argument("--data", help="Каталог журнала CardLog")
+    args = parser.parse_args()
+
+    menu = Menu(
+        log=CardLog(args.data) if args.data else None,
+        sink=NullSink()
+    )
+
+    try:
+        asyncio.run(serve(menu, args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        menu.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,366 @@
+import heapq
+import multiprocessing
+import os
+import zlib
+
+from dates import to_datetime
+from events import ConsoleSink, NullSink
+from menu import Menu
+from product_card import ProductCard, confirm_always
+
+
+SHARD_METHODS = (
+    "create_card",
+    "create_cards",
+    "update_card",
+    "update_cards",
+    "get_card",
+    "write_off_card",
+    "write_off_cards",
+    "find",
+    "find_range",
+    "page_cards",
+    "count"
+)
+
+
+def _to_records(value):
+    """Замена карточек в результате на словари get_record для передачи."""
+
+    if isinstance(value, ProductCard):
+        return value.get_record()
+
+    if isinstance(value, list):
+        return [_to_records(item) for item in value]
+
+    return value
+
+
+def _shard_main(connection) -> None:
+    """
+    Цикл процесса-шарда: выполнение команд координатора над своим Menu.
+
+    Args:
+        connection: Конец канала multiprocessing.Pipe
+    """
+
+    menu = Menu(sink=NullSink())
+
+    while True:
+        message = connection.recv()
+
+        if message is None:
+            break
+
+        method, args, kwargs = message
+
+        try:
+            if method not in SHARD_METHODS:
+                raise ValueError(f"Неизвестный метод {method}")
+
+            if method == "count":
+                result = len(menu.cards)
+            else:
+                result = getattr(menu, method)(*args, **kwargs)
+
+            connection.send(("ok", _to_records(result)))
+        except (ValueError, TypeError, KeyError) as e:
+            connection.send(("error", str(e)))
+
+    connection.close()
+
+
+class ShardedMenu:
+    """
+    Реестр карточек, распределённый по нескольким процессам.
+
+    ID карточки определяет шард (процесс со своим Menu) по хешу CRC32.
+    Операции с одной карточкой выполняются в её шарде, пакетные
+    операции и поиск рассылаются всем шардам параллельно, а результаты
+    объединяются. Вместо объектов ProductCard возвращаются словари
+    get_record.
+    """
+
+    def __init__(self, workers: int = None) -> None:
+        """
+        Запуск процессов-шардов.
+
+        Args:
+            workers: Количество шардов (по умолчанию - число ядер)
+        """
+
+        workers = workers or os.cpu_count() or 1
+        self._connections = []
+        self._processes = []
+
+        for _ in range(workers):
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_shard_main, args=(child,), daemon=True
+            )
+            process.start()
+            child.close()
+            self._connections.append(parent)
+            self._processes.append(process)
+
+    def __enter__(self) -> 'ShardedMenu':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return sum(self._broadcast("count"))
+
+    def _shard(self, card_id: str) -> int:
+        """Номер шарда карточки."""
+
+        return zlib.crc32(card_id.encode()) % len(self._connections)
+
+    @staticmethod
+    def _result(connection):
+        """
+        Получение ответа шарда.
+
+        Raises:
+            ValueError: Если шард сообщил об ошибке
+        """
+
+        status, result = connection.recv()
+
+        if status == "error":
+            raise ValueError(result)
+
+        return result
+
+    def _call(self, shard: int, method: str, *args, **kwargs):
+        """Выполнение метода Menu в одном шарде."""
+
+        connection = self._connections[shard]
+        connection.send((method, args, kwargs))
+
+        return self._result(connection)
+
+    def _broadcast(self, method: str, *args, **kwargs) -> list:
+        """Параллельное выполнение метода Menu во всех шардах."""
+
+        for connection in self._connections:
+            connection.send((method, args, kwargs))
+
+        return [self._result(connection) for connection in self._connections]
+
+    def _scatter(self, method: str, batches: list, **kwargs) -> list:
+        """Параллельная отправка каждому шарду своей части пакета."""
+
+        for connection, batch in zip(self._connections, batches):
+            connection.send((method, (batch,), kwargs))
+
+        return [self._result(connection) for connection in self._connections]
+
+    def create_card(self, card_id: str, data: dict) -> dict:
+        """Создание карточки (см. Menu.create_card)."""
+
+        return self._call(self._shard(card_id), "create_card", card_id, data)
+
+    def update_card(self, card_id: str, data: dict) -> dict:
+        """Изменение карточки (см. Menu.update_card)."""
+
+        return self._call(self._shard(card_id), "update_card", card_id, data)
+
+    def get_card(self, card_id: str) -> dict:
+        """Данные карточки (см. Menu.get_card)."""
+
+        return self._call(self._shard(card_id), "get_card", card_id)
+
+    def write_off_card(self, card_id: str) -> dict:
+        """
+        Списание карточки без запроса подтверждения.
+
+        Шарды не имеют доступа к консоли, поэтому используется
+        confirm_always.
+        """
+
+        return self._call(
+            self._shard(card_id), "write_off_card", card_id, confirm_always
+        )
+
+    def create_cards(self, rows) -> dict:
+        """
+        Пакетное создание карточек с частичной фиксацией.
+
+        Атомарность всего пакета между шардами не поддерживается:
+        каждый шард создаёт все свои карточки без ошибок.
+
+        Args:
+            rows: Итерируемый набор пар (card_id, data)
+
+        Returns:
+            dict: Отчёт как у Menu.create_cards; номера строк в ошибках
+                  соответствуют исходному пакету
+        """
+
+        batches, positions = self._partition(rows)
+        reports = self._scatter("create_cards", batches, atomic=False)
+
+        return self._merge_reports("created", reports, positions)
+
+    def update_cards(self, rows) -> dict:
+        """Пакетное изменение карточек с частичной фиксацией."""
+
+        batches, positions = self._partition(rows)
+        reports = self._scatter("update_cards", batches, atomic=False)
+
+        return self._merge_reports("updated", reports, positions)
+
+    def _partition(self, rows) -> tuple:
+        """
+        Разбиение пакета пар (card_id, data) по шардам.
+
+        Returns:
+            tuple: Списки строк для каждого шарда и номера этих строк
+                   в исходном пакете
+        """
+
+        batches = [[] for _ in self._connections]
+        positions = [[] for _ in self._connections]
+
+        for index, row in enumerate(rows):
+            shard = self._shard(row[0])
+            batches[shard].append(row)
+            positions[shard].append(index)
+
+        return batches, positions
+
+    @staticmethod
+    def _merge_reports(key: str, reports: list, positions: list) -> dict:
+        """Объединение отчётов шардов в отчёт по исходному пакету."""
+
+        done = []
+        errors = []
+
+        for report, shard_positions in zip(reports, positions):
+            done.extend(report[key])
+            errors.extend(
+                (shard_positions[index], card_id, message)
+                for index, card_id, message in report["errors"]
+            )
+
+        errors.sort()
+
+        return {key: done, "errors": errors}
+
+    def find(self, **criteria) -> list:
+        """Поиск карточек по точному совпадению полей (см. Menu.find)."""
+
+        return [
+            record
+            for records in self._broadcast("find", **criteria)
+            for record in records
+        ]
+
+    def find_range(self, field: str, low=None, high=None) -> list:
+        """Поиск карточек по диапазону (см. Menu.find_range)."""
+
+        parts = self._broadcast("find_range", field, low, high)
+
+        # В записях get_record дата - строка ДД.ММ.ГГГГ, которая не
+        # упорядочена по времени, поэтому сливаются разобранные даты
+        def key(record: dict) -> tuple:
+            value = record[field]
+
+            if field == "receipt_date":
+                value = to_datetime(value)
+
+            return value, record["card_id"]
+
+        return list(heapq.merge(*parts, key=key))
+
+    def iter_cards(
+            self,
+            order_by: str = None,
+            descending: bool = False,
+            page_size: int = 1000,
+            **criteria
+    ):
+        """
+        Ленивый обход карточек всех шардов (см. Menu.iter_cards).
+
+        Шарды читаются страницами по page_size строк; при сортировке
+        строки шардов сливаются в общий порядок, без сортировки идут
+        по шардам подряд.
+
+        Yields:
+            dict: Строки get_raw
+        """
+
+        streams = [
+            self._pages(shard, page_size, order_by, descending, criteria)
+            for shard in range(len(self._connections))
+        ]
+
+        if order_by is None:
+            for stream in streams:
+                yield from stream
+
+            return
+
+        def key(row: dict) -> tuple:
+            value = row[order_by]
+
+            return (value is None, value), row["card_id"]
+
+        yield from heapq.merge(*streams, key=key, reverse=descending)
+
+    def _pages(self, shard, page_size, order_by, descending, criteria):
+        """Постраничное чтение строк одного шарда."""
+
+        cursor = None
+
+        while True:
+            rows, cursor = self._call(
+                shard, "page_cards", page_size, cursor, order_by, descending,
+                **criteria
+            )
+            yield from rows
+
+            if cursor is None:
+                return
+
+    def list_cards(self, sink=None) -> None:
+        """Вывод краткой информации обо всех карточках по порядку ID."""
+
+        emit = (sink or ConsoleSink()).emit
+        count = len(self)
+
+        if not count:
+            emit("list_empty", "\nНет созданных карточек")
+            return
+
+        emit("list_started", "\n" + "=" * 60)
+
+        for row in self.iter_cards(order_by="card_id"):
+            emit(
+                "list_row",
+                f"{row['card_id']}: {row['name']} | "
+                f"{row['status']} | {row['quantity']} шт.",
+                card_id=row["card_id"]
+            )
+
+        emit("list_finished", f"\nВсего карточек: {count}", count=count)
+
+    def close(self) -> None:
+        """Остановка процессов-шардов."""
+
+        for connection in self._connections:
+            try:
+                connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+
+            connection.close()
+
+        for process in self._processes:
+            process.join()
+
+        self._connections = []
+        self._processes = []
@@ -0,0 +1,605 @@
+import collections
+import sqlite3
+import threading
+import weakref
+
+from dates import parse_date
+from product_card import ProductCard
+from stock import StockTotals
+
+
+COLUMNS = (
+    "card_id",
+    "name",
+    "quantity",
+    "status",
+    "supplier",
+    "manufacturer",
+    "cost",
+    "location",
+    "articul",
+    "guarantee",
+    "receipt_date"
+)
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS cards (
+        card_id TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        quantity INTEGER NOT NULL,
+        status TEXT NOT NULL,
+        supplier TEXT NOT NULL,
+        manufacturer TEXT NOT NULL,
+        cost REAL NOT NULL,
+        location TEXT NOT NULL,
+        articul TEXT NOT NULL,
+        guarantee INTEGER NOT NULL,
+        receipt_date TEXT
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS cards_status ON cards (status)",
+    "CREATE INDEX IF NOT EXISTS cards_supplier ON cards (supplier)",
+    "CREATE INDEX IF NOT EXISTS cards_manufacturer ON cards (manufacturer)",
+    "CREATE INDEX IF NOT EXISTS cards_location ON cards (location)",
+    # ID в упорядоченных индексах задаёт порядок карточек с равными
+    # значениями, как в SortedIndex
+    "CREATE INDEX IF NOT EXISTS cards_cost ON cards (cost, card_id)",
+    "CREATE INDEX IF NOT EXISTS cards_quantity ON cards (quantity, card_id)",
+    "CREATE INDEX IF NOT EXISTS cards_receipt_date "
+    "ON cards (receipt_date, card_id)"
+)
+
+# Поля, по которым Menu ищет через индексы таблицы
+FIND_FIELDS = ("supplier", "manufacturer", "location", "status")
+RANGE_FIELDS = ("cost", "quantity", "receipt_date")
+
+# Постоянный текст запросов, чтобы sqlite3 брал готовые
+# подготовленные выражения из своего кэша
+INSERT = (
+    f"INSERT INTO cards ({', '.join(COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(COLUMNS))}) "
+    f"ON CONFLICT (card_id) DO UPDATE SET "
+    + ", ".join(f"{column} = excluded.{column}" for column in COLUMNS[1:])
+)
+UPDATE = {
+    column: f"UPDATE cards SET {column} = ? WHERE card_id = ?"
+    for column in COLUMNS[1:]
+}
+POSITIONS = {column: index for index, column in enumerate(COLUMNS)}
+SELECT = f"SELECT {', '.join(COLUMNS)} FROM cards WHERE card_id = ?"
+SCAN = (
+    f"SELECT rowid, {', '.join(COLUMNS)} FROM cards "
+    f"WHERE rowid > ? ORDER BY rowid LIMIT ? OFFSET ?"
+)
+SELECT_ALL = f"SELECT {', '.join(COLUMNS)} FROM cards "
+EXISTS = "SELECT 1 FROM cards WHERE card_id = ?"
+COUNT = "SELECT COUNT(*) FROM cards"
+TOTAL = (
+    "SELECT COUNT(*), COALESCE(SUM(quantity), 0), TOTAL(quantity * cost) "
+    "FROM cards WHERE status != ?"
+)
+BY_GROUP = {
+    group: (
+        f"SELECT {group}, COUNT(*), SUM(quantity), TOTAL(quantity * cost) "
+        f"FROM cards WHERE status != ? GROUP BY {group}"
+    )
+    for group in StockTotals.GROUPS
+}
+
+
+def _dump_date(value):
+    return value.strftime("%Y-%m-%d") if value else None
+
+
+def _encode(field: str, value):
+    """Значение поля в виде, в котором оно хранится в таблице."""
+
+    return _dump_date(value) if field == "receipt_date" else value
+
+
+def _check(field: str, fields: tuple) -> None:
+    """Проверка, что по полю field есть индекс таблицы."""
+
+    if field not in fields:
+        raise ValueError(f"Поле {field} не индексируется в SqliteStore")
+
+
+def _row(card: ProductCard) -> tuple:
+    """Значения колонок таблицы для карточки."""
+
+    return (
+        card.get_card_id(),
+        card.get_name(),
+        card.get_quantity(),
+        card.get_status(),
+        card.get_supplier(),
+        card.get_manufacturer(),
+        card.get_cost(),
+        card.get_location(),
+        card.get_articul(),
+        card.get_guarantee(),
+        _dump_date(card.get_receipt_date())
+    )
+
+
+class SqliteCard(ProductCard):
+    """
+    Карточка, загруженная из SqliteStore.
+
+    Изменения полей передаются хранилищу, которое записывает их
+    в таблицу и уведомляет владельца хранилища (см. CardView).
+    Хранилище держит не больше одного объекта на ID карточки,
+    поэтому объект, полученный раньше, не расходится с таблицей.
+    """
+
+    def __init__(self, store: 'SqliteStore', row) -> None:
+        """
+        Создание карточки из строки таблицы.
+
+        Args:
+            store: Хранилище карточки
+            row: Значения колонок в порядке COLUMNS
+        """
+
+        self._store = store
+        self._load(row)
+
+    def _load(self, row) -> None:
+        """Запись значений колонок в поля карточки без уведомлений."""
+
+        (
+            self._card_id,
+            self._name,
+            self._quantity,
+            self._status,
+            self._supplier,
+            self._manufacturer,
+            self._cost,
+            self._location,
+            self._articul,
+            self._guarantee,
+            receipt_date
+        ) = row
+        self._receipt_date = parse_date(receipt_date) if receipt_date else None
+        self._view = None
+
+    @property
+    def _observer(self):
+        return self._store
+
+    @_observer.setter
+    def _observer(self, value) -> None:
+        self._store.observer = value
+
+
+class SqliteStore:
+    """
+    Хранилище карточек в файле SQLite для Menu.
+
+    Поддерживает тот же интерфейс словаря, что и Menu.cards, поэтому
+    передаётся в Menu(cards=SqliteStore(path)). Перед таблицей стоит
+    LRU-кэш карточек: часто используемые карточки не читаются с диска
+    повторно. Карточка, вытесненная из кэша, но ещё используемая
+    снаружи, находится по слабой ссылке и возвращается тем же
+    объектом, а не читается с диска второй копией. Записи не
+    выполняются сразу, а копятся и отправляются пачками через
+    executemany в одной транзакции (база в режиме WAL). Перед чтением
+    с диска накопленные записи сбрасываются, поэтому чтение всегда
+    видит последние изменения.
+
+    Хранилище само отвечает на запросы Menu через индексы таблицы
+    (indexed): find, find_range, сортировку страниц по cost, quantity
+    и receipt_date и остатки stock_totals. Поэтому Menu не держит для
+    него индексов в памяти и при открытии не обходит таблицу, если
+    к Menu не подключены TextIndex или AlertEngine. В памяти остаются
+    только кэш и карточки, которые используются снаружи.
+    """
+
+    # Menu не строит индексов для хранилища со своими индексами
+    indexed = True
+
+    def __init__(
+            self,
+            path: str,
+            cache_size: int = 10000,
+            batch_size: int = 1000
+    ) -> None:
+        """
+        Открытие (или создание) базы карточек.
+
+        Args:
+            path: Путь к файлу базы
+            cache_size: Количество карточек в LRU-кэше
+            batch_size: Количество накопленных записей, после которого
+                        они сбрасываются на диск
+        """
+
+        self.observer = None
+        self.cache_size = cache_size
+        self.batch_size = batch_size
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute("PRAGMA synchronous = NORMAL")
+
+        for statement in SCHEMA:
+            self._db.execute(statement)
+
+        self._db.commit()
+        self._lock = threading.RLock()
+        self._cache = collections.OrderedDict()
+        self._live = weakref.WeakValueDictionary()
+        self._inserts = {}
+        self._updates = {}
+        self._count = self._db.execute(COUNT).fetchone()[0]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, card_id: str) -> bool:
+        with self._lock:
+            if card_id in self._cache or card_id in self._inserts:
+                return True
+
+            return self._db.execute(EXISTS, (card_id,)).fetchone() is not None
+
+    def __iter__(self):
+        for card_id, _ in self.items():
+            yield card_id
+
+    def __getitem__(self, card_id: str) -> SqliteCard:
+        """
+        Получение карточки по ID (из кэша или с диска).
+
+        Raises:
+            KeyError: Если карточка с указанным ID не найдена
+        """
+
+        with self._lock:
+            card = self._cache.get(card_id)
+
+            if card is not None:
+                self._cache.move_to_end(card_id)
+                return card
+
+            card = self._live.get(card_id)
+
+            if card is None:
+                self._flush_pending()
+                row = self._db.execute(SELECT, (card_id,)).fetchone()
+
+                if row is None:
+                    raise KeyError(card_id)
+
+                card = self._card(row)
+
+            return self._remember(card)
+
+    def __setitem__(self, card_id: str, card: ProductCard) -> None:
+        """
+        Сохранение карточки (новой или с заменой существующей).
+
+        Args:
+            card_id: Идентификатор карточки
+            card: Карточка, данные которой копируются в хранилище
+        """
+
+        with self._lock:
+            if card_id not in self:
+                self._count += 1
+
+            row = _row(card)
+            self._inserts[card_id] = list(row)
+            self._updates.pop(card_id, None)
+            live = self._live.get(card_id)
+
+            if live is None:
+                live = self._card(row)
+            else:
+                live._load(row)
+
+            self._remember(live)
+
+            if self._pending() >= self.batch_size:
+                self._flush_pending()
+
+    def _card(self, row) -> SqliteCard:
+        """
+        Объект карточки для строки таблицы: уже используемый, если он
+        есть, иначе новый.
+        """
+
+        card = self._live.get(row[0])
+
+        if card is None:
+            card = SqliteCard(self, row)
+            self._live[row[0]] = card
+
+        return card
+
+    def _remember(self, card: SqliteCard) -> SqliteCard:
+        """Добавление карточки в кэш с вытеснением самой старой."""
+
+        card_id = card.get_card_id()
+        self._cache[card_id] = card
+        self._cache.move_to_end(card_id)
+
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+        return card
+
+    def _pending(self) -> int:
+        """Количество карточек с накопленными записями."""
+
+        return len(self._inserts) + len(self._updates)
+
+    def card_changed(self, card: ProductCard, field: str, old, new) -> None:
+        """
+        Запоминание изменения поля для записи на диск и передача
+        уведомления владельцу хранилища.
+        """
+
+        card_id = card.get_card_id()
+        value = _encode(field, new)
+
+        with self._lock:
+            row = self._inserts.get(card_id)
+
+            if row is not None:
+                row[POSITIONS[field]] = value
+            else:
+                self._updates.setdefault(card_id, {})[field] = value
+
+            if self._pending() >= self.batch_size:
+                self._flush_pending()
+
+        if self.observer is not None:
+            self.observer.card_changed(card, field, old, new)
+
+    def flush(self) -> None:
+        """Запись накопленных изменений на диск одной транзакцией."""
+
+        with self._lock:
+            self._flush_pending()
+
+    def _flush_pending(self) -> None:
+        if not self._inserts and not self._updates:
+            return
+
+        by_field = {}
+
+        for card_id, changes in self._updates.items():
+            for field, value in changes.items():
+                by_field.setdefault(field, []).append((value, card_id))
+
+        with self._db:
+            self._db.executemany(INSERT, self._inserts.values())
+
+            for field, rows in by_field.items():
+                self._db.executemany(UPDATE[field], rows)
+
+        self._inserts = {}
+        self._updates = {}
+
+    def keys(self):
+        return iter(self)
+
+    def values(self, start: int = 0):
+        for _, card in self.items(start=start):
+            yield card
+
+    def items(self, chunk: int = 1000, start: int = 0):
+        """
+        Пары (ID, карточка) в порядке добавления.
+
+        Строки читаются порциями по chunk, поэтому обход не держит
+        открытым курсор базы и не мешает изменениям во время обхода.
+
+        Args:
+            chunk: Количество строк в порции
+            start: Количество пропускаемых первых карточек
+        """
+
+        last = 0
+
+        while True:
+            with self._lock:
+                self._flush_pending()
+                rows = self._db.execute(
+                    SCAN, (last, chunk, start)
+                ).fetchall()
+                cards = []
+                start = 0
+
+                for rowid, *row in rows:
+                    cards.append((row[0], self._card(row)))
+                    last = rowid
+
+            yield from cards
+
+            if len(rows) < chunk:
+                return
+
+    def _select(self, where: str, parameters) -> list:
+        """Карточки строк таблицы, подходящих под условие where."""
+
+        with self._lock:
+            self._flush_pending()
+            rows = self._db.execute(SELECT_ALL + where, parameters)
+
+            return [self._card(row) for row in rows]
+
+    def find(self, criteria: dict) -> list:
+        """
+        Карточки с указанными значениями полей одним запросом.
+
+        Args:
+            criteria: Значения полей из FIND_FIELDS (см. Menu.find)
+
+        Returns:
+            list: Карточки SqliteCard, подходящие под все условия
+
+        Raises:
+            ValueError: Если по одному из полей нет индекса
+        """
+
+        for field in criteria:
+            _check(field, FIND_FIELDS)
+
+        conditions = " AND ".join(f"{field} = ?" for field in criteria)
+
+        return self._select(f"WHERE {conditions}", tuple(criteria.values()))
+
+    def find_range(self, field: str, low=None, high=None) -> list:
+        """
+        Карточки со значением поля в диапазоне [low, high].
+
+        Args:
+            field: Поле из RANGE_FIELDS (см. Menu.find_range)
+            low: Нижняя граница (включительно), None - без границы
+            high: Верхняя граница (включительно), None - без границы.
+                  Для receipt_date границы - datetime
+
+        Returns:
+            list: Карточки SqliteCard в порядке возрастания значения
+                  поля (при равных значениях - ID)
+
+        Raises:
+            ValueError: Если по полю нет индекса
+        """
+
+        _check(field, RANGE_FIELDS)
+        conditions = [f"{field} IS NOT NULL"]
+        parameters = []
+
+        if low is not None:
+            conditions.append(f"{field} >= ?")
+            parameters.append(_encode(field, low))
+
+        if high is not None:
+            conditions.append(f"{field} <= ?")
+            parameters.append(_encode(field, high))
+
+        return self._select(
+            f"WHERE {' AND '.join(conditions)} ORDER BY {field}, card_id",
+            parameters
+        )
+
+    def range_count(self, field: str) -> int:
+        """Количество карточек с непустым значением поля field."""
+
+        _check(field, RANGE_FIELDS)
+
+        with self._lock:
+            self._flush_pending()
+
+            return self._db.execute(
+                f"SELECT COUNT(*) FROM cards WHERE {field} IS NOT NULL"
+            ).fetchone()[0]
+
+    def range_items(
+            self,
+            field: str,
+            after=None,
+            descending: bool = False,
+            chunk: int = 1000
+    ):
+        """
+        Обход пар (значение, ID карточки) по порядку значений поля
+        (см. SortedIndex.items).
+
+        Пары читаются порциями по chunk, и каждая порция ищется по
+        индексу таблицы от последней отданной пары, поэтому обход не
+        держит открытым курсор базы.
+
+        Args:
+            field: Поле из RANGE_FIELDS
+            after: Пара (значение, ID), после которой начинается обход
+            descending: Обход в порядке убывания
+            chunk: Количество пар в порции
+
+        Yields:
+            tuple: Пары (значение, ID карточки)
+
+        Raises:
+            ValueError: Если по полю нет индекса
+        """
+
+        _check(field, RANGE_FIELDS)
+        direction = "DESC" if descending else "ASC"
+        sign = "<" if descending else ">"
+        query = (
+            f"SELECT {field}, card_id FROM cards "
+            f"WHERE {field} IS NOT NULL{{}} "
+            f"ORDER BY {field} {direction}, card_id {direction} LIMIT ?"
+        )
+        first = query.format("")
+        following = query.format(f" AND ({field}, card_id) {sign} (?, ?)")
+        decode = parse_date if field == "receipt_date" else None
+
+        if after is not None:
+            after = (_encode(field, after[0]), after[1])
+
+        while True:
+            with self._lock:
+                self._flush_pending()
+
+                if after is None:
+                    rows = self._db.execute(first, (chunk,)).fetchall()
+                else:
+                    rows = self._db.execute(
+                        following, (*after, chunk)
+                    ).fetchall()
+
+            if decode is None:
+                yield from rows
+            else:
+                for value, card_id in rows:
+                    yield decode(value), card_id
+
+            if len(rows) < chunk:
+                return
+
+            after = rows[-1]
+
+    def totals(self, group: str = None) -> dict:
+        """
+        Остатки и их стоимость, посчитанные запросом к таблице
+        (см. StockTotals). Списанные карточки в остатки не входят.
+
+        Args:
+            group: None - по всему складу, иначе поле из
+                   StockTotals.GROUPS
+
+        Returns:
+            dict: {"cards", "units", "value"} для всего склада или
+                  {значение поля: {"cards", "units", "value"}}
+
+        Raises:
+            ValueError: При неизвестной группировке
+        """
+
+        if group is not None and group not in BY_GROUP:
+            raise ValueError(f"Группировка по полю {group} не поддерживается")
+
+        with self._lock:
+            self._flush_pending()
+
+            if group is None:
+                return StockTotals._report(self._db.execute(
+                    TOTAL, (ProductCard.STATUS_WRITTEN_OFF,)
+                ).fetchone())
+
+            rows = self._db.execute(
+                BY_GROUP[group], (ProductCard.STATUS_WRITTEN_OFF,)
+            )
+
+            return {key: StockTotals._report(bucket) for key, *bucket in rows}
+
+    def close(self) -> None:
+        """Запись накопленных изменений и закрытие базы."""
+
+        with self._lock:
+            self._flush_pending()
+            self._db.close()
@@ -0,0 +1,234 @@
+import datetime
+import itertools
+import operator
+
+from product_card import ProductCard
+
+
+MOVEMENT_KINDS = ("receipt", "issue", "adjustment")
+
+
+class StockLedger:
+    """
+    Журнал движения товара: поступления, расходы и корректировки.
+
+    Запись - словарь {"card_id", "kind", "quantity", "balance", "note",
+    "time"}, где quantity - изменение остатка со знаком, а balance -
+    остаток после движения. Журнал хранится в памяти.
+    """
+
+    def __init__(self) -> None:
+        """Создание пустого журнала."""
+
+        self._entries = {}
+        self.count = 0
+
+    def record(
+            self,
+            card_id: str,
+            kind: str,
+            quantity: int,
+            balance: int,
+            note: str = ""
+    ) -> dict:
+        """
+        Добавление записи о движении товара.
+
+        Args:
+            card_id: ID карточки
+            kind: Вид движения: "receipt", "issue" или "adjustment"
+            quantity: Изменение остатка (отрицательное для расхода)
+            balance: Остаток после движения
+            note: Комментарий (номер накладной и т.п.)
+
+        Returns:
+            dict: Добавленная запись
+        """
+
+        entry = {
+            "card_id": card_id,
+            "kind": kind,
+            "quantity": quantity,
+            "balance": balance,
+            "note": note,
+            "time": datetime.datetime.now()
+        }
+        self._entries.setdefault(card_id, []).append(entry)
+        self.count += 1
+
+        return entry
+
+    def entries(self, card_id: str) -> list:
+        """
+        Движения товара по карточке в порядке записи.
+
+        Returns:
+            list: Копии записей (пустой список, если движений не было)
+        """
+
+        return [dict(entry) for entry in self._entries.get(card_id, ())]
+
+
+class StockTotals:
+    """
+    Остатки и их стоимость, поддерживаемые при каждом изменении карточки.
+
+    Для всего склада и для каждого местоположения, поставщика и
+    производителя хранятся количество карточек, сумма единиц товара
+    и суммарная стоимость (стоимость единицы * количество). Списанные
+    карточки в остатки не входят.
+    """
+
+    GROUPS = ("location", "supplier", "manufacturer")
+    FIELDS = ("quantity", "cost", "status") + GROUPS
+
+    def __init__(self) -> None:
+        """Инициализация нулевых остатков."""
+
+        self._total = [0, 0, 0.0]
+        self._groups = {group: {} for group in self.GROUPS}
+
+    @staticmethod
+    def values(card: ProductCard) -> dict:
+        """Поля карточки, от которых зависят остатки."""
+
+        return {
+            "quantity": card.get_quantity(),
+            "cost": card.get_cost(),
+            "status": card.get_status(),
+            "location": card.get_location(),
+            "supplier": card.get_supplier(),
+            "manufacturer": card.get_manufacturer()
+        }
+
+    def add(self, values: dict, sign: int = 1) -> None:
+        """
+        Учёт карточки в остатках (sign=-1 - исключение из остатков).
+
+        Args:
+            values: Поля карточки (см. values)
+            sign: 1 - добавить, -1 - вычесть
+        """
+
+        if values["status"] == ProductCard.STATUS_WRITTEN_OFF:
+            return
+
+        units = sign * values["quantity"]
+        value = units * values["cost"]
+        self._bump(self._total, sign, units, value)
+
+        for group, buckets in self._groups.items():
+            key = values[group]
+            bucket = buckets.get(key)
+
+            if bucket is None:
+                bucket = buckets[key] = [0, 0, 0.0]
+
+            self._bump(bucket, sign, units, value)
+
+            if not bucket[0]:
+                del buckets[key]
+
+    def add_many(self, columns: dict) -> None:
+        """
+        Учёт сразу нескольких карточек.
+
+        Итоги считаются по колонкам: стоимости - одним проходом map,
+        сумма по складу - через sum, и только группы обходятся
+        построчно.
+
+        Args:
+            columns: Списки значений полей FIELDS, по одному элементу
+                     на карточку, например {"quantity": [10, 5], ...}
+        """
+
+        written_off = ProductCard.STATUS_WRITTEN_OFF
+        live = [status != written_off for status in columns["status"]]
+        quantities = list(itertools.compress(columns["quantity"], live))
+        values = list(map(
+            operator.mul,
+            quantities,
+            itertools.compress(columns["cost"], live)
+        ))
+
+        if not quantities:
+            return
+
+        self._bump(self._total, len(quantities), sum(quantities), sum(values))
+
+        for group, buckets in self._groups.items():
+            keys = itertools.compress(columns[group], live)
+
+            for key, units, value in zip(keys, quantities, values):
+                bucket = buckets.get(key)
+
+                if bucket is None:
+                    bucket = buckets[key] = [0, 0, 0.0]
+
+                bucket[0] += 1
+                bucket[1] += units
+                bucket[2] += value
+
+    @staticmethod
+    def _bump(bucket: list, cards: int, units: int, value: float) -> None:
+        bucket[0] += cards
+        bucket[1] += units
+        # Без карточек сумма сбрасывается, чтобы не копить погрешность
+        bucket[2] = bucket[2] + value if bucket[0] else 0.0
+
+    def remove(self, values: dict) -> None:
+        """Исключение карточки из остатков."""
+
+        self.add(values, -1)
+
+    def move(self, card: ProductCard, field: str, old) -> None:
+        """
+        Пересчёт остатков после изменения поля карточки.
+
+        Args:
+            card: Карточка с уже изменённым полем
+            field: Имя изменённого поля
+            old: Прежнее значение поля
+        """
+
+        values = self.values(card)
+        self.remove(dict(values, **{field: old}))
+        self.add(values)
+
+    def total(self) -> dict:
+        """
+        Остатки по всему складу.
+
+        Returns:
+            dict: {"cards", "units", "value"}
+        """
+
+        return self._report(self._total)
+
+    def by(self, group: str) -> dict:
+        """
+        Остатки в разрезе местоположений, поставщиков или производителей.
+
+        Args:
+            group: "location", "supplier" или "manufacturer"
+
+        Returns:
+            dict: {значение поля: {"cards", "units", "value"}}
+
+        Raises:
+            ValueError: При неизвестной группировке
+        """
+
+        if group not in self._groups:
+            raise ValueError(f"Группировка по полю {group} не поддерживается")
+
+        return {
+            key: self._report(bucket)
+            for key, bucket in self._groups[group].items()
+        }
+
+    @staticmethod
+    def _report(bucket: list) -> dict:
+        cards, units, value = bucket
+
+        return {"cards": cards, "units": units, "value": round(value, 2)}
@@ -0,0 +1,48 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from events import NullSink  # noqa: E402
+from menu import Menu  # noqa: E402
+
+
+def make_card_data(**fields) -> dict:
+    """Корректные данные карточки с заменой указанных полей."""
+
+    data = {
+        "name": "Болт М8",
+        "quantity": 10,
+        "supplier": "Поставщик",
+        "manufacturer": "Завод",
+        "cost": 2.5,
+        "location": "A-1",
+        "articul": "B-8",
+        "guarantee": 12,
+        "receipt_date": "01.02.2024"
+    }
+    data.update(fields)
+
+    return data
+
+
+@pytest.fixture
+def card_data():
+    """Фабрика корректных данных карточки: card_data(quantity=5)."""
+
+    return make_card_data
+
+
+@pytest.fixture
+def menu(card_data) -> Menu:
+    """Menu с тремя карточками C1-C3 без вывода сообщений."""
+
+    menu = Menu(sink=NullSink())
+    menu.create_cards(
+        (f"C{number}", card_data(quantity=number * 10))
+        for number in range(1, 4)
+    )
+
+    return menu
@@ -0,0 +1,93 @@
+import datetime
+import random
+
+import pytest
+
+from indexes import SortedIndex
+
+
+@pytest.fixture
+def index(monkeypatch) -> SortedIndex:
+    """Индекс с маленькими блоками, чтобы блоки делились и исчезали."""
+
+    monkeypatch.setattr(SortedIndex, "BLOCK_SIZE", 4)
+
+    return SortedIndex("q")
+
+
+def test_sorted_index_matches_sorted_list(index):
+    rnd = random.Random(1)
+    expected = set()
+
+    for step in range(3000):
+        card_id = f"C{rnd.randrange(300)}"
+        key = rnd.randrange(50)
+
+        if rnd.random() < 0.45 and expected:
+            old = rnd.choice(sorted(expected))
+            index.remove(*old)
+            expected.discard(old)
+        elif all(pair[1] != card_id for pair in expected):
+            index.add(key, card_id)
+            expected.add((key, card_id))
+
+        if step % 100 == 0:
+            pairs = sorted(expected)
+            low, high = sorted((rnd.randrange(50), rnd.randrange(50)))
+
+            assert len(index) == len(pairs)
+            assert list(index.items()) == pairs
+            assert list(index.items(descending=True)) == pairs[::-1]
+            assert list(index.range(low, high)) == [
+                card_id for key, card_id in pairs if low <= key <= high
+            ]
+
+
+def test_items_continue_after_cursor(index):
+    index.add_many(
+        [key % 7 for key in range(40)],
+        [f"C{key:02}" for key in range(40)]
+    )
+    pairs = list(index.items())
+
+    for position, pair in enumerate(pairs):
+        assert list(index.items(pair)) == pairs[position + 1:]
+        assert list(index.items(pair, descending=True)) == (
+            pairs[:position][::-1]
+        )
+
+
+def test_items_survive_changes_between_pages(index):
+    index.add_many(list(range(20)), [f"C{key:02}" for key in range(20)])
+    walk = index.items()
+    seen = [next(walk) for _ in range(6)]
+
+    # Блоки делятся и исчезают между чтениями, но обход продолжается
+    for key in range(6, 12):
+        index.remove(key, f"C{key:02}")
+
+    for key in range(100, 110):
+        index.add(key, f"N{key}")
+
+    seen += list(walk)
+
+    assert [card_id for _, card_id in seen] == (
+        [f"C{key:02}" for key in range(6)]
+        + [f"C{key:02}" for key in range(12, 20)]
+        + [f"N{key}" for key in range(100, 110)]
+    )
+
+
+def test_dates_are_stored_as_ordinals():
+    index = SortedIndex(
+        "l", datetime.datetime.toordinal, datetime.datetime.fromordinal
+    )
+    first = datetime.datetime(2024, 2, 1)
+    second = datetime.datetime(2024, 3, 1)
+    index.add(second, "B")
+    index.add(first, "A")
+    index.add(None, "C")
+
+    assert list(index.items()) == [(first, "A"), (second, "B")]
+    assert list(index.range(second)) == ["B"]
+    assert len(index) == 2
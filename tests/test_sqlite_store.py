@@ -0,0 +1,200 @@
+import pytest
+
+from events import NullSink
+from menu import Menu
+from product_card import ProductCard
+from sqlite_store import SqliteStore
+from stock import StockTotals
+
+
+@pytest.fixture
+def store_menu(tmp_path, card_data):
+    """Menu на SqliteStore с кэшем на две карточки и карточками C0-C9."""
+
+    menu = Menu(
+        cards=SqliteStore(str(tmp_path / "cards.db"), cache_size=2),
+        sink=NullSink()
+    )
+    menu.create_cards(
+        (f"C{number}", card_data(quantity=5)) for number in range(10)
+    )
+    yield menu
+    menu.close()
+
+
+def test_card_evicted_from_cache_stays_one_object(store_menu):
+    card = store_menu.get_card_object("C0")
+
+    for number in range(1, 10):
+        store_menu.get_card(f"C{number}")
+
+    store_menu.update_card("C0", {"quantity": 50})
+    card.set_quantity(7)
+
+    assert card is store_menu.get_card_object("C0")
+    assert card.get_quantity() == 7
+    assert [
+        found.get_card_id() for found in store_menu.find_range("quantity")
+    ].count("C0") == 1
+    assert store_menu.stock_totals()["units"] == 52
+
+
+def test_scan_returns_cards_in_use(store_menu):
+    card = store_menu.get_card_object("C0")
+
+    for number in range(1, 10):
+        store_menu.get_card(f"C{number}")
+
+    cards = dict(store_menu.cards.items())
+
+    assert cards["C0"] is card
+
+
+def test_changes_of_old_object_reach_database(tmp_path, store_menu):
+    card = store_menu.get_card_object("C0")
+
+    for number in range(1, 10):
+        store_menu.get_card(f"C{number}")
+
+    store_menu.update_card("C0", {"cost": 4.0})
+    card.set_cost(9.0)
+
+    assert store_menu.get_card_object("C0").get_cost() == 9.0
+    store_menu.close()
+
+    reopened = Menu(
+        cards=SqliteStore(str(tmp_path / "cards.db")), sink=NullSink()
+    )
+
+    assert reopened.get_card_object("C0").get_cost() == 9.0
+    reopened.close()
+
+
+@pytest.fixture
+def twin_menus(tmp_path, card_data):
+    """Одинаковые карточки в Menu на SqliteStore и на обычном dict."""
+
+    rows = [
+        (
+            f"T{number}",
+            card_data(
+                quantity=number % 4,
+                cost=float(number % 3),
+                supplier=f"Поставщик {number % 2}",
+                location=f"A-{number % 3}",
+                receipt_date=None if number % 5 == 0
+                else f"{number % 28 + 1:02}.02.2024"
+            )
+        )
+        for number in range(30)
+    ]
+    stored = Menu(
+        cards=SqliteStore(str(tmp_path / "cards.db"), batch_size=7),
+        sink=NullSink()
+    )
+    plain = Menu(sink=NullSink())
+
+    for menu in (stored, plain):
+        menu.create_cards(rows)
+        menu.write_off_card("T3", confirm=lambda prompt: True)
+        menu.update_card("T4", {"cost": 10.0, "quantity": 1})
+
+    yield stored, plain
+    stored.close()
+
+
+def card_ids(cards) -> list:
+    return [card.get_card_id() for card in cards]
+
+
+def test_store_answers_queries_like_memory_indexes(twin_menus):
+    stored, plain = twin_menus
+
+    assert stored._indexes == {} and stored.totals is None
+
+    for criteria in (
+            {"supplier": "Поставщик 1"},
+            {"supplier": "Поставщик 0", "location": "A-2"},
+            {"status": ProductCard.STATUS_WRITTEN_OFF},
+            {"location": "нет"}
+    ):
+        assert sorted(card_ids(stored.find(**criteria))) == sorted(
+            card_ids(plain.find(**criteria))
+        )
+
+    for field, low, high in (
+            ("cost", 1.0, 2.0),
+            ("quantity", None, 1),
+            ("receipt_date", "05.02.2024", None),
+            ("receipt_date", None, None)
+    ):
+        assert card_ids(stored.find_range(field, low, high)) == card_ids(
+            plain.find_range(field, low, high)
+        )
+
+    assert stored.stock_totals() == plain.stock_totals()
+
+    for group in StockTotals.GROUPS:
+        assert stored.stock_totals(group) == plain.stock_totals(group)
+
+    with pytest.raises(ValueError):
+        stored.stock_totals("name")
+
+
+@pytest.mark.parametrize("order_by, descending", [
+    (None, False),
+    ("cost", True),
+    ("quantity", False),
+    ("receipt_date", False),
+    ("receipt_date", True)
+])
+def test_store_pages_like_memory_indexes(twin_menus, order_by, descending):
+    stored, plain = twin_menus
+    pages = []
+
+    for menu in (stored, plain):
+        rows = []
+        cursor = None
+
+        while True:
+            page, cursor = menu.page_cards(
+                4, cursor, order_by, descending, supplier="Поставщик 1"
+            )
+            rows.extend(row["card_id"] for row in page)
+
+            if cursor is None:
+                break
+
+        pages.append(rows)
+
+    assert pages[0] == pages[1]
+    assert len(pages[0]) == 15
+
+
+def test_reopened_store_needs_no_scan(tmp_path, store_menu):
+    store_menu.close()
+    store = SqliteStore(str(tmp_path / "cards.db"))
+    menu = Menu(cards=store, sink=NullSink())
+
+    assert store._live == {}
+    assert menu.stock_totals()["cards"] == 10
+    assert card_ids(menu.find_range("quantity")) == [
+        f"C{number}" for number in range(10)
+    ]
+
+    page, cursor = menu.page_cards(4, 4)
+
+    assert [row["card_id"] for row in page] == ["C4", "C5", "C6", "C7"]
+    assert cursor == 8
+    assert [card_id for card_id, _ in store.items(chunk=3, start=4)] == [
+        f"C{number}" for number in range(4, 10)
+    ]
+
+    with menu.snapshot() as view:
+        menu.update_card("C0", {"quantity": 1})
+
+        rows = list(view.iter_cards())
+
+        assert [row["quantity"] for row in rows] == [5] * 10
+
+    menu.close()
@@ -0,0 +1,105 @@
+import threading
+
+from events import NullSink
+from menu import Menu
+
+THREADS = 8
+
+
+def run_together(target, count: int = THREADS) -> list:
+    """Одновременный запуск target(номер) в count потоках."""
+
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def run(number: int) -> None:
+        barrier.wait()
+
+        try:
+            results[number] = target(number)
+        except ValueError as e:
+            results[number] = e
+
+    threads = [
+        threading.Thread(target=run, args=(number,))
+        for number in range(count)
+    ]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    return results
+
+
+def check_consistent(menu: Menu) -> None:
+    """Индексы, порядок и остатки соответствуют карточкам."""
+
+    assert len(menu._order) == len(set(menu._order)) == len(menu.cards)
+    assert menu.stock_totals()["cards"] == len(menu.cards)
+    assert len(menu.find(supplier="Поставщик")) == len(menu.cards)
+    assert len(menu.find_range("quantity")) == len(menu.cards)
+
+
+def test_duplicate_create_card_race(card_data):
+    menu = Menu(sink=NullSink(), thread_safe=True)
+
+    for _ in range(20):
+        card_id = f"D{len(menu.cards)}"
+        results = run_together(
+            lambda number: menu.create_card(card_id, card_data())
+        )
+        errors = [
+            result for result in results if isinstance(result, ValueError)
+        ]
+
+        assert len(errors) == THREADS - 1
+        assert all("уже существует" in str(error) for error in errors)
+
+    check_consistent(menu)
+
+
+def test_duplicate_create_cards_race(card_data):
+    menu = Menu(sink=NullSink(), thread_safe=True)
+
+    # Пакеты потоков пересекаются: ID i входит в пакеты i и i + 1
+    def create(number: int) -> dict:
+        rows = [
+            (f"B{index}", card_data())
+            for index in (number, number + 1)
+        ]
+
+        return menu.create_cards(rows, atomic=False)
+
+    reports = run_together(create)
+    created = [
+        card_id for report in reports for card_id in report["created"]
+    ]
+
+    assert sorted(created) == sorted(
+        f"B{index}" for index in range(THREADS + 1)
+    )
+    check_consistent(menu)
+
+
+def test_create_card_races_batch_create(card_data):
+    menu = Menu(sink=NullSink(), thread_safe=True)
+
+    def create(number: int):
+        if number % 2:
+            return menu.create_card("X", card_data())
+
+        return menu.create_cards([("X", card_data())])
+
+    results = run_together(create)
+    created = sum(
+        1 for result in results
+        if result is not None and not isinstance(result, ValueError)
+        and (not isinstance(result, dict) or result["created"])
+    )
+
+    assert created == 1
+    assert list(menu.cards) == ["X"]
+    check_consistent(menu)
@@ -0,0 +1,82 @@
+import pytest
+
+from product_card import ProductCard
+
+
+def test_commit_applies_all_operations(menu, card_data):
+    with menu.transaction() as tx:
+        tx.create_card("C4", card_data())
+        tx.update_card("C1", {"cost": 3.0})
+        tx.issue_stock("C2", 5)
+        tx.write_off_card("C3")
+
+    assert menu.get_card("C4")["ID"] == "C4"
+    assert menu.get_card_object("C1").get_cost() == 3.0
+    assert menu.get_card_object("C2").get_quantity() == 15
+    assert menu.get_card("C3")["Состояние"] == ProductCard.STATUS_WRITTEN_OFF
+
+
+def test_invalid_data_rejected_when_staged(menu):
+    tx = menu.transaction()
+    tx.update_card("C1", {"cost": 3.0})
+
+    with pytest.raises(ValueError, match="отрицательн"):
+        tx.update_card("C2", {"quantity": -1})
+
+    # Ошибочная операция не накоплена, остальные остались
+    assert len(tx) == 1
+    tx.commit()
+    assert menu.get_card_object("C1").get_cost() == 3.0
+    assert menu.get_card_object("C2").get_quantity() == 20
+
+
+def test_commit_rolls_back_when_check_fails(menu, card_data):
+    tx = menu.transaction()
+    tx.create_card("C4", card_data())
+    tx.update_card("C1", {"name": "Гайка"})
+    tx.issue_stock("C2", 15)
+
+    # До фиксации остаток меняется вне транзакции, и расход невозможен
+    menu.issue_stock("C2", 10)
+
+    with pytest.raises(ValueError):
+        tx.commit()
+
+    assert not tx.active
+    assert "C4" not in menu.cards
+    assert menu.get_card("C1")["Наименование"] == "Болт М8"
+    assert menu.get_card_object("C2").get_quantity() == 10
+    assert menu.find_range("quantity", 5, 15) == [
+        menu.cards["C1"], menu.cards["C2"]
+    ]
+
+
+def test_commit_fails_if_card_written_off_meanwhile(menu):
+    tx = menu.transaction()
+    tx.update_card("C1", {"cost": 3.0})
+    tx.update_card("C2", {"cost": 4.0})
+    menu.write_off_card("C2", confirm=lambda card: True)
+
+    with pytest.raises(ValueError, match="списанную"):
+        tx.commit()
+
+    assert menu.get_card_object("C1").get_cost() == 2.5
+
+
+def test_exception_in_block_rolls_back(menu):
+    with pytest.raises(RuntimeError):
+        with menu.transaction() as tx:
+            tx.update_card("C1", {"cost": 3.0})
+            raise RuntimeError("сбой")
+
+    assert not tx.active
+    assert menu.get_card_object("C1").get_cost() == 2.5
+
+
+def test_staged_write_off_visible_in_transaction(menu):
+    tx = menu.transaction()
+    tx.get_card("C1")
+    tx.write_off_card("C1")
+
+    assert tx.get_card("C1")["Состояние"] == ProductCard.STATUS_WRITTEN_OFF
+    assert menu.get_card("C1")["Состояние"] == ProductCard.STATUS_IN_STOCK
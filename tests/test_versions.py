@@ -0,0 +1,139 @@
+import threading
+import time
+
+import pytest
+
+from events import NullSink
+from menu import Menu
+from product_card import ProductCard
+
+
+def test_snapshot_keeps_values_after_update(menu):
+    snapshot = menu.snapshot()
+    menu.update_card("C1", {"name": "Гайка", "quantity": 99})
+    menu.get_card_object("C1").set_cost(7.0)
+
+    assert snapshot.get_raw("C1")["name"] == "Болт М8"
+    assert snapshot.get_raw("C1")["quantity"] == 10
+    assert snapshot.get_raw("C1")["cost"] == 2.5
+    assert menu.get_card("C1")["Наименование"] == "Гайка"
+
+
+def test_snapshot_hides_cards_created_after_it(menu, card_data):
+    snapshot = menu.snapshot()
+    menu.create_card("C4", card_data())
+    menu.create_cards([("C5", card_data())])
+
+    assert len(snapshot) == 3
+    assert "C4" not in snapshot
+    assert "C5" not in snapshot
+    assert [raw["card_id"] for raw in snapshot.iter_cards()] == [
+        "C1", "C2", "C3"
+    ]
+
+    with pytest.raises(ValueError):
+        snapshot.get_card("C4")
+
+
+def test_snapshot_keeps_status_after_write_off(menu):
+    snapshot = menu.snapshot()
+    menu.write_off_card("C2", confirm=lambda card: True)
+    menu.write_off_cards(["C3"])
+
+    assert snapshot.get_raw("C2")["status"] == ProductCard.STATUS_IN_STOCK
+    assert snapshot.get_raw("C3")["status"] == ProductCard.STATUS_IN_STOCK
+    assert menu.get_card("C2")["Состояние"] == ProductCard.STATUS_WRITTEN_OFF
+
+
+def test_snapshots_see_their_own_versions(menu):
+    first = menu.snapshot()
+    menu.update_card("C1", {"quantity": 11})
+    second = menu.snapshot()
+    menu.update_card("C1", {"quantity": 12})
+
+    assert first.get_raw("C1")["quantity"] == 10
+    assert second.get_raw("C1")["quantity"] == 11
+    assert menu.get_card("C1")["Количество"] == 12
+
+
+def test_history_pruned_after_out_of_order_close(menu):
+    first = menu.snapshot()
+    menu.update_card("C1", {"quantity": 11})
+    second = menu.snapshot()
+    menu.update_card("C1", {"quantity": 12})
+    third = menu.snapshot()
+    menu.update_card("C1", {"quantity": 13})
+
+    second.close()
+    assert third.get_raw("C1")["quantity"] == 12
+    assert first.get_raw("C1")["quantity"] == 10
+
+    first.close()
+    assert third.get_raw("C1")["quantity"] == 12
+
+    # Следующее изменение отбрасывает версии, не нужные живому снимку
+    menu.update_card("C1", {"quantity": 14})
+    assert all(
+        epoch > third.epoch for epoch, _, _ in menu._history["C1"]
+    )
+    assert third.get_raw("C1")["quantity"] == 12
+
+    third.close()
+    assert menu._history == {}
+    assert menu._born == {}
+    assert menu._oldest is None
+
+    with pytest.raises(ValueError):
+        third.get_raw("C1")
+
+
+def test_released_snapshot_stops_recording(menu):
+    with menu.snapshot():
+        menu.update_card("C1", {"quantity": 11})
+        assert menu._history
+
+    menu.update_card("C1", {"quantity": 12})
+
+    assert menu._history == {}
+
+
+def test_snapshot_consistent_under_concurrent_writes(card_data):
+    menu = Menu(sink=NullSink(), thread_safe=True, lock_stripes=4)
+    menu.create_cards(
+        (f"C{number}", card_data(quantity=0)) for number in range(50)
+    )
+    snapshot = menu.snapshot()
+    stop = threading.Event()
+    steps = [0]
+    errors = []
+
+    def write() -> None:
+        try:
+            while not stop.is_set():
+                steps[0] += 1
+                step = steps[0]
+                menu.update_card(f"C{step % 50}", {"quantity": step})
+                menu.create_card(f"N{step}", card_data())
+        except Exception as e:
+            errors.append(e)
+
+    writer = threading.Thread(target=write)
+    writer.start()
+
+    deadline = time.monotonic() + 30
+
+    try:
+        # Чтения идут, пока писатель не сделает заметное число изменений;
+        # упавший или зависший писатель завершает тест ошибкой
+        while steps[0] < 1000:
+            assert writer.is_alive(), errors
+            assert time.monotonic() < deadline, steps[0]
+            rows = list(snapshot.iter_cards())
+            assert len(rows) == 50
+            assert all(row["quantity"] == 0 for row in rows)
+    finally:
+        stop.set()
+        writer.join()
+        snapshot.close()
+
+    assert not errors
@@ -0,0 +1,419 @@
+import bisect
+import re
+
+
+WORD = re.compile(r"\w+")
+
+
+def words(text: str) -> set:
+    """
+    Слова текста для поиска: в нижнем регистре, без знаков препинания.
+
+    Для текста без пробелов, состоящего из нескольких частей, добавляется
+    и слитное написание (артикул "A-509532" находится и по "a509532").
+    """
+
+    parts = WORD.findall(text.casefold())
+    result = set(parts)
+
+    if len(parts) > 1 and len(text.split()) == 1:
+        result.add("".join(parts))
+
+    return result
+
+
+def text_words(texts) -> set:
+    """Слова всех текстов карточки (пустые тексты пропускаются)."""
+
+    result = set()
+
+    for text in texts:
+        if text:
+            result |= words(text)
+
+    return result
+
+
+def _has_all(card_words: set, prefixes: list) -> bool:
+    """Есть ли среди card_words слово, начинающееся с каждого из prefixes."""
+
+    return all(
+        any(word.startswith(prefix) for word in card_words)
+        for prefix in prefixes
+    )
+
+
+def _grams(word: str) -> set:
+    """Биграммы слова с меткой начала ("^")."""
+
+    word = "^" + word
+
+    return {word[i:i + 2] for i in range(len(word) - 1)}
+
+
+def typos_allowed(word: str) -> int:
+    """Допустимое число опечаток в слове запроса."""
+
+    if len(word) < 3:
+        return 0
+
+    return 1 if len(word) < 8 else 2
+
+
+def prefix_distance(query: str, word: str, limit: int) -> int:
+    """
+    Расстояние Левенштейна от query до ближайшего префикса word.
+
+    Args:
+        query: Слово запроса
+        word: Слово индекса
+        limit: Наибольшее интересующее расстояние
+
+    Returns:
+        int: Расстояние или limit + 1, если оно больше limit
+    """
+
+    previous = list(range(len(word) + 1))
+
+    for i, char in enumerate(query, 1):
+        current = [i]
+        best = i
+
+        for j, other in enumerate(word, 1):
+            value = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char != other)
+            )
+            current.append(value)
+            best = min(best, value)
+
+        if best > limit:
+            return limit + 1
+
+        previous = current
+
+    return min(min(previous), limit + 1)
+
+
+class TextIndex:
+    """
+    Индекс для поиска карточек по началу слов и с опечатками.
+
+    Тексты карточки (наименование и артикул) разбиваются на слова.
+    Словарь хранит для каждого слова ID карточки (или множество ID,
+    если слово есть у нескольких карточек), а отсортированный список
+    слов позволяет найти все слова с данным началом двоичным поиском.
+    Новые слова копятся отдельно и вливаются в список одной
+    сортировкой перед поиском или удалением, поэтому добавление не
+    сдвигает весь список. Для поиска с опечатками слова словаря
+    проиндексированы по биграммам: кандидаты выбираются по самым
+    редким биграммам запроса и проверяются расстоянием Левенштейна.
+
+    Слова отдельных карточек индекс не хранит: удаление получает
+    прежние тексты карточки, а поиск читает тексты найденных карточек
+    через функцию texts.
+    """
+
+    def __init__(self) -> None:
+        """Инициализация пустого индекса."""
+
+        self._ids = {}
+        self._sorted = []
+        self._fresh = []
+        self._grams = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, card_id: str, *texts) -> None:
+        """
+        Добавление текстов карточки.
+
+        Args:
+            card_id: ID карточки
+            texts: Тексты карточки (пустые значения пропускаются)
+        """
+
+        for word in text_words(texts):
+            self._add_word(card_id, word)
+
+    def add_many(self, entries) -> None:
+        """
+        Добавление текстов многих карточек.
+
+        Args:
+            entries: Итерируемый набор кортежей (card_id, *texts)
+        """
+
+        for card_id, *texts in entries:
+            self.add(card_id, *texts)
+
+    def remove(self, card_id: str, *texts) -> None:
+        """
+        Удаление текстов карточки из индекса.
+
+        Args:
+            card_id: ID карточки
+            texts: Тексты, с которыми карточка была добавлена
+        """
+
+        for word in text_words(texts):
+            self._remove_word(card_id, word)
+
+    def replace(self, card_id: str, old: tuple, new: tuple) -> None:
+        """
+        Замена текстов карточки: удаляются только пропавшие слова и
+        добавляются только новые.
+
+        Args:
+            card_id: ID карточки
+            old: Прежние тексты карточки
+            new: Новые тексты карточки
+        """
+
+        old_words = text_words(old)
+        new_words = text_words(new)
+
+        for word in old_words - new_words:
+            self._remove_word(card_id, word)
+
+        for word in new_words - old_words:
+            self._add_word(card_id, word)
+
+    def _add_word(self, card_id: str, word: str) -> None:
+        ids = self._ids.get(word)
+
+        if ids is None:
+            self._ids[word] = card_id
+            self._fresh.append(word)
+
+            for gram in _grams(word):
+                self._grams.setdefault(gram, set()).add(word)
+        elif isinstance(ids, set):
+            ids.add(card_id)
+        elif ids != card_id:
+            self._ids[word] = {ids, card_id}
+
+    def _remove_word(self, card_id: str, word: str) -> None:
+        ids = self._ids.get(word)
+
+        if isinstance(ids, set):
+            ids.discard(card_id)
+
+            if len(ids) == 1:
+                self._ids[word] = ids.pop()
+
+            return
+
+        if ids != card_id:
+            return
+
+        del self._ids[word]
+        self._merge()
+        del self._sorted[bisect.bisect_left(self._sorted, word)]
+
+        for gram in _grams(word):
+            owners = self._grams[gram]
+            owners.discard(word)
+
+            if not owners:
+                del self._grams[gram]
+
+    def _merge(self) -> None:
+        """Вливание новых слов в отсортированный список."""
+
+        if self._fresh:
+            self._sorted.extend(self._fresh)
+            self._sorted.sort()
+            self._fresh = []
+
+    def _owners(self, word: str):
+        """ID карточек со словом word."""
+
+        ids = self._ids[word]
+
+        return ids if isinstance(ids, set) else (ids,)
+
+    def search(
+            self,
+            query: str,
+            texts,
+            limit: int = 10,
+            fuzzy: bool = False
+    ) -> list:
+        """
+        Поиск карточек, слова которых начинаются со слов запроса.
+
+        Каждое слово запроса должно совпасть с началом какого-либо слова
+        карточки. Без опечаток карточки упорядочены по найденному слову
+        (точные совпадения раньше), с опечатками - по сумме опечаток.
+        Порядок карточек с одинаковым словом или суммой не определён.
+
+        Args:
+            query: Строка запроса
+            texts: Функция, возвращающая тексты карточки по её ID; по
+                   ним проверяются остальные слова запроса
+            limit: Максимальное количество результатов
+            fuzzy: Допускать опечатки (1 в словах от 3 букв,
+                   2 в словах от 8 букв)
+
+        Returns:
+            list: ID найденных карточек, не более limit
+        """
+
+        terms = sorted(WORD.findall(query.casefold()), key=len, reverse=True)
+
+        if not terms or limit <= 0:
+            return []
+
+        self._merge()
+
+        if fuzzy:
+            return self._fuzzy(terms, texts, limit)
+
+        # Ведущее слово - с самым узким диапазоном в словаре
+        spans = [self._span(term) for term in terms]
+        lead = min(range(len(terms)), key=lambda i: spans[i][1] - spans[i][0])
+        start, end = spans[lead]
+        rest = terms[:lead] + terms[lead + 1:]
+        found = {}
+
+        for position in range(start, end):
+            for card_id in self._owners(self._sorted[position]):
+                if card_id in found:
+                    continue
+
+                if rest and not _has_all(text_words(texts(card_id)), rest):
+                    continue
+
+                found[card_id] = None
+
+                if len(found) == limit:
+                    return list(found)
+
+        return list(found)
+
+    def _span(self, prefix: str) -> tuple:
+        """Диапазон позиций слов с данным началом в отсортированном списке."""
+
+        start = bisect.bisect_left(self._sorted, prefix)
+        end = bisect.bisect_left(self._sorted, prefix + "\U0010ffff", start)
+
+        return start, end
+
+    def _similar(self, term: str) -> dict:
+        """
+        Слова словаря, начало которых отличается от term не более чем
+        на typos_allowed(term) правок.
+
+        Returns:
+            dict: {слово: число опечаток}
+        """
+
+        typos = typos_allowed(term)
+
+        if not typos:
+            start, end = self._span(term)
+
+            return {word: 0 for word in self._sorted[start:end]}
+
+        # Одна правка меняет не более двух биграмм, поэтому похожее
+        # слово содержит хотя бы одну из typos * 2 + 1 самых редких
+        grams = sorted(
+            _grams(term), key=lambda gram: len(self._grams.get(gram, ()))
+        )
+        candidates = set()
+
+        for gram in grams[:typos * 2 + 1]:
+            candidates |= self._grams.get(gram, set())
+
+        matches = {}
+
+        for word in candidates:
+            distance = prefix_distance(term, word, typos)
+
+            if distance <= typos:
+                matches[word] = distance
+
+        return matches
+
+    def _fuzzy(self, terms: list, texts, limit: int) -> list:
+        """Поиск с опечатками (см. search)."""
+
+        similar = [self._similar(term) for term in terms]
+        lead = min(
+            range(len(terms)),
+            key=lambda i: sum(len(self._owners(word)) for word in similar[i])
+        )
+        rest = len(terms) > 1
+        # Меньше этой суммы опечаток у остальных слов быть не может
+        floor = sum(
+            min(matches.values(), default=0)
+            for index, matches in enumerate(similar)
+            if index != lead
+        )
+        seen = set()
+        ranked = []
+
+        # Сумма опечаток карточки не меньше опечаток ведущего слова плюс
+        # floor, поэтому после limit карточек с такой суммой остальные
+        # слова ведущего слова можно не просматривать
+        for distance in sorted(set(similar[lead].values())):
+            lowest = distance + floor
+
+            if len(ranked) >= limit and ranked[limit - 1][0] <= lowest:
+                break
+
+            best = sum(score <= lowest for score, _ in ranked)
+
+            group = (
+                card_id
+                for word, typos in similar[lead].items()
+                if typos == distance
+                for card_id in self._owners(word)
+            )
+
+            for card_id in group:
+                if card_id in seen:
+                    continue
+
+                seen.add(card_id)
+                card_words = text_words(texts(card_id)) if rest else ()
+                score = _score(card_words, similar, lead, distance)
+
+                if score is None:
+                    continue
+
+                ranked.append((score, card_id))
+
+                # Карточки с наименьшей возможной суммой лучше не найти
+                if score == lowest:
+                    best += 1
+
+                    if best == limit:
+                        break
+
+            ranked.sort()
+
+        return [card_id for _, card_id in ranked[:limit]]
+
+
+def _score(card_words: set, similar: list, lead: int, score: int):
+    """Сумма опечаток карточки или None, если совпали не все слова."""
+
+    for index, matches in enumerate(similar):
+        if index == lead:
+            continue
+
+        best = min(
+            (matches[word] for word in card_words if word in matches),
+            default=None
+        )
+
+        if best is None:
+            return None
+
+        score += best
+
+    return score
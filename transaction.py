@@ -0,0 +1,288 @@
+from product_card import (
+    ProductCard,
+    confirm_always,
+    validate_changes,
+    validated
+)
+
+
+class Transaction:
+    """
+    Транзакция над несколькими карточками Menu (см. Menu.transaction).
+
+    Операции транзакции не меняют систему, а накапливаются: данные
+    проверяются сразу при вызове, а состояние карточек - по копиям,
+    к которым применены предыдущие операции транзакции. При фиксации
+    все операции под блокировкой системы заново проверяются на
+    текущих карточках и, только если ошибок нет, применяются все
+    вместе. Откат просто отбрасывает накопленные операции. Сообщения
+    по отдельным карточкам не выводятся, как и в пакетных операциях.
+    """
+
+    def __init__(self, menu) -> None:
+        """
+        Создание пустой транзакции (используйте Menu.transaction).
+
+        Args:
+            menu: Система карточек Menu
+        """
+
+        self._menu = menu
+        self._ops = []
+        self._state = {}
+        self.active = True
+
+    def __enter__(self) -> 'Transaction':
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if not self.active:
+            return
+
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+
+    def __len__(self) -> int:
+        return len(self._ops)
+
+    def create_card(self, card_id: str, data: dict) -> ProductCard:
+        """
+        Создание карточки в транзакции (см. Menu.create_card).
+
+        Returns:
+            ProductCard: Копия карточки в состоянии транзакции
+
+        Raises:
+            ValueError: При существующем ID или ошибках валидации
+        """
+
+        card = ProductCard.from_data(card_id, data)
+
+        return self._stage("create", card_id, card)
+
+    def update_card(self, card_id: str, data: dict) -> ProductCard:
+        """
+        Обновление карточки в транзакции (см. Menu.update_card).
+
+        Returns:
+            ProductCard: Копия карточки в состоянии транзакции
+
+        Raises:
+            ValueError: Если карточка не найдена или списана, нет данных
+                        или при ошибках валидации
+        """
+
+        if not data:
+            raise ValueError("Нет данных для обновления")
+
+        values = validated(validate_changes, data)
+
+        return self._stage("update", card_id, values)
+
+    def write_off_card(
+            self,
+            card_id: str,
+            confirm=confirm_always
+    ) -> ProductCard:
+        """
+        Списание карточки в транзакции (см. Menu.write_off_card).
+
+        Args:
+            card_id: ID карточки
+            confirm: Политика подтверждения, вызывается сразу для копии
+                     карточки в состоянии транзакции
+
+        Returns:
+            ProductCard: Копия карточки в состоянии транзакции
+
+        Raises:
+            ValueError: Если карточка не найдена, уже списана или
+                        списание не подтверждено
+        """
+
+        self._check_active()
+        card = self._current(self._state, card_id)
+
+        if card is not None:
+            card._check_write_off()
+
+            if not confirm(card):
+                raise ValueError("Списание отменено")
+
+        return self._stage("write_off", card_id, None)
+
+    def receive_stock(
+            self,
+            card_id: str,
+            quantity: int,
+            note: str = ""
+    ) -> ProductCard:
+        """Поступление товара в транзакции (см. Menu.receive_stock)."""
+
+        return self._stage("stock", card_id, ("receipt", quantity, note))
+
+    def issue_stock(
+            self,
+            card_id: str,
+            quantity: int,
+            note: str = ""
+    ) -> ProductCard:
+        """Расход товара в транзакции (см. Menu.issue_stock)."""
+
+        return self._stage("stock", card_id, ("issue", quantity, note))
+
+    def adjust_stock(
+            self,
+            card_id: str,
+            quantity: int,
+            note: str = ""
+    ) -> ProductCard:
+        """Корректировка остатка в транзакции (см. Menu.adjust_stock)."""
+
+        return self._stage("stock", card_id, ("adjustment", quantity, note))
+
+    def get_card(self, card_id: str) -> dict:
+        """
+        Данные карточки с учётом операций транзакции.
+
+        Raises:
+            ValueError: Если карточка не найдена
+        """
+
+        card = self._current(self._state, card_id)
+
+        if card is None:
+            raise ValueError(f"Карточка {card_id} не найдена")
+
+        return card.get_data()
+
+    def commit(self) -> dict:
+        """
+        Проверка всех операций на текущих карточках и их применение.
+
+        Returns:
+            dict: Отчёт с ключами "created", "updated" и "written_off"
+                  (списки ID карточек; движения товара - в "updated")
+
+        Raises:
+            ValueError: Если хотя бы одна операция стала невозможной
+                        (все ошибки в одном сообщении); тогда ни одна
+                        операция не применяется и транзакция
+                        откатывается
+        """
+
+        self._check_active()
+        menu = self._menu
+
+        with menu._lock_all():
+            state = {}
+            actions = []
+            errors = []
+
+            for op, card_id, payload in self._ops:
+                try:
+                    actions.append(
+                        (op, card_id, self._check(state, op, card_id, payload))
+                    )
+                except ValueError as e:
+                    errors.append(str(e))
+
+            self.rollback()
+
+            if errors:
+                raise ValueError("; ".join(dict.fromkeys(errors)))
+
+            report = {"created": {}, "updated": {}, "written_off": {}}
+
+            for op, card_id, value in actions:
+                menu._apply(op, card_id, value)
+
+                if op == "create":
+                    report["created"][card_id] = None
+                elif op == "write_off":
+                    report["written_off"][card_id] = None
+                elif card_id not in report["created"]:
+                    report["updated"][card_id] = None
+
+            return {key: list(ids) for key, ids in report.items()}
+
+    def rollback(self) -> None:
+        """Отмена всех операций транзакции."""
+
+        self._ops = []
+        self._state = {}
+        self.active = False
+
+    def _check_active(self) -> None:
+        if not self.active:
+            raise ValueError("Транзакция уже завершена")
+
+    def _stage(self, op: str, card_id: str, payload) -> ProductCard:
+        """Проверка операции на состоянии транзакции и её накопление."""
+
+        self._check_active()
+        self._check(self._state, op, card_id, payload)
+        self._ops.append((op, card_id, payload))
+
+        return self._state[card_id].copy()
+
+    def _current(self, state: dict, card_id: str):
+        """
+        Копия карточки в состоянии state; при первом обращении
+        копируется карточка системы. None, если карточки нет.
+        """
+
+        card = state.get(card_id)
+
+        if card is None and card_id in self._menu.cards:
+            card = state[card_id] = self._menu.cards[card_id].copy()
+
+        return card
+
+    def _check(self, state: dict, op: str, card_id: str, payload):
+        """
+        Проверка операции и её применение к копиям карточек в state.
+
+        Returns:
+            Значение для Menu._apply: новая карточка для "create",
+            проверенные значения для "update", (вид движения,
+            комментарий, новый остаток) для "stock"
+
+        Raises:
+            ValueError: Если операция невозможна
+        """
+
+        card = self._current(state, card_id)
+
+        if op == "create":
+            if card is not None:
+                raise ValueError(f"Карточка с ID {card_id} уже существует")
+
+            state[card_id] = payload.copy()
+
+            return payload
+
+        if card is None:
+            raise ValueError(f"Карточка {card_id} не найдена")
+
+        if op == "write_off":
+            card._check_write_off()
+            card._assign({"status": ProductCard.STATUS_WRITTEN_OFF})
+
+            return None
+
+        if card.get_status() == ProductCard.STATUS_WRITTEN_OFF:
+            raise ValueError("Невозможно изменить списанную карточку")
+
+        if op == "update":
+            card._assign(payload)
+
+            return payload
+
+        kind, quantity, note = payload
+        balance = self._menu._balance(card, kind, quantity)
+        card._assign({"quantity": balance})
+
+        return kind, note, balance
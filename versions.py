@@ -0,0 +1,131 @@
+import weakref
+
+from product_card import ProductCard
+
+
+class MenuSnapshot:
+    """
+    Неизменяемое представление карточек Menu на момент вызова
+    Menu.snapshot.
+
+    Снимок не копирует карточки: он хранит номер эпохи и количество
+    карточек в системе. Пока снимок жив, Menu запоминает прежние
+    значения изменяемых полей с номером эпохи изменения, и снимок
+    восстанавливает карточку, откатывая более поздние изменения.
+    Карточки, созданные после снимка, в него не попадают. Чтение не
+    блокирует запись: в потокобезопасном режиме карточка читается под
+    её блокировкой, а не под блокировкой всей системы.
+
+    Снимок освобождается методом close, при выходе из блока with или
+    при удалении объекта; после этого Menu перестаёт хранить версии.
+    """
+
+    def __init__(self, menu, epoch: int, count: int) -> None:
+        """
+        Создание снимка (используйте Menu.snapshot).
+
+        Args:
+            menu: Система карточек Menu
+            epoch: Номер эпохи снимка
+            count: Количество карточек в системе на момент снимка
+        """
+
+        self._menu = menu
+        self.epoch = epoch
+        self._count = count
+        self._release = weakref.finalize(self, menu._release, epoch)
+
+    def __enter__(self) -> 'MenuSnapshot':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, card_id: str) -> bool:
+        return self._raw(card_id) is not None
+
+    def close(self) -> None:
+        """Освобождение снимка; повторный вызов ничего не делает."""
+
+        self._release()
+
+    def _raw(self, card_id: str):
+        if not self._release.alive:
+            raise ValueError("Снимок закрыт")
+
+        return self._menu._raw_at(card_id, self.epoch)
+
+    def get_raw(self, card_id: str) -> dict:
+        """
+        Исходные значения полей карточки на момент снимка.
+
+        Returns:
+            dict: Словарь в формате ProductCard.get_raw
+
+        Raises:
+            ValueError: Если карточки не было в системе на момент снимка
+                        или снимок закрыт
+        """
+
+        raw = self._raw(card_id)
+
+        if raw is None:
+            raise ValueError(f"Карточка {card_id} не найдена")
+
+        return raw
+
+    def get_card_object(self, card_id: str) -> ProductCard:
+        """
+        Отдельная копия карточки на момент снимка (см. get_raw).
+
+        Изменения копии не затрагивают ни систему, ни снимок.
+        """
+
+        return _detached(self.get_raw(card_id))
+
+    def get_card(self, card_id: str) -> dict:
+        """Данные карточки на момент снимка в формате get_data."""
+
+        return self.get_card_object(card_id).get_data()
+
+    def iter_cards(self):
+        """
+        Исходные значения полей всех карточек снимка в порядке их
+        добавления в систему.
+
+        Yields:
+            dict: Словари в формате ProductCard.get_raw
+        """
+
+        for card_id in self._menu._ids(self._count):
+            yield self.get_raw(card_id)
+
+    def cards(self):
+        """
+        Копии всех карточек снимка в порядке добавления в систему.
+
+        Yields:
+            ProductCard: Карточки, не связанные с системой
+        """
+
+        for raw in self.iter_cards():
+            yield _detached(raw)
+
+    def list_cards(self) -> None:
+        """Вывод краткой информации о карточках снимка (см. Menu)."""
+
+        self._menu._print_cards(list(self.cards()))
+
+
+def _detached(raw: dict) -> ProductCard:
+    """Карточка без владельца из словаря get_raw."""
+
+    fields = dict(raw)
+    status = fields.pop("status")
+    card = ProductCard(**fields)
+    card._status = status
+
+    return card